@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+准入控制模块
+请求按估算成本分到廉价/昂贵两条通道，各自有独立的工作线程和有界队列（排队 + 执行中的上限），
+昂贵请求只占用昂贵通道的线程和名额，不会在队列中排在廉价请求前面。
+两条通道是同一进程内的线程池，共用一个 GIL：通道限制的是各自的并发数，而不是 CPU 份额或延迟，
+昂贵通道的纯 Python 搜索执行时，廉价请求与之按 GIL 切换间隔轮流运行，延迟随同时运行的昂贵请求数增加
+（大致与可运行线程数成比例）；需要跨 CPU 隔离时以多进程方式运行服务（naming_service --processes，见 prefork.py）。
+昂贵通道负载超过降级阈值时，可降级的请求以降级方式执行（如减少生成数量、收紧搜索上限）；
+通道已满时拒绝请求（Overloaded），由调用方稍后重试。
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AdmissionConfig:
+    """准入控制配置常量"""
+    CHEAP_COST = 6000         # 估算成本不超过此值为廉价请求（评分次数当量）
+    CHEAP_LIMIT = 64          # 廉价通道排队 + 执行中上限
+    EXPENSIVE_LIMIT = 8       # 昂贵通道排队 + 执行中上限
+    DEGRADE_AT = 0.5          # 昂贵通道占用达到上限的该比例时，新请求降级执行
+    RETRY_AFTER = 1           # 拒绝时建议的重试间隔（秒）
+
+
+class Overloaded(Exception):
+    """通道已满，请求被拒绝"""
+
+    def __init__(self, lane, retry_after=AdmissionConfig.RETRY_AFTER):
+        super().__init__(f"服务繁忙（{lane} 通道已满），请 {retry_after} 秒后重试")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class Lane:
+    """执行通道（独立线程池 + 有界占用）"""
+
+    def __init__(self, name, workers, limit):
+        """
+        初始化
+        :param name: 通道名
+        :param workers: 工作线程数
+        :param limit: 排队 + 执行中的请求上限
+        """
+        self.name = name
+        self.limit = limit
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"naming-{name}")
+        self.pending = 0
+        self.admitted = 0
+        self.degraded = 0
+        self.rejected = 0
+
+    def stats(self):
+        return {"pending": self.pending, "limit": self.limit, "admitted": self.admitted,
+                "degraded": self.degraded, "rejected": self.rejected}
+
+
+class AdmissionController:
+    """按成本分通道的准入控制器（线程安全）"""
+
+    def __init__(self, cheap_workers, expensive_workers, cheap_limit=AdmissionConfig.CHEAP_LIMIT,
+                 expensive_limit=AdmissionConfig.EXPENSIVE_LIMIT, cheap_cost=AdmissionConfig.CHEAP_COST,
+                 degrade_at=AdmissionConfig.DEGRADE_AT):
+        """
+        初始化
+        :param cheap_workers: 廉价通道工作线程数
+        :param expensive_workers: 昂贵通道工作线程数
+        :param cheap_limit: 廉价通道排队 + 执行中上限
+        :param expensive_limit: 昂贵通道排队 + 执行中上限
+        :param cheap_cost: 廉价请求的成本上限
+        :param degrade_at: 昂贵通道降级阈值（占上限的比例）
+        """
+        self.cheap = Lane("cheap", cheap_workers, cheap_limit)
+        self.expensive = Lane("expensive", expensive_workers, expensive_limit)
+        self.cheap_cost = cheap_cost
+        self.degrade_at = degrade_at
+        self._lock = threading.Lock()
+
+    def admit(self, cost, degradable=False):
+        """
+        申请执行
+        :param cost: 估算成本
+        :param degradable: 请求能否降级执行
+        :return: (通道, 是否降级)；执行完须调用 release(通道)
+        """
+        lane = self.cheap if cost <= self.cheap_cost else self.expensive
+        with self._lock:
+            if lane.pending >= lane.limit:
+                lane.rejected += 1
+                raise Overloaded(lane.name)
+            degraded = (degradable and lane is self.expensive
+                        and lane.pending >= self.degrade_at * lane.limit)
+            lane.pending += 1
+            lane.admitted += 1
+            lane.degraded += degraded
+        return lane, degraded
+
+    def release(self, lane):
+        """释放通道占用"""
+        with self._lock:
+            lane.pending -= 1
+
+    def run(self, lane, fn, *args):
+        """在通道线程池中执行并等待结果，结束后释放占用"""
+        try:
+            return lane.executor.submit(fn, *args).result()
+        finally:
+            self.release(lane)
+
+    def stats(self):
+        with self._lock:
+            return {lane.name: lane.stats() for lane in (self.cheap, self.expensive)}
+
+    def shutdown(self):
+        self.cheap.executor.shutdown(wait=False)
+        self.expensive.executor.shutdown(wait=False)
@@ -2,103 +2,172 @@
 """
 离线文化解析模块 (V3.1)
 无需 API Key，内置文化数据库提供名字深度寓意分析
+单字片段（字义描述、品德、五行诗句）按（字、字义、五行）缓存，各字库版本与覆盖层共享，模板预先绑定，
+渲染只需按下标选取片段并做一次 format。
+名中用字能在诗词语料中检索到诗句时，引用含这些字的诗句（见 poem_corpus.py），否则按五行引用内置诗句。
+选取下标由 (姓, 名, 性别, 字库版本, 语料版本, 种子) 的 blake2b 哈希决定，同一输入总是得到同一段解析，
+结果按此键记忆化
 """
 
-import random
+import functools
+import hashlib
+
+from lexicon import get_default_lexicon
+from poem_corpus import get_default_corpus
+
+# 内置诗词库
+POEMS = {
+    "木": (
+        "“青青子衿，悠悠我心。”——《诗经》",
+        "“宁可食无肉，不可居无竹。”——苏轼",
+        "“林深时见鹿，溪午不闻钟。”——李白",
+        "“芳林新叶催陈叶，流水前波让后波。”——刘禹锡"
+    ),
+    "火": (
+        "“日出江花红胜火，春来江水绿如蓝。”——白居易",
+        "“大漠孤烟直，长河落日圆。”——王维",
+        "“星垂平野阔，月涌大江流。”——杜甫",
+        "“光明磊落，志在四方。”"
+    ),
+    "土": (
+        "“地势坤，君子以厚德载物。”——《易经》",
+        "“安得广厦千万间，大庇天下寒士俱欢颜。”——杜甫",
+        "“稳如泰山，志存高远。”",
+        "“广袤大地，孕育万物。”"
+    ),
+    "金": (
+        "“金就砺则利，君子博学而日参省乎己。”——《荀子》",
+        "“大浪淘沙始见金。”——刘禹锡",
+        "“锐意进取，无坚不摧。”",
+        "“锦绣前程，光辉灿烂。”"
+    ),
+    "水": (
+        "“上善若水，水善利万物而不争。”——《老子》",
+        "“海纳百川，有容乃大。”——林则徐",
+        "“清泉石上流。”——王维",
+        "“浩渺烟波，志向远大。”"
+    )
+}
+
+# 意境模板
+TEMPLATES = (
+    "名字“{full_name}”蕴含着深厚的文化底蕴。{char1_desc}，{char2_desc}。二字结合，意境如{mood}，象征着孩子将来{future}。",
+    "“{full_name}”一名，既有古典之雅，又不失现代之风。{char1_desc}体现了{char1_virtue}，而{char2_desc}则寓意着{char2_virtue}。整体给人以{feeling}的感觉。",
+    "取名“{full_name}”，寄托了父母对孩子{hope}的期许。{char1_desc}与{char2_desc}相得益彰，正如诗云：{poem}。这是一个富有{style}的名字。",
+    "“{full_name}”二字有典可循，{poem}。{char1_desc}，{char2_desc}，给人以{feeling}之感，寓意孩子{future}。"
+)
+
+# 模板预先绑定为渲染函数
+RENDERERS = tuple(template.format for template in TEMPLATES)
+# 无语料引文时用前三个模板，有引文时用引诗的后两个模板
+PLAIN_RENDERERS = RENDERERS[:3]
+QUOTE_RENDERERS = RENDERERS[2:]
+
+MOODS = ("清风拂面", "高山流水", "旭日东升", "星光璀璨", "春意盎然")
+FUTURES = ("前程似锦", "志向远大", "德才兼备", "平安喜乐", "成就非凡")
+FEELINGS = ("儒雅", "大气", "灵动", "稳重", "清新")
+HOPES = ("聪明伶俐", "健康成长", "事业有成", "品行端正")
+STYLES = ("书卷气", "英雄气", "艺术感", "自然美")
+
+# 语料版本 -> 语料
+_CORPORA = {}
+
+# 从相关度最高的前几句语料引文中选取（有同时含两字的句子时只在其中选取）
+QUOTE_CHOICES = 3
+
+ANALYSIS_CACHE_SIZE = 4096
+FRAGMENT_CACHE_SIZE = 8192
+
+
+@functools.lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _build_fragment(char, meaning, wuxing):
+    """
+    单字片段（只取决于字、字义和五行，按此记忆化：覆盖层只改了别的字时与基础字库共用条目，
+    每个请求各自的覆盖层也不会让缓存无限增长）
+    :return: (描述, 作首字的品德, 作次字的品德, 五行, 作首字时的候选诗句)；
+             字库中没有该字时描述为空、五行为 None，诗句按木
+    """
+    if wuxing is None:
+        return "", "高尚的品德", None, None, POEMS["木"]
+    desc = f"“{char}”字寓意{meaning}"
+    virtue1 = "高尚的品德" if wuxing in ["木", "土"] else "卓越的才华"
+    virtue2 = "广阔的胸怀" if wuxing in ["水", "火"] else "坚定的意志"
+    return desc, virtue1, virtue2, wuxing, POEMS.get(wuxing, POEMS["木"])
+
+
+def _fragment_for(char, info):
+    """按单字信息取片段（字库中没有该字时 info 为 None）"""
+    if info is None:
+        return _build_fragment(char, None, None)
+    return _build_fragment(char, info["字义"], info["五行"])
+
+
+def clear_fragment_cache():
+    """清空单字片段缓存（及依赖它的解析缓存）"""
+    _build_fragment.cache_clear()
+    _cached_analysis.cache_clear()
+
+
+@functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _cached_analysis(version, corpus_version, surname, name, gender, seed, fragment1, fragment2):
+    """
+    记忆化的名字解析（键：字库版本、语料版本、姓、名、性别、种子及名中两字的片段）
+    调用前须已登记该版本语料
+    """
+    char1 = name[0]
+    desc1, virtue1, _, wuxing1, poems = fragment1
+    desc2, _, virtue2, wuxing2, _ = fragment2 if fragment2 else ("", None, None, None, None)
+    
+    # 首字缺信息时按木处理，次字缺信息时随首字
+    desc1 = desc1 or f"“{char1}”字象征美好"
+    if wuxing2 is None:
+        virtue2 = "广阔的胸怀" if (wuxing1 or "木") in ["水", "火"] else "坚定的意志"
+    
+    key = "\0".join((surname, name, gender, version, corpus_version, str(seed)))
+    picks = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    quotes = _CORPORA[corpus_version].quotes(name[:2], QUOTE_CHOICES, best_only=True)
+    renderers = QUOTE_RENDERERS if quotes else PLAIN_RENDERERS
+    poems = quotes or poems
+    return renderers[picks[0] % len(renderers)](
+        full_name=surname + name,
+        char1_desc=desc1,
+        char2_desc=desc2,
+        char1_virtue=virtue1,
+        char2_virtue=virtue2,
+        mood=MOODS[picks[1] % len(MOODS)],
+        future=FUTURES[picks[2] % len(FUTURES)],
+        feeling=FEELINGS[picks[3] % len(FEELINGS)],
+        hope=HOPES[picks[4] % len(HOPES)],
+        style=STYLES[picks[5] % len(STYLES)],
+        poem=poems[picks[6] % len(poems)]
+    )
+
 
 class AIAnalyzer:
     """智能文化寓意分析器 (离线版)"""
-    
-    def __init__(self):
-        # 内置诗词库
-        self.poems = {
-            "木": [
-                "“青青子衿，悠悠我心。”——《诗经》",
-                "“宁可食无肉，不可居无竹。”——苏轼",
-                "“林深时见鹿，溪午不闻钟。”——李白",
-                "“芳林新叶催陈叶，流水前波让后波。”——刘禹锡"
-            ],
-            "火": [
-                "“日出江花红胜火，春来江水绿如蓝。”——白居易",
-                "“大漠孤烟直，长河落日圆。”——王维",
-                "“星垂平野阔，月涌大江流。”——杜甫",
-                "“光明磊落，志在四方。”"
-            ],
-            "土": [
-                "“地势坤，君子以厚德载物。”——《易经》",
-                "“安得广厦千万间，大庇天下寒士俱欢颜。”——杜甫",
-                "“稳如泰山，志存高远。”",
-                "“广袤大地，孕育万物。”"
-            ],
-            "金": [
-                "“金就砺则利，君子博学而日参省乎己。”——《荀子》",
-                "“大浪淘沙始见金。”——刘禹锡",
-                "“锐意进取，无坚不摧。”",
-                "“锦绣前程，光辉灿烂。”"
-            ],
-            "水": [
-                "“上善若水，水善利万物而不争。”——《老子》",
-                "“海纳百川，有容乃大。”——林则徐",
-                "“清泉石上流。”——王维",
-                "“浩渺烟波，志向远大。”"
-            ]
-        }
-        
-        # 意境模板
-        self.templates = [
-            "名字“{full_name}”蕴含着深厚的文化底蕴。{char1_desc}，{char2_desc}。二字结合，意境如{mood}，象征着孩子将来{future}。",
-            "“{full_name}”一名，既有古典之雅，又不失现代之风。{char1_desc}体现了{char1_virtue}，而{char2_desc}则寓意着{char2_virtue}。整体给人以{feeling}的感觉。",
-            "取名“{full_name}”，寄托了父母对孩子{hope}的期许。{char1_desc}与{char2_desc}相得益彰，正如诗云：{poem}。这是一个富有{style}的名字。"
-        ]
-
-    def analyze_name(self, surname, name, gender):
+
+    def __init__(self, lexicon=None, seed=None, corpus=None):
+        # 字库（可选，默认使用共享字库）
+        self.lexicon = lexicon if lexicon is not None else get_default_lexicon()
+        # 诗词语料（可选，默认使用共享语料）
+        self.corpus = corpus if corpus is not None else get_default_corpus()
+        # 默认种子（可选，不同种子给出不同但同样可复现的措辞）
+        self.seed = seed
+
+    def _fragment(self, char):
+        """获取单字片段（按字、字义、五行缓存，首次使用时生成）"""
+        return _fragment_for(char, self.lexicon.get(char))
+
+    def analyze_name(self, surname, name, gender, seed=None):
         """
-        离线分析名字寓意
+        离线分析名字寓意（同一姓名、性别、字库版本和种子总是返回同一段解析）
+        :param seed: 种子（可选，默认用构造时的种子）
         """
-        from data_characters import get_character_info
-        
-        full_name = surname + name
-        char1 = name[0]
-        char2 = name[1] if len(name) > 1 else ""
-        
-        info1 = get_character_info(char1)
-        info2 = get_character_info(char2) if char2 else None
-        
-        # 提取特征
-        wuxing1 = info1["五行"] if info1 else "木"
-        wuxing2 = info2["五行"] if info2 else wuxing1
-        
-        char1_desc = f"“{char1}”字寓意{info1['字义']}" if info1 else f"“{char1}”字象征美好"
-        char2_desc = f"“{char2}”字寓意{info2['字义']}" if info2 else ""
-        
-        char1_virtue = "高尚的品德" if wuxing1 in ["木", "土"] else "卓越的才华"
-        char2_virtue = "广阔的胸怀" if wuxing2 in ["水", "火"] else "坚定的意志"
-        
-        moods = ["清风拂面", "高山流水", "旭日东升", "星光璀璨", "春意盎然"]
-        futures = ["前程似锦", "志向远大", "德才兼备", "平安喜乐", "成就非凡"]
-        feelings = ["儒雅", "大气", "灵动", "稳重", "清新"]
-        hopes = ["聪明伶俐", "健康成长", "事业有成", "品行端正"]
-        styles = ["书卷气", "英雄气", "艺术感", "自然美"]
-        
-        poem = random.choice(self.poems.get(wuxing1, self.poems["木"]))
-        
-        # 随机选择模板并填充
-        template = random.choice(self.templates)
-        analysis = template.format(
-            full_name=full_name,
-            char1_desc=char1_desc,
-            char2_desc=char2_desc,
-            char1_virtue=char1_virtue,
-            char2_virtue=char2_virtue,
-            mood=random.choice(moods),
-            future=random.choice(futures),
-            feeling=random.choice(feelings),
-            hope=random.choice(hopes),
-            style=random.choice(styles),
-            poem=poem
-        )
-        
-        return analysis
+        fragment1 = self._fragment(name[0])
+        fragment2 = self._fragment(name[1]) if len(name) > 1 else None
+        _CORPORA.setdefault(self.corpus.version, self.corpus)
+        return _cached_analysis(self.lexicon.version, self.corpus.version, surname, name, gender,
+                                self.seed if seed is None else seed, fragment1, fragment2)
 
 if __name__ == "__main__":
     # 简单测试
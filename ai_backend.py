@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+文化解析后端模块
+异步、分批调用模型服务做名字解析：限制并发批数，每批设超时，
+超时或服务出错时该批回退到离线模板解析（AIAnalyzer）。
+另提供一个本地桩服务（StubModelServer），在测试和开发时代替真实模型服务
+
+模型服务接口（HTTP POST，JSON）：
+    请求：{"requests": [{"surname": "李", "name": "沐书", "gender": "男"}, ...]}
+    响应：{"analyses": ["……", ...]}（与请求一一对应）
+
+用法：
+    python ai_backend.py serve --port 8765 --delay 0.2
+    NAMING_ANALYSIS_URL=http://127.0.0.1:8765/analyze python naming_generator.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ai_analyzer import AIAnalyzer
+
+# 设置后 NamingGenerator 默认通过该地址的模型服务做文化解析
+ANALYSIS_URL_ENV = "NAMING_ANALYSIS_URL"
+
+
+class BackendConfig:
+    """后端配置常量"""
+    BATCH_SIZE = 8          # 每批名字数
+    CONCURRENCY = 4         # 同时进行的批数
+    TIMEOUT = 5.0           # 每批超时（秒）
+
+
+class HTTPBackend:
+    """模型服务后端（HTTP JSON）"""
+
+    def __init__(self, url, timeout=BackendConfig.TIMEOUT):
+        """
+        初始化
+        :param url: 模型服务地址
+        :param timeout: 连接/读取超时（秒）
+        """
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, items):
+        payload = json.dumps({"requests": [
+            {"surname": surname, "name": name, "gender": gender} for surname, name, gender in items
+        ]}, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(self.url, data=payload,
+                                         headers={"Content-Type": "application/json; charset=utf-8"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode("utf-8"))
+        # 响应格式不符（非对象、analyses 非文本列表、条数不符）一律视为服务出错，由调用方回退
+        analyses = body.get("analyses") if isinstance(body, dict) else None
+        if not isinstance(analyses, list) or not all(isinstance(text, str) for text in analyses):
+            raise ValueError("模型服务响应格式错误，应为 {\"analyses\": [解析文本, ...]}")
+        if len(analyses) != len(items):
+            raise ValueError(f"模型服务返回 {len(analyses)} 条解析，请求 {len(items)} 条")
+        return analyses
+
+    async def analyze_batch(self, items):
+        """
+        解析一批名字
+        :param items: [(姓, 名, 性别)]
+        :return: 解析文本列表
+        """
+        return await asyncio.to_thread(self._post, items)
+
+
+class AsyncAnalyzer:
+    """异步分批文化解析器（带并发限制、超时和模板回退）"""
+
+    def __init__(self, backend=None, fallback=None, batch_size=BackendConfig.BATCH_SIZE,
+                 concurrency=BackendConfig.CONCURRENCY, timeout=BackendConfig.TIMEOUT):
+        """
+        初始化
+        :param backend: 模型后端（需提供 async analyze_batch(items)；None 时只用模板解析）
+        :param fallback: 回退用的模板解析器（默认 AIAnalyzer()）
+        :param batch_size: 每批名字数
+        :param concurrency: 同时进行的批数
+        :param timeout: 每批超时（秒）
+        """
+        self.backend = backend
+        self.fallback = fallback if fallback is not None else AIAnalyzer()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.fallback_count = 0   # 回退到模板解析的名字数
+
+    def _fallback_batch(self, items):
+        self.fallback_count += len(items)
+        return [self.fallback.analyze_name(surname, name, gender) for surname, name, gender in items]
+
+    async def _analyze_batch(self, semaphore, items):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(self.backend.analyze_batch(items), self.timeout)
+            except (asyncio.TimeoutError, OSError, ValueError, KeyError) as e:
+                print(f"模型服务解析失败（{type(e).__name__}），{len(items)} 个名字改用模板解析")
+                return self._fallback_batch(items)
+
+    async def analyze_many(self, items):
+        """
+        并发解析多个名字
+        :param items: [(姓, 名, 性别)]
+        :return: 解析文本列表（与 items 一一对应）
+        """
+        items = list(items)
+        if self.backend is None:
+            return self._fallback_batch(items)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        results = await asyncio.gather(*(self._analyze_batch(semaphore, batch) for batch in batches))
+        return [analysis for batch in results for analysis in batch]
+
+    def analyze_many_sync(self, items):
+        """
+        analyze_many 的同步版本（供非异步调用方使用，不可在事件循环内调用）；
+        阻塞的 HTTP 请求在本次调用专用的线程池中执行，结束时不等待超时批次的请求线程
+        （asyncio.run 关闭时会等待默认线程池，超时回退后仍要等慢请求返回），
+        遗留线程在后端自身的连接/读取超时后结束
+        """
+        items = list(items)
+        if self.backend is None or not items:
+            return self._fallback_batch(items)
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency,
+                                                     thread_name_prefix="naming-analysis"))
+        try:
+            return loop.run_until_complete(self.analyze_many(items))
+        finally:
+            # close() 以 shutdown(wait=False) 关闭默认线程池
+            loop.close()
+
+
+def default_backend():
+    """按环境变量 NAMING_ANALYSIS_URL 创建模型后端，未设置返回 None"""
+    url = os.environ.get(ANALYSIS_URL_ENV)
+    return HTTPBackend(url) if url else None
+
+
+class StubModelServer:
+    """
+    本地桩模型服务：用模板解析器生成文本（加“【模型】”前缀），可设置响应延迟，
+    并记录收到的批大小和最大并发数，供测试检查；设置 body 后固定返回该响应体（模拟格式错误的服务）
+    """
+
+    PREFIX = "【模型】"
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0, lexicon=None):
+        """
+        初始化
+        :param host: 监听地址
+        :param port: 端口（0为自动分配）
+        :param delay: 每批响应延迟（秒）
+        :param lexicon: 字库（可选）
+        """
+        self.delay = delay
+        self.body = None
+        self.analyzer = AIAnalyzer(lexicon)
+        self.batch_sizes = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/analyze"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                requests = json.loads(self.rfile.read(length).decode("utf-8"))["requests"]
+                with stub._lock:
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                    stub.batch_sizes.append(len(requests))
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    analyses = [stub.PREFIX + stub.analyzer.analyze_name(r["surname"], r["name"], r["gender"])
+                                for r in requests]
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+                response = {"analyses": analyses} if stub.body is None else stub.body
+                body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """后台线程启动服务"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文化解析后端工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="启动本地桩模型服务")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    serve_parser.add_argument("--port", type=int, default=8765, help="端口")
+    serve_parser.add_argument("--delay", type=float, default=0.0, help="每批响应延迟（秒）")
+    args = parser.parse_args()
+
+    stub = StubModelServer(args.host, args.port, args.delay)
+    print(f"桩模型服务已启动：{stub.url}（{ANALYSIS_URL_ENV}={stub.url}）")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+八字图谱模块
+预先计算 1900-2100 年每天 12 个时辰的八字、五行统计和推荐喜用神（五行需求由五行统计还原），
+写入定长记录的二进制文件；查询时内存映射文件并按 (日期, 时辰) 直接定位记录
+
+用法：
+    python bazi_atlas.py build bazi_atlas.bin
+    然后 BaZiCalculator.load_atlas("bazi_atlas.bin")，或设置环境变量 NAMING_BAZI_ATLAS
+"""
+
+import argparse
+import datetime
+import mmap
+import os
+import struct
+import time
+
+from bazi_calculator import BaZiCalculator
+
+ATLAS_ENV = "NAMING_BAZI_ATLAS"
+MAGIC = b"BZATLAS2"
+FIRST_DATE = datetime.date(1900, 1, 1)
+LAST_DATE = datetime.date(2100, 12, 31)
+
+# 文件头：魔数、首日序数、天数、记录长度
+HEADER = struct.Struct("<8sIII")
+# 记录：年/月/日/时柱六十甲子序号、五行统计（×1000）、两个喜用神（五行序号，255为空）、标志位
+RECORD = struct.Struct("<4B5H2BB")
+
+ELEMENTS = ("木", "火", "土", "金", "水")
+ELEMENT_INDEX = {element: i for i, element in enumerate(ELEMENTS)}
+GANZHI_INDEX = {gan + zhi: i for i, (gan, zhi) in enumerate(BaZiCalculator.JIA_ZI)}
+STRENGTH_SCALE = 1000
+EMPTY = 255
+FLAG_CROSSES_JIE = 1      # 该时辰内交节，月柱/年柱取决于具体分钟，查表时回退计算
+
+
+def _shichen_spans(shichen):
+    """时辰覆盖的时间段 [(起始时, 起始分, 结束时, 结束分)]（23点与0点同属子时）"""
+    if shichen == 0:
+        return [(0, 0, 0, 59), (23, 0, 23, 59)]
+    return [(shichen * 2 - 1, 0, shichen * 2, 59)]
+
+
+def _encode(analysis, crosses_jie):
+    bazi = analysis["八字"]
+    pillars = [GANZHI_INDEX[bazi[key]] for key in ("年柱", "月柱", "日柱", "时柱")]
+    strengths = [int(round(analysis["五行统计"][element] * STRENGTH_SCALE)) for element in ELEMENTS]
+    xiyongshen = [ELEMENT_INDEX[element] for element in analysis["推荐喜用神"][:2]]
+    xiyongshen += [EMPTY] * (2 - len(xiyongshen))
+    return RECORD.pack(*pillars, *strengths, *xiyongshen, FLAG_CROSSES_JIE if crosses_jie else 0)
+
+
+class BaZiAtlas:
+    """八字图谱（内存映射的只读文件）"""
+
+    def __init__(self, path):
+        """
+        打开图谱文件
+        :param path: 图谱文件路径
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.first_ordinal, self.day_count, record_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} 不是有效的八字图谱文件")
+
+    def close(self):
+        """关闭文件"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def lookup(self, year, month, day, shichen):
+        """
+        查询图谱
+        :param shichen: 时辰序号（0-11）
+        :return: 与 BaZiCalculator.analyze_bazi 相同结构的字典；不在图谱范围或该时辰内交节时返回 None
+        """
+        day_offset = datetime.date(year, month, day).toordinal() - self.first_ordinal
+        if not 0 <= day_offset < self.day_count:
+            return None
+        offset = HEADER.size + (day_offset * 12 + shichen) * RECORD.size
+        record = RECORD.unpack_from(self._map, offset)
+        if record[11] & FLAG_CROSSES_JIE:
+            return None
+
+        jiazi = BaZiCalculator.JIA_ZI
+        (year_gan, year_zhi), (month_gan, month_zhi), (day_gan, day_zhi), (hour_gan, hour_zhi) = (
+            jiazi[i] for i in record[0:4])
+        bazi = {
+            "年柱": year_gan + year_zhi,
+            "月柱": month_gan + month_zhi,
+            "日柱": day_gan + day_zhi,
+            "时柱": hour_gan + hour_zhi,
+            "年干": year_gan, "年支": year_zhi,
+            "月干": month_gan, "月支": month_zhi,
+            "日干": day_gan, "日支": day_zhi,
+            "时干": hour_gan, "时支": hour_zhi
+        }
+        wuxing_count = {element: value / STRENGTH_SCALE for element, value in zip(ELEMENTS, record[4:9])}
+        return {
+            "八字": bazi,
+            "五行统计": wuxing_count,
+            "日主": day_gan,
+            "日主五行": BaZiCalculator.WU_XING_MAP.get(day_gan, ""),
+            "推荐喜用神": [ELEMENTS[i] for i in record[9:11] if i != EMPTY],
+            "五行需求": BaZiCalculator.wuxing_need(wuxing_count),
+            "八字字符串": f"{bazi['年柱']} {bazi['月柱']} {bazi['日柱']} {bazi['时柱']}"
+        }
+
+    @staticmethod
+    def build(path, first=FIRST_DATE, last=LAST_DATE):
+        """
+        生成图谱文件
+        :param path: 输出路径
+        :param first: 起始日期
+        :param last: 结束日期
+        :return: 记录数
+        """
+        day_count = last.toordinal() - first.toordinal() + 1
+        one_day = datetime.timedelta(days=1)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, first.toordinal(), day_count, RECORD.size))
+            date = first
+            for _ in range(day_count):
+                y, m, d = date.year, date.month, date.day
+                chunk = []
+                for shichen in range(12):
+                    sequences = set()
+                    for start_hour, start_minute, end_hour, end_minute in _shichen_spans(shichen):
+                        sequences.add(BaZiCalculator._jie_sequence(y, m, d, start_hour, start_minute))
+                        sequences.add(BaZiCalculator._jie_sequence(y, m, d, end_hour, end_minute))
+                    sequence = min(sequences)
+                    analysis = BaZiCalculator._analyze(y, m, d, shichen, sequence)
+                    chunk.append(_encode(analysis, len(sequences) > 1))
+                f.write(b"".join(chunk))
+                date += one_day
+        os.replace(tmp_path, path)
+        return day_count * 12
+
+
+def main():
+    parser = argparse.ArgumentParser(description="八字图谱工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="生成图谱文件")
+    build_parser.add_argument("output", help="输出文件路径")
+    build_parser.add_argument("--first", default=FIRST_DATE.isoformat(), help="起始日期（YYYY-MM-DD）")
+    build_parser.add_argument("--last", default=LAST_DATE.isoformat(), help="结束日期（YYYY-MM-DD）")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = BaZiAtlas.build(args.output,
+                            datetime.date.fromisoformat(args.first),
+                            datetime.date.fromisoformat(args.last))
+    print(f"已生成 {args.output}：{count} 条记录，"
+          f"{os.path.getsize(args.output) / 1024 / 1024:.1f} MB，耗时 {time.perf_counter() - start:.1f} 秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,21 @@
 """
 
 import datetime
+import functools
+import os
+from bisect import bisect_right
+
+from data_jieqi import JIE_MINUTES, JIE_FIRST_INDEX
+from solar_time import true_solar_time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖，批量计算退回纯 Python
+    np = None
+
+# 节气表时间零点：1900-01-01 00:00（北京时间）
+JIE_EPOCH_ORDINAL = datetime.date(1900, 1, 1).toordinal()
+
 
 class BaZiCalculator:
     """八字计算器"""
@@ -43,89 +58,178 @@ class BaZiCalculator:
     # 月支表（农历月份对应的地支）
     MONTH_ZHI = ["寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥", "子", "丑"]
     
-    # 日柱计算基数表（简化版，实际需要更复杂的计算）
-    DAY_BASE = {
-        (1900, 1999): 0,
-        (2000, 2099): 0,  # 简化处理
+    # 五行顺序（相生顺序；五行统计、五行需求向量均按此排列）
+    WU_XING_ORDER = ["木", "火", "土", "金", "水"]
+    
+    # 藏干权重：本气、中气、余气（对应 DI_ZHI_CANG_GAN 中的顺序）
+    CANG_GAN_WEIGHTS = (1.0, 0.5, 0.3)
+    
+    # 月令当旺的五行
+    SEASON_WU_XING = {
+        "寅": "木", "卯": "木", "巳": "火", "午": "火",
+        "申": "金", "酉": "金", "亥": "水", "子": "水",
+        "辰": "土", "未": "土", "戌": "土", "丑": "土",
     }
     
+    # 旺相休囚死系数：当令者旺，令生者相，生令者休，克令者囚，令克者死
+    WANG_XIANG_COEFFICIENTS = {"旺": 1.5, "相": 1.2, "休": 1.0, "囚": 0.8, "死": 0.6}
+    
+    # 以下三表由 _build_strength_tables 预计算
+    # 月支 -> 五行旺衰系数（按 WU_XING_ORDER）
+    SEASON_COEFFICIENTS = {}
+    # 天干 -> 五行向量
+    GAN_VECTORS = {}
+    # 地支 -> 五行向量（藏干按本气/中气/余气加权）
+    ZHI_VECTORS = {}
+    
+    # 预生成的八字图谱（可选，见 load_atlas）
+    _atlas = None
+    
+    # 六十甲子表：序号 -> (天干, 地支)
+    JIA_ZI = list(zip(TIAN_GAN * 6, DI_ZHI * 5))
+    
+    @classmethod
+    def _jie_sequence(cls, year, month, day, hour=12, minute=0):
+        """
+        查询出生时刻所在的"节"（二分查找节气表，O(log n)）
+        :return: 节序号（以1900年立春为12，每过一个节加1）
+        """
+        moment = ((datetime.date(year, month, day).toordinal() - JIE_EPOCH_ORDINAL) * 1440
+                  + hour * 60 + minute)
+        i = bisect_right(JIE_MINUTES, moment) - 1
+        if i < 0 or i >= len(JIE_MINUTES) - 1:
+            raise ValueError(f"{year}-{month}-{day}超出节气表范围（1900-2100）")
+        # JIE_FIRST_INDEX 以小寒为0；换算为以立春为0
+        return i + JIE_FIRST_INDEX - 1
+    
     @classmethod
-    def calculate_year_pillar(cls, year):
+    def calculate_year_pillar(cls, year, month=None, day=None, hour=12, minute=0):
         """
-        计算年柱
+        计算年柱（以立春为岁首）
         :param year: 年份（如2024）
+        :param month: 月份（可选，提供完整日期时按立春交节时刻换年）
+        :param day: 日期（可选）
+        :param hour: 小时
+        :param minute: 分钟
         :return: (年干, 年支)
         """
-        # 简化计算：以1900年为基准
-        base_year = 1900
-        gan_index = (year - base_year) % 10
-        zhi_index = (year - base_year) % 12
+        if month is not None:
+            return cls._year_pillar_from_sequence(cls._jie_sequence(year, month, day or 1, hour, minute))
+        
+        # 以公元4年（甲子年）为基准
+        gan_index = (year - 4) % 10
+        zhi_index = (year - 4) % 12
         
         return cls.TIAN_GAN[gan_index], cls.DI_ZHI[zhi_index]
     
     @classmethod
-    def calculate_month_pillar(cls, year, month):
+    def _year_pillar_from_sequence(cls, sequence):
+        """由节序号计算年柱"""
+        return cls.calculate_year_pillar(1899 + sequence // 12)
+    
+    @classmethod
+    def calculate_month_pillar(cls, year, month, day=None, hour=12, minute=0):
         """
-        计算月柱
+        计算月柱（以"节"为月界）
         :param year: 年份
         :param month: 月份（1-12）
+        :param day: 日期（可选，缺省取当月15日）
+        :param hour: 小时
+        :param minute: 分钟
         :return: (月干, 月支)
         """
-        # 月支固定
-        month_zhi = cls.MONTH_ZHI[month - 1]
-        
-        # 计算月干：根据年干和月份
-        year_gan, _ = cls.calculate_year_pillar(year)
-        year_gan_index = cls.TIAN_GAN.index(year_gan)
+        return cls._month_pillar_from_sequence(cls._jie_sequence(year, month, day or 15, hour, minute))
+    
+    @classmethod
+    def _month_pillar_from_sequence(cls, sequence):
+        """由节序号计算月柱"""
+        # 月支：寅月起算
+        month_index = sequence % 12
+        month_zhi = cls.MONTH_ZHI[month_index]
         
-        # 月干计算公式：年干序号 * 2 + 月份
-        month_gan_index = (year_gan_index * 2 + month) % 10
+        # 月干（五虎遁）：寅月干序号 = 年干序号 * 2 + 2
+        ganzhi_year = 1899 + sequence // 12
+        year_gan_index = (ganzhi_year - 4) % 10
+        month_gan_index = (year_gan_index * 2 + 2 + month_index) % 10
         month_gan = cls.TIAN_GAN[month_gan_index]
         
         return month_gan, month_zhi
     
+    @staticmethod
+    def julian_day_number(year, month, day):
+        """
+        公历日期的儒略日数（整数，正午起算）
+        :return: 儒略日数
+        """
+        a = (14 - month) // 12
+        y = year + 4800 - a
+        m = month + 12 * a - 3
+        return day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045
+    
+    @classmethod
+    def day_ganzhi_index(cls, year, month, day):
+        """
+        日干支在六十甲子中的序号（0为甲子）
+        儒略日数 + 49 对 60 取余：如 2000-01-01（JDN 2451545）为戊午（54）
+        """
+        return (cls.julian_day_number(year, month, day) + 49) % 60
+    
     @classmethod
     def calculate_day_pillar(cls, year, month, day):
         """
-        计算日柱（标准公式）
-        参考：八字日柱计算公式
+        计算日柱（儒略日数法）
         :param year: 年份
         :param month: 月份
         :param day: 日期
         :return: (日干, 日支)
         """
-        # 标准日柱计算公式
-        # 1. 计算当年元旦干支基数
-        # 公式：基数 = (年尾二位数+3)*5+55+(年尾二位数-1)/4
-        
-        year_tail = year % 100  # 年尾二位数
-        
-        # 计算基数（取整）
-        base = (year_tail + 3) * 5 + 55 + (year_tail - 1) // 4
-        
-        # 2. 计算当年天数（从元旦到指定日期的天数）
-        # 先计算当年是否是闰年
-        is_leap_year = (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
-        
-        # 每月天数（平年）
-        month_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        if is_leap_year:
-            month_days[1] = 29  # 闰年2月29天
-        
-        # 计算当年天数
-        days_of_year = sum(month_days[:month-1]) + day - 1  # -1因为从元旦开始
-        
-        # 3. 计算总基数
-        total_base = base + days_of_year
-        
-        # 4. 对60取余得到干支序号（0-59）
-        ganzhi_index = total_base % 60
-        
-        # 5. 转换为天干地支（0-9为天干，0-11为地支）
-        gan_index = ganzhi_index % 10
-        zhi_index = ganzhi_index % 12
-        
-        return cls.TIAN_GAN[gan_index], cls.DI_ZHI[zhi_index]
+        ganzhi_index = cls.day_ganzhi_index(year, month, day)
+        return cls.TIAN_GAN[ganzhi_index % 10], cls.DI_ZHI[ganzhi_index % 12]
+    
+    @classmethod
+    def day_ganzhi_indices(cls, start, end):
+        """
+        批量计算日期区间内每天的日干支序号（含首尾）
+        安装了 NumPy 时返回 numpy 数组，否则返回列表
+        :param start: 起始日期（datetime.date）
+        :param end: 结束日期（datetime.date）
+        :return: 日干支序号序列
+        """
+        first = cls.julian_day_number(start.year, start.month, start.day) + 49
+        count = end.toordinal() - start.toordinal() + 1
+        if count <= 0:
+            return np.empty(0, dtype=np.int8) if np is not None else []
+        if np is not None:
+            return ((first + np.arange(count)) % 60).astype(np.int8)
+        first %= 60
+        return [(first + k) % 60 for k in range(count)]
+    
+    @classmethod
+    def calculate_day_pillars(cls, start, end):
+        """
+        批量计算日期区间内每天的日柱（含首尾）
+        :param start: 起始日期（datetime.date）
+        :param end: 结束日期（datetime.date）
+        :return: [(日期, 日干, 日支)] 列表
+        """
+        jiazi = cls.JIA_ZI
+        one_day = datetime.timedelta(days=1)
+        result = []
+        date = start
+        for index in cls.day_ganzhi_indices(start, end):
+            gan, zhi = jiazi[int(index)]
+            result.append((date, gan, zhi))
+            date += one_day
+        return result
+    
+    @staticmethod
+    def shichen_index(hour):
+        """
+        小时对应的时辰序号（0为子时，23点与0点同属子时）
+        :param hour: 小时（0-23）
+        :return: 时辰序号（0-11）
+        """
+        return (hour + 1) // 2 % 12
     
     @classmethod
     def calculate_hour_pillar(cls, day_gan, hour):
@@ -136,7 +240,7 @@ class BaZiCalculator:
         :return: (时干, 时支)
         """
         # 时支固定（每2小时一个地支）
-        hour_zhi_index = (hour + 1) // 2 % 12
+        hour_zhi_index = cls.shichen_index(hour)
         hour_zhi = cls.DI_ZHI[hour_zhi_index]
         
         # 计算时干：根据日干和时支
@@ -149,19 +253,39 @@ class BaZiCalculator:
         return hour_gan, hour_zhi
     
     @classmethod
-    def calculate_bazi(cls, year, month, day, hour=12):
+    def calculate_bazi(cls, year, month, day, hour=12, minute=0, longitude=None):
         """
         计算完整的八字
         :param year: 年份
         :param month: 月份
         :param day: 日期
         :param hour: 小时（默认中午12点）
+        :param minute: 分钟
+        :param longitude: 出生地东经度数（可选，提供时按真太阳时定时柱）
         :return: 八字字典
         """
-        year_gan, year_zhi = cls.calculate_year_pillar(year)
-        month_gan, month_zhi = cls.calculate_month_pillar(year, month)
+        return cls._build_bazi(*cls._resolve_moment(year, month, day, hour, minute, longitude))
+    
+    @classmethod
+    def _resolve_moment(cls, year, month, day, hour, minute, longitude):
+        """
+        确定排盘所用的日期、时辰序号和节序号
+        年柱、月柱按北京时间对照节气表；提供经度时，日柱、时柱按真太阳时
+        :return: (年, 月, 日, 时辰序号, 节序号)
+        """
+        sequence = cls._jie_sequence(year, month, day, hour, minute)
+        if longitude is not None:
+            solar = true_solar_time(datetime.datetime(year, month, day, hour, minute), longitude)
+            year, month, day, hour = solar.year, solar.month, solar.day, solar.hour
+        return year, month, day, cls.shichen_index(hour), sequence
+    
+    @classmethod
+    def _build_bazi(cls, year, month, day, shichen, sequence):
+        """由日期、时辰序号和节序号组装八字字典"""
+        year_gan, year_zhi = cls._year_pillar_from_sequence(sequence)
+        month_gan, month_zhi = cls._month_pillar_from_sequence(sequence)
         day_gan, day_zhi = cls.calculate_day_pillar(year, month, day)
-        hour_gan, hour_zhi = cls.calculate_hour_pillar(day_gan, hour)
+        hour_gan, hour_zhi = cls.calculate_hour_pillar(day_gan, shichen * 2)
         
         return {
             "年柱": f"{year_gan}{year_zhi}",
@@ -174,97 +298,147 @@ class BaZiCalculator:
             "时干": hour_gan, "时支": hour_zhi
         }
     
+    @classmethod
+    def _build_strength_tables(cls):
+        """预计算月令旺衰系数表和干支五行向量表"""
+        order = cls.WU_XING_ORDER
+        # 相生顺序中相对当令五行的位置 -> 旺相休囚死（木生火、木克土、金克木、水生木）
+        states = ["旺", "相", "死", "囚", "休"]
+        for zhi, season in cls.SEASON_WU_XING.items():
+            k = order.index(season)
+            cls.SEASON_COEFFICIENTS[zhi] = tuple(
+                cls.WANG_XIANG_COEFFICIENTS[states[(i - k) % 5]] for i in range(5))
+        
+        for gan, wuxing in cls.WU_XING_MAP.items():
+            cls.GAN_VECTORS[gan] = tuple(1.0 if elem == wuxing else 0.0 for elem in order)
+        
+        for zhi, cang_gans in cls.DI_ZHI_CANG_GAN.items():
+            vector = [0.0] * 5
+            for gan, weight in zip(cang_gans, cls.CANG_GAN_WEIGHTS):
+                vector[order.index(cls.WU_XING_MAP[gan])] += weight
+            cls.ZHI_VECTORS[zhi] = tuple(vector)
+    
     @classmethod
     def analyze_wuxing_strength(cls, bazi_dict):
         """
         分析八字中的五行强弱
+        天干各计1，地支按藏干本气/中气/余气加权，再乘以月令旺相休囚死系数
         :param bazi_dict: 八字字典
-        :return: 五行统计字典
+        :return: 五行强度字典（按 WU_XING_ORDER 排列，保留3位小数）
         """
-        wuxing_count = {"木": 0, "火": 0, "土": 0, "金": 0, "水": 0}
-        
-        # 统计天干的五行
+        totals = [0.0] * 5
         for gan_key in ["年干", "月干", "日干", "时干"]:
-            gan = bazi_dict[gan_key]
-            wuxing = cls.WU_XING_MAP.get(gan, "")
-            if wuxing:
-                wuxing_count[wuxing] += 1
-        
-        # 统计地支的五行（包括藏干）
+            for i, value in enumerate(cls.GAN_VECTORS[bazi_dict[gan_key]]):
+                totals[i] += value
         for zhi_key in ["年支", "月支", "日支", "时支"]:
-            zhi = bazi_dict[zhi_key]
-            cang_gans = cls.DI_ZHI_CANG_GAN.get(zhi, [])
-            for gan in cang_gans:
-                wuxing = cls.WU_XING_MAP.get(gan, "")
-                if wuxing:
-                    wuxing_count[wuxing] += 0.5  # 藏干权重较低
+            for i, value in enumerate(cls.ZHI_VECTORS[bazi_dict[zhi_key]]):
+                totals[i] += value
         
-        return wuxing_count
+        coefficients = cls.SEASON_COEFFICIENTS[bazi_dict["月支"]]
+        return {elem: round(total * coefficient, 3)
+                for elem, total, coefficient in zip(cls.WU_XING_ORDER, totals, coefficients)}
+    
+    @classmethod
+    def wuxing_need(cls, wuxing_count):
+        """
+        五行需求向量
+        低于平均强度的五行按差额计需求；生扶它的五行（生我者）若不过旺，再分得一半差额；归一化后和为1
+        :param wuxing_count: 五行强度字典
+        :return: 5元组（按 WU_XING_ORDER，保留3位小数）
+        """
+        strengths = [wuxing_count[elem] for elem in cls.WU_XING_ORDER]
+        mean = sum(strengths) / 5
+        deficits = [max(0.0, mean - value) for value in strengths]
+        # 相生顺序中 i 生 i+1
+        needs = [deficits[i] + (0.5 * deficits[(i + 1) % 5] if strengths[i] <= mean else 0.0)
+                 for i in range(5)]
+        total = sum(needs)
+        if total == 0:
+            return (0.2,) * 5
+        return tuple(round(need / total, 3) for need in needs)
+    
+    @classmethod
+    def xiyongshen_vector(cls, xiyongshen):
+        """
+        将喜用神列表转为需求向量（所列五行均分）
+        :param xiyongshen: 喜用神列表，如 ["金", "水"]
+        :return: 5元组（按 WU_XING_ORDER）；列表为空或无有效五行时返回 None
+        """
+        elements = [elem for elem in cls.WU_XING_ORDER if elem in xiyongshen]
+        if not elements:
+            return None
+        return tuple(round(1 / len(elements), 3) if elem in elements else 0.0 for elem in cls.WU_XING_ORDER)
     
     @classmethod
     def recommend_xiyongshen(cls, wuxing_count):
         """
-        推荐喜用神
-        :param wuxing_count: 五行统计
+        推荐喜用神：取五行需求最大的两个（需求相同按 WU_XING_ORDER 先后），结果确定
+        :param wuxing_count: 五行强度字典
         :return: 喜用神列表
         """
-        # 找出最弱的五行（需要补充的）
-        min_count = min(wuxing_count.values())
-        weak_elements = [elem for elem, count in wuxing_count.items() 
-                        if count == min_count]
-        
-        # 找出次弱的五行
-        sorted_counts = sorted(set(wuxing_count.values()))
-        if len(sorted_counts) > 1:
-            second_min = sorted_counts[1]
-            second_weak = [elem for elem, count in wuxing_count.items() 
-                          if count == second_min]
-            weak_elements.extend(second_weak)
-        
-        # 去重
-        weak_elements = list(set(weak_elements))
-        
-        # 根据五行相生关系推荐
-        recommended = []
-        for elem in weak_elements:
-            recommended.append(elem)
-            # 如果弱的是木，可以补水（水生木）
-            if elem == "木":
-                recommended.append("水")
-            # 如果弱的是火，可以补木（木生火）
-            elif elem == "火":
-                recommended.append("木")
-            # 如果弱的是土，可以补火（火生土）
-            elif elem == "土":
-                recommended.append("火")
-            # 如果弱的是金，可以补土（土生金）
-            elif elem == "金":
-                recommended.append("土")
-            # 如果弱的是水，可以补金（金生水）
-            elif elem == "水":
-                recommended.append("金")
-        
-        # 去重并限制最多2个
-        recommended = list(set(recommended))
-        return recommended[:2]
+        need = cls.wuxing_need(wuxing_count)
+        ranked = sorted(range(5), key=lambda i: (-need[i], i))
+        return [cls.WU_XING_ORDER[i] for i in ranked[:2] if need[i] > 0]
     
     @classmethod
-    def analyze_bazi(cls, year, month, day, hour=12):
+    def analyze_bazi(cls, year, month, day, hour=12, minute=0, longitude=None):
         """
         完整的八字分析
+        结果只取决于日期、时辰（12个）和所在的节，按此记忆化；
+        加载八字图谱（load_atlas）后，缓存未命中时先按索引查表
         :param year: 年份
         :param month: 月份
         :param day: 日期
         :param hour: 小时
+        :param minute: 分钟
+        :param longitude: 出生地东经度数（可选，提供时先做真太阳时校正）
         :return: 分析结果字典
         """
+        result = cls._analyze_cached(*cls._resolve_moment(year, month, day, hour, minute, longitude))
+        # 返回副本，调用方修改结果不影响缓存
+        return dict(result, 八字=dict(result["八字"]), 五行统计=dict(result["五行统计"]),
+                    推荐喜用神=list(result["推荐喜用神"]))
+    
+    @classmethod
+    @functools.lru_cache(maxsize=65536)
+    def _analyze_cached(cls, year, month, day, shichen, sequence):
+        """记忆化的八字分析（键：日期、时辰序号、节序号）"""
+        if cls._atlas is not None:
+            result = cls._atlas.lookup(year, month, day, shichen)
+            # 图谱按（校正后的）日期和时辰取年柱、月柱；真太阳时校正跨过交节时刻时，
+            # 与按北京时间确定的节序号不符，此时不用图谱
+            if result is not None and result["八字"]["月柱"] == "".join(cls._month_pillar_from_sequence(sequence)):
+                return result
+        return cls._analyze(year, month, day, shichen, sequence)
+    
+    @classmethod
+    def load_atlas(cls, path):
+        """
+        加载预生成的八字图谱文件（见 bazi_atlas.py），传入 None 则卸载
+        :param path: 图谱文件路径
+        """
+        from bazi_atlas import BaZiAtlas
+        if cls._atlas is not None:
+            cls._atlas.close()
+        cls._atlas = BaZiAtlas(path) if path else None
+        cls.clear_cache()
+    
+    @classmethod
+    def clear_cache(cls):
+        """清空八字分析缓存"""
+        cls._analyze_cached.cache_clear()
+    
+    @classmethod
+    def _analyze(cls, year, month, day, shichen, sequence):
+        """八字分析（不经缓存）"""
         # 计算八字
-        bazi = cls.calculate_bazi(year, month, day, hour)
+        bazi = cls._build_bazi(year, month, day, shichen, sequence)
         
         # 分析五行强弱
         wuxing_count = cls.analyze_wuxing_strength(bazi)
         
-        # 推荐喜用神
+        # 五行需求与推荐喜用神
+        need = cls.wuxing_need(wuxing_count)
         xiyongshen = cls.recommend_xiyongshen(wuxing_count)
         
         # 日主（日干）分析
@@ -277,10 +451,18 @@ class BaZiCalculator:
             "日主": ri_zhu,
             "日主五行": ri_zhu_wuxing,
             "推荐喜用神": xiyongshen,
+            "五行需求": need,
             "八字字符串": f"{bazi['年柱']} {bazi['月柱']} {bazi['日柱']} {bazi['时柱']}"
         }
 
 
+BaZiCalculator._build_strength_tables()
+
+# 设置 NAMING_BAZI_ATLAS 时自动加载八字图谱
+if os.environ.get("NAMING_BAZI_ATLAS"):
+    BaZiCalculator.load_atlas(os.environ["NAMING_BAZI_ATLAS"])
+
+
 def test_bazi():
     """测试八字计算"""
     print("=" * 60)
@@ -294,6 +476,7 @@ def test_bazi():
     print(f"日主：{result1['日主']}（{result1['日主五行']}）")
     print(f"五行统计：{result1['五行统计']}")
     print(f"推荐喜用神：{result1['推荐喜用神']}")
+    print(f"五行需求：{result1['五行需求']}")
     
     # 测试案例2：2000年6月1日
     print("\n测试案例2：2000年6月1日 8:00")
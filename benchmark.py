@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准模块
+离线、仅依赖标准库（timeit），测量取名流水线各环节的耗时：
+五格计算、三才分析、名字评分、批量生成（按姓氏/性别/喜用神的代表性组合）、八字分析、文化解析，
+每项在不同规模的字库（默认字库按比例均匀抽取的子集）上分别测量，结果输出为 JSON，
+便于在分支之间比较、发现性能回退。
+
+每项先用 timeit 的 autorange 确定循环次数，再重复测量若干轮，记录每次操作的最短与中位耗时（微秒）；
+生成使用固定洗牌种子，记忆化的环节（八字分析、文化解析）分别测量清空缓存后与缓存命中时的耗时。
+
+用法：
+    python benchmark.py run [--sizes 0.25,0.5,1] [--repeat 5] [--output bench.json]
+    python benchmark.py compare base.json bench.json [--threshold 0.2]
+        （耗时增加超过阈值的项视为回退，存在回退时退出码为1）
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+from ai_analyzer import AIAnalyzer, clear_fragment_cache
+from bazi_calculator import BaZiCalculator
+from lexicon import Lexicon, get_default_lexicon
+from naming_generator import NamingGenerator
+from sancai_analyzer import SanCaiAnalyzer
+from wuge_calculator import WuGeCalculator
+
+
+class BenchConfig:
+    """基准配置常量"""
+    SIZES = (0.25, 0.5, 1.0)      # 字库规模（占默认字库的比例）
+    REPEAT = 5                    # 每项重复测量轮数
+    SEED = 20240315               # 生成的洗牌种子
+    NAME_COUNT = 10               # 每次生成名字数
+    SAMPLE_NAMES = 50             # 评分、五格、解析使用的样本名字数
+    BAZI_DATES = 64               # 八字分析使用的出生时刻数
+    THRESHOLD = 0.2               # 比较时视为回退的耗时增幅
+
+
+# 生成的代表性组合：(姓氏, 性别, 喜用神)
+PROFILES = (
+    ("李", "男", []),
+    ("王", "女", ["金", "水"]),
+    ("张", "男", ["木"]),
+)
+
+WU_XING = ("金", "木", "水", "火", "土")
+
+
+def subset_lexicon(fraction, keep=""):
+    """
+    按比例均匀抽取默认字库的子集（各五行、笔画的分布与原字库相近）
+    :param fraction: 比例（0-1]
+    :param keep: 必须保留的字（如姓氏，保证其笔画可查）
+    :return: Lexicon
+    """
+    base = get_default_lexicon()
+    if fraction >= 1:
+        return base
+    chars = base.chars
+    size = max(1, round(len(chars) * fraction))
+    picked = {chars[i * len(chars) // size] for i in range(size)} | {char for char in keep if char in base}
+    return Lexicon({char: base.get(char) for char in chars if char in picked})
+
+
+def sample_names(lexicon, count=BenchConfig.SAMPLE_NAMES):
+    """从字库中确定地取样双字名（首尾交错配对）"""
+    chars = lexicon.chars
+    return [chars[i % len(chars)] + chars[(len(chars) - 1 - 3 * i) % len(chars)] for i in range(count)]
+
+
+def bazi_moments(count=BenchConfig.BAZI_DATES):
+    """确定地取样出生时刻（跨越多年、各时辰）"""
+    start = datetime.datetime(1990, 1, 1, 0, 30)
+    return [start + datetime.timedelta(days=97 * i, hours=5 * i) for i in range(count)]
+
+
+def measure(fn, ops, repeat):
+    """
+    测量耗时
+    :param fn: 被测函数（无参数）
+    :param ops: 每次调用包含的操作数
+    :param repeat: 重复轮数
+    :return: {"ops": 每轮操作数, "best_us": 每次操作最短耗时, "median_us": 每次操作中位耗时}
+    """
+    timer = timeit.Timer(fn)
+    with contextlib.redirect_stdout(io.StringIO()):
+        number, _ = timer.autorange()
+        times = timer.repeat(repeat, number)
+    per_op = [elapsed / (number * ops) * 1e6 for elapsed in times]
+    return {"ops": number * ops, "best_us": round(min(per_op), 3), "median_us": round(statistics.median(per_op), 3)}
+
+
+def _cases(lexicon):
+    """
+    某一字库规模下的全部测量项
+    :return: [(名称, 组合说明, 被测函数, 每次调用的操作数)]
+    """
+    names = sample_names(lexicon)
+    evaluator = NamingGenerator("李", "男", xiyongshen=["木", "水"], lexicon=lexicon)
+    analyzer = AIAnalyzer(lexicon)
+    moments = bazi_moments()
+    sancai = [(a, b, c) for a in WU_XING for b in WU_XING for c in WU_XING]
+
+    def wuge():
+        for name in names:
+            WuGeCalculator("李", name, lexicon).calculate_all()
+
+    def sancai_all():
+        for combo in sancai:
+            SanCaiAnalyzer.analyze_sancai(*combo)
+
+    def evaluate():
+        for name in names:
+            evaluator.evaluate_name("李" + name)
+
+    def bazi(cold):
+        def run():
+            if cold:
+                BaZiCalculator.clear_cache()
+            for moment in moments:
+                BaZiCalculator.analyze_bazi(moment.year, moment.month, moment.day, moment.hour, moment.minute)
+        return run
+
+    def analysis(cold):
+        def run():
+            if cold:
+                clear_fragment_cache()
+            for name in names:
+                analyzer.analyze_name("李", name, "男")
+        return run
+
+    cases = [
+        ("wuge.calculate_all", "", wuge, len(names)),
+        ("sancai.analyze_sancai", "", sancai_all, len(sancai)),
+        ("generator.evaluate_name", "", evaluate, len(names)),
+        ("bazi.analyze_bazi", "cold", bazi(True), len(moments)),
+        ("bazi.analyze_bazi", "cached", bazi(False), len(moments)),
+        ("analyzer.analyze_name", "cold", analysis(True), len(names)),
+        ("analyzer.analyze_name", "cached", analysis(False), len(names)),
+    ]
+    for surname, gender, xiyongshen in PROFILES:
+        generator = NamingGenerator(surname, gender, xiyongshen=xiyongshen, lexicon=lexicon,
+                                    seed=BenchConfig.SEED)
+        profile = f"{surname}{gender}" + (f"（{''.join(xiyongshen)}）" if xiyongshen else "")
+        cases.append(("generator.generate_names", profile,
+                      lambda generator=generator: generator.generate_names(BenchConfig.NAME_COUNT), 1))
+    return cases
+
+
+def result_key(result):
+    """测量项的比较键（名称、组合、字库规模）"""
+    return f"{result['name']}[{result['profile']}]@{result['lexicon_size']}"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(sizes=BenchConfig.SIZES, repeat=BenchConfig.REPEAT, only=None, progress=None):
+    """
+    运行基准
+    :param sizes: 字库规模（比例）
+    :param repeat: 每项重复轮数
+    :param only: 只运行名称以此开头的测量项（可选）
+    :param progress: 进度回调 progress(结果)（可选）
+    :return: {"meta": 运行环境, "results": [测量结果]}
+    """
+    surnames = "".join(surname for surname, _, _ in PROFILES)
+    results = []
+    for fraction in sizes:
+        lexicon = subset_lexicon(fraction, keep=surnames)
+        for name, profile, fn, ops in _cases(lexicon):
+            if only and not name.startswith(only):
+                continue
+            result = dict(name=name, profile=profile, lexicon_size=len(lexicon), **measure(fn, ops, repeat))
+            results.append(result)
+            if progress:
+                progress(result)
+    meta = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": _git_commit(),
+        "lexicon_version": get_default_lexicon().version,
+        "repeat": repeat,
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(baseline, current, threshold=BenchConfig.THRESHOLD):
+    """
+    比较两次基准结果（按每次操作最短耗时）
+    :param baseline: 基线结果（run_benchmarks 的输出）
+    :param current: 本次结果
+    :param threshold: 耗时增幅超过该比例视为回退
+    :return: [(比较键, 基线耗时, 本次耗时, 比值, 是否回退)]，只含两边都有的项
+    """
+    base = {result_key(result): result["best_us"] for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = result_key(result)
+        if key in base and base[key] > 0:
+            ratio = result["best_us"] / base[key]
+            rows.append((key, base[key], result["best_us"], round(ratio, 3), ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="取名流水线性能基准")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="运行基准")
+    run_parser.add_argument("--sizes", default=",".join(map(str, BenchConfig.SIZES)),
+                            help="字库规模（占默认字库的比例，逗号分隔）")
+    run_parser.add_argument("--repeat", type=int, default=BenchConfig.REPEAT, help="每项重复轮数")
+    run_parser.add_argument("--only", help="只运行名称以此开头的测量项（如 generator.）")
+    run_parser.add_argument("--output", help="结果 JSON 文件（默认输出到标准输出）")
+    compare_parser = subparsers.add_parser("compare", help="比较两次基准结果")
+    compare_parser.add_argument("baseline", help="基线结果 JSON")
+    compare_parser.add_argument("current", help="本次结果 JSON")
+    compare_parser.add_argument("--threshold", type=float, default=BenchConfig.THRESHOLD,
+                                help="视为回退的耗时增幅")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        for key, before, after, ratio, regressed in rows:
+            print(f"{'回退' if regressed else '    '} {key:<48} {before:>12.3f} -> {after:>12.3f} 微秒  ×{ratio}")
+        regressions = sum(regressed for *_, regressed in rows)
+        print(f"共比较 {len(rows)} 项，回退 {regressions} 项（阈值 {args.threshold:.0%}）")
+        sys.exit(1 if regressions else 0)
+
+    sizes = [float(size) for size in args.sizes.split(",") if size.strip()]
+    report = run_benchmarks(sizes, args.repeat, args.only, progress=lambda result: print(
+        f"{result_key(result):<56} {result['best_us']:>12.3f} 微秒", file=sys.stderr))
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
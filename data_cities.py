@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+主要城市经度表（东经，单位：度）
+用于出生地真太阳时校正，离线使用
+"""
+
+CITY_LONGITUDES = {
+    # 直辖市
+    "北京": 116.41, "上海": 121.47, "天津": 117.20, "重庆": 106.55,
+    # 东北
+    "哈尔滨": 126.53, "长春": 125.32, "沈阳": 123.43, "大连": 121.61, "吉林": 126.55,
+    "齐齐哈尔": 123.92, "大庆": 125.10, "牡丹江": 129.63, "佳木斯": 130.32, "鞍山": 122.99,
+    "丹东": 124.38,
+    # 华北
+    "石家庄": 114.51, "唐山": 118.18, "保定": 115.46, "邯郸": 114.54, "秦皇岛": 119.60,
+    "太原": 112.55, "大同": 113.30, "呼和浩特": 111.75, "包头": 109.84, "赤峰": 118.89,
+    "鄂尔多斯": 109.78, "呼伦贝尔": 119.77,
+    # 华东
+    "济南": 117.00, "青岛": 120.38, "烟台": 121.45, "潍坊": 119.16, "临沂": 118.36,
+    "淄博": 118.05, "威海": 122.12,
+    "南京": 118.80, "苏州": 120.59, "无锡": 120.31, "常州": 119.97, "南通": 120.89,
+    "徐州": 117.28, "扬州": 119.41,
+    "杭州": 120.16, "宁波": 121.55, "温州": 120.70, "绍兴": 120.58, "嘉兴": 120.76,
+    "金华": 119.65, "台州": 121.42,
+    "合肥": 117.23, "芜湖": 118.43, "蚌埠": 117.39, "安庆": 117.06,
+    "福州": 119.30, "厦门": 118.09, "泉州": 118.68, "漳州": 117.65,
+    "南昌": 115.86, "赣州": 114.93, "九江": 116.00,
+    "台北": 121.56, "高雄": 120.31, "台中": 120.68,
+    # 华中
+    "郑州": 113.62, "洛阳": 112.45, "开封": 114.31, "南阳": 112.53,
+    "武汉": 114.31, "宜昌": 111.29, "襄阳": 112.14,
+    "长沙": 112.94, "株洲": 113.13, "衡阳": 112.57, "岳阳": 113.13,
+    # 华南
+    "广州": 113.26, "深圳": 114.06, "珠海": 113.58, "东莞": 113.75, "佛山": 113.12,
+    "汕头": 116.68, "湛江": 110.36, "惠州": 114.42,
+    "南宁": 108.37, "桂林": 110.29, "柳州": 109.41, "北海": 109.12,
+    "海口": 110.35, "三亚": 109.51,
+    "香港": 114.17, "澳门": 113.54,
+    # 西南
+    "成都": 104.07, "绵阳": 104.68, "宜宾": 104.64, "南充": 106.11,
+    "贵阳": 106.71, "遵义": 106.93,
+    "昆明": 102.83, "大理": 100.23, "丽江": 100.23, "西双版纳": 100.80,
+    "拉萨": 91.13, "日喀则": 88.88,
+    # 西北
+    "西安": 108.94, "宝鸡": 107.24, "延安": 109.49,
+    "兰州": 103.83, "天水": 105.72, "酒泉": 98.49,
+    "银川": 106.23,
+    "西宁": 101.78,
+    "乌鲁木齐": 87.62, "喀什": 75.99, "伊宁": 81.32, "哈密": 93.52, "库尔勒": 86.15,
+}
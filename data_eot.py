@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+均时差表（真太阳时 - 平太阳时，单位：秒）
+按闰年日历排列（第60项为2月29日），每天正午取值
+由 gen_eot_table.py 生成，请勿手工修改
+"""
+
+EOT_SECONDS = (
+    -199, -227, -255, -283, -310, -336, -363, -389, -414, -439, -463, -487, -510, -532, -554, -575, -595, -615, -634, -652, -669, -686, -702, -717, -731, -744, -757, -769, -780, -790, -800,  # 1月
+    -809, -816, -823, -830, -835, -840, -844, -847, -849, -851, -852, -852, -851, -849, -847, -844, -840, -836, -831, -825, -818, -811, -803, -795, -786, -776, -766, -755, -744,  # 2月
+    -732, -720, -707, -694, -680, -666, -652, -637, -622, -607, -591, -575, -559, -543, -526, -509, -491, -474, -456, -439, -421, -403, -385, -366, -348, -330, -312, -294, -276, -258, -240,  # 3月
+    -222, -204, -187, -169, -152, -135, -119, -102, -86, -70, -54, -39, -24, -9, 5, 19, 33, 46, 59, 72, 84, 95, 107, 117, 128, 137, 147, 155, 164, 171,  # 4月
+    178, 185, 191, 196, 201, 205, 209, 212, 215, 217, 218, 219, 219, 219, 218, 217, 215, 212, 209, 206, 202, 197, 192, 187, 180, 174, 167, 159, 151, 143, 134,  # 5月
+    125, 115, 105, 95, 84, 73, 61, 50, 38, 26, 13, 1, -12, -25, -37, -50, -63, -76, -89, -102, -115, -128, -141, -154, -166, -179, -191, -204, -216, -227,  # 6月
+    -239, -250, -261, -272, -283, -293, -302, -312, -321, -329, -337, -344, -351, -358, -364, -369, -374, -379, -382, -386, -388, -390, -392, -393, -393, -393, -392, -391, -389, -386, -383,  # 7月
+    -379, -375, -370, -364, -358, -351, -344, -336, -327, -318, -309, -298, -287, -276, -264, -251, -238, -225, -211, -196, -181, -166, -150, -134, -117, -100, -83, -65, -47, -28, -9,  # 8月
+    10, 29, 48, 68, 88, 109, 129, 150, 171, 192, 213, 234, 255, 277, 298, 320, 341, 363, 385, 406, 427, 448, 470, 490, 511, 532, 552, 572, 592, 612,  # 9月
+    631, 650, 669, 687, 705, 722, 740, 756, 773, 789, 804, 819, 833, 847, 861, 873, 886, 897, 908, 919, 928, 937, 946, 953, 960, 966, 972, 976, 980, 983, 985,  # 10月
+    987, 987, 987, 986, 984, 982, 978, 974, 969, 963, 956, 948, 940, 931, 920, 910, 898, 885, 872, 857, 842, 826, 810, 792, 774, 755, 735, 714, 693, 671,  # 11月
+    649, 625, 602, 577, 552, 527, 501, 474, 448, 420, 393, 365, 337, 308, 279, 250, 221, 192, 162, 132, 103, 73, 43, 13, -17, -46, -76, -105, -135, -164, -192,  # 12月
+)
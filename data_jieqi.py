@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+十二节交节时刻表（1899年大雪 至 2101年小寒）
+每项为自 1900-01-01 00:00（北京时间）起的分钟数，按时间升序排列
+由 gen_jieqi_table.py 生成，请勿手工修改
+"""
+
+JIE_NAMES = ['小寒', '立春', '惊蛰', '清明', '立夏', '芒种', '小暑', '立秋', '白露', '寒露', '立冬', '大雪']
+
+# 第一项（1899年大雪）在 JIE_NAMES 中的序号
+JIE_FIRST_INDEX = 11
+
+JIE_MINUTES = (
+    -35095,  # 1899
+    7324, 49792, 92662, 136193, 180475, 225399, 270670, 315891, 360677, 404773, 448120, 490856,  # 1900
+    533273, 575740, 618611, 662144, 706431, 751357, 796628, 841846, 886630, 930727, 974075, 1016813,  # 1901
+    1059231, 1101698, 1144568, 1188098, 1232379, 1277300, 1322567, 1367782, 1412567, 1456665, 1500018, 1542761,  # 1902
+    1585184, 1627651, 1670519, 1714046, 1758326, 1803247, 1848517, 1893736, 1938522, 1982622, 2025973, 2068715,  # 1903
+    2111137, 2153604, 2196472, 2239999, 2284279, 2329201, 2374472, 2419692, 2464478, 2508576, 2551925, 2594665,  # 1904
+    2637087, 2679556, 2722426, 2765955, 2810234, 2855154, 2900420, 2945637, 2990422, 3034520, 3077870, 3120611,  # 1905
+    3163033, 3205504, 3248376, 3291907, 3336189, 3381109, 3426376, 3471592, 3516376, 3560475, 3603827, 3646569,  # 1906
+    3688991, 3731459, 3774327, 3817855, 3862134, 3907053, 3952319, 3997536, 4042322, 4086423, 4129776, 4172519,  # 1907
+    4214941, 4257407, 4300274, 4343800, 4388079, 4432999, 4478268, 4523487, 4568272, 4612371, 4655722, 4698464,  # 1908
+    4740885, 4783353, 4826221, 4869750, 4914031, 4958954, 5004224, 5049443, 5094227, 5138323, 5181673, 5224415,  # 1909
+    5266838, 5309307, 5352177, 5395703, 5439980, 5484897, 5530161, 5575377, 5620162, 5664261, 5707613, 5750357,  # 1910
+    5792781, 5835250, 5878119, 5921645, 5965920, 6010838, 6056105, 6101325, 6146113, 6190215, 6233567, 6276308,  # 1911
+    6318727, 6361193, 6404061, 6447588, 6491867, 6536788, 6582057, 6627277, 6672066, 6716167, 6759519, 6802259,  # 1912
+    6844678, 6887143, 6930009, 6973536, 7017815, 7062734, 7107999, 7153216, 7198003, 7242104, 7285458, 7328201,  # 1913
+    7370623, 7413089, 7455956, 7499482, 7543760, 7588680, 7633947, 7679165, 7723953, 7768055, 7811411, 7854157,  # 1914
+    7896580, 7939045, 7981908, 8025429, 8069703, 8114620, 8159888, 8205108, 8249897, 8294001, 8337358, 8380104,  # 1915
+    8422528, 8464994, 8507857, 8551378, 8595650, 8640566, 8685834, 8731055, 8775845, 8819948, 8863302, 8906046,  # 1916
+    8948469, 8990938, 9033805, 9077330, 9121606, 9166523, 9211790, 9257010, 9301800, 9345902, 9389257, 9432001,  # 1917
+    9474424, 9516893, 9559761, 9603285, 9647558, 9692471, 9737732, 9782948, 9827736, 9871840, 9915199, 9957946,  # 1918
+    10000371, 10042839, 10085706, 10129229, 10173502, 10218417, 10263681, 10308898, 10353688, 10397793, 10441152, 10483898,  # 1919
+    10526321, 10568786, 10611651, 10655175, 10699451, 10744371, 10789639, 10834858, 10879647, 10923749, 10967105, 11009850,  # 1920
+    11052274, 11094740, 11137605, 11181129, 11225404, 11270322, 11315587, 11360804, 11405590, 11449691, 11493045, 11535791,  # 1921
+    11578217, 11620686, 11663554, 11707078, 11751353, 11796271, 11841538, 11886757, 11931546, 11975649, 12019005, 12061751,  # 1922
+    12104174, 12146640, 12189504, 12233026, 12277298, 12322215, 12367482, 12412705, 12457497, 12501603, 12544960, 12587705,  # 1923
+    12630125, 12672590, 12715452, 12758973, 12803246, 12848162, 12893430, 12938652, 12983446, 13027552, 13070909, 13113653,  # 1924
+    13156073, 13198537, 13241400, 13284923, 13329198, 13374117, 13419385, 13464607, 13509400, 13553507, 13596866, 13639612,  # 1925
+    13682034, 13724498, 13767360, 13810878, 13855148, 13900062, 13945326, 13990544, 14035336, 14079445, 14122808, 14165559,  # 1926
+    14207985, 14250450, 14293310, 14336826, 14381093, 14426005, 14471270, 14516492, 14561286, 14605395, 14648757, 14691506,  # 1927
+    14733931, 14776396, 14819257, 14862775, 14907044, 14951957, 14997224, 15042448, 15087242, 15131350, 15174710, 15217457,  # 1928
+    15259882, 15302349, 15345212, 15388731, 15433000, 15477911, 15523172, 15568389, 15613180, 15657287, 15700647, 15743396,  # 1929
+    15785822, 15828291, 15871157, 15914677, 15958947, 16003858, 16049120, 16094337, 16139129, 16183238, 16226600, 16269351,  # 1930
+    16311776, 16354241, 16397102, 16440620, 16484890, 16529802, 16575066, 16620285, 16665077, 16709187, 16752550, 16795300,  # 1931
+    16837725, 16880189, 16923049, 16966566, 17010835, 17055748, 17101012, 17146232, 17191023, 17235130, 17278490, 17321238,  # 1932
+    17363663, 17406129, 17448991, 17492511, 17536782, 17581698, 17626965, 17672186, 17716978, 17761084, 17804443, 17847191,  # 1933
+    17889616, 17932084, 17974946, 18018464, 18062731, 18107642, 18152905, 18198124, 18242916, 18287025, 18330387, 18373136,  # 1934
+    18415562, 18458029, 18500890, 18544406, 18588672, 18633582, 18678846, 18724068, 18768864, 18812976, 18856338, 18899085,  # 1935
+    18941507, 18983969, 19026829, 19070347, 19114617, 19159531, 19204798, 19250023, 19294821, 19338933, 19382295, 19425042,  # 1936
+    19467464, 19509925, 19552784, 19596301, 19640571, 19685483, 19730746, 19775966, 19820760, 19864871, 19908235, 19950986,  # 1937
+    19993411, 20035875, 20078734, 20122249, 20166515, 20211427, 20256692, 20301913, 20346708, 20390821, 20434188, 20476942,  # 1938
+    20519368, 20561830, 20604686, 20648197, 20692461, 20737372, 20782639, 20827864, 20872662, 20916777, 20960144, 21002897,  # 1939
+    21045324, 21087787, 21130644, 21174155, 21218416, 21263324, 21308588, 21353812, 21398609, 21442722, 21486087, 21528838,  # 1940
+    21571264, 21613730, 21656590, 21700105, 21744370, 21789279, 21834543, 21879766, 21924564, 21968678, 22012044, 22054796,  # 1941
+    22097222, 22139688, 22182549, 22226064, 22270327, 22315233, 22360492, 22405710, 22450506, 22494622, 22537991, 22580747,  # 1942
+    22623175, 22665640, 22708499, 22752011, 22796273, 22841179, 22886439, 22931659, 22976455, 23020571, 23063939, 23106693,  # 1943
+    23149119, 23191583, 23234440, 23277954, 23322220, 23367131, 23412396, 23457619, 23502416, 23546529, 23589895, 23632648,  # 1944
+    23675074, 23717539, 23760398, 23803912, 23848177, 23893086, 23938347, 23983565, 24028358, 24072469, 24115834, 24158588,  # 1945
+    24201016, 24243484, 24286345, 24329859, 24374122, 24419029, 24464291, 24509512, 24554308, 24598421, 24641787, 24684540,  # 1946
+    24726966, 24769430, 24812288, 24855800, 24900063, 24944971, 24990236, 25035461, 25080261, 25124377, 25167744, 25210496,  # 1947
+    25252920, 25295382, 25338238, 25381749, 25426012, 25470921, 25516184, 25561406, 25606205, 25650320, 25693687, 25736438,  # 1948
+    25778861, 25821323, 25864179, 25907692, 25951957, 25996867, 26042132, 26087355, 26132154, 26176271, 26219640, 26262393,  # 1949
+    26304819, 26347281, 26390135, 26433644, 26477905, 26522811, 26568073, 26613295, 26658094, 26702212, 26745584, 26788342,  # 1950
+    26830770, 26873233, 26916087, 26959593, 27003849, 27048753, 27094014, 27139238, 27184038, 27228156, 27271527, 27314282,  # 1951
+    27356710, 27399173, 27442027, 27485535, 27529794, 27574701, 27619965, 27665191, 27709994, 27754112, 27797482, 27840235,  # 1952
+    27882662, 27925126, 27967982, 28011493, 28055752, 28100656, 28145915, 28191135, 28235933, 28280050, 28323421, 28366177,  # 1953
+    28408605, 28451071, 28493929, 28537439, 28581698, 28626601, 28671859, 28717079, 28761878, 28805997, 28849371, 28892128,  # 1954
+    28934556, 28977018, 29019871, 29063379, 29107638, 29152544, 29197806, 29243030, 29287832, 29331952, 29375325, 29418083,  # 1955
+    29460510, 29502972, 29545824, 29589331, 29633590, 29678496, 29723758, 29768980, 29813779, 29857896, 29901266, 29944022,  # 1956
+    29986450, 30028915, 30071770, 30115279, 30159538, 30204445, 30249708, 30294932, 30339732, 30383850, 30427220, 30469976,  # 1957
+    30512404, 30554869, 30597725, 30641232, 30685489, 30730392, 30775654, 30820877, 30865679, 30909799, 30953172, 30995930,  # 1958
+    31038358, 31080822, 31123677, 31167183, 31211439, 31256340, 31301600, 31346824, 31391628, 31435750, 31479122, 31521877,  # 1959
+    31564302, 31606763, 31649616, 31693124, 31737383, 31782289, 31827553, 31872780, 31917585, 31961709, 32005082, 32047838,  # 1960
+    32090263, 32132722, 32175575, 32219082, 32263341, 32308246, 32353507, 32398729, 32443529, 32487651, 32531026, 32573786,  # 1961
+    32616215, 32658677, 32701529, 32745034, 32789290, 32834191, 32879451, 32924674, 32969475, 33013598, 33056975, 33099737,  # 1962
+    33142166, 33184628, 33227477, 33270979, 33315232, 33360135, 33405398, 33450626, 33495432, 33539556, 33582932, 33625693,  # 1963
+    33668122, 33710585, 33753436, 33796938, 33841191, 33886092, 33931352, 33976576, 34021380, 34065502, 34108875, 34151633,  # 1964
+    34194062, 34236526, 34279381, 34322887, 34367142, 34412042, 34457302, 34502525, 34547328, 34591451, 34634827, 34677585,  # 1965
+    34720014, 34762478, 34805331, 34848837, 34893091, 34937990, 34983247, 35028469, 35073272, 35117397, 35160775, 35203538,  # 1966
+    35245968, 35288431, 35331282, 35374785, 35419038, 35463936, 35509193, 35554415, 35599218, 35643341, 35686717, 35729477,  # 1967
+    35771906, 35814367, 35857218, 35900721, 35944976, 35989879, 36035142, 36080367, 36125172, 36169294, 36212669, 36255428,  # 1968
+    36297857, 36340319, 36383171, 36426675, 36470930, 36515832, 36561092, 36606314, 36651115, 36695237, 36738611, 36781371,  # 1969
+    36823802, 36866266, 36909118, 36952622, 36996874, 37041772, 37087031, 37132254, 37177058, 37221182, 37264558, 37307317,  # 1970
+    37349745, 37392205, 37435055, 37478556, 37522808, 37567709, 37612971, 37658200, 37703010, 37747139, 37790517, 37833276,  # 1971
+    37875702, 37918160, 37961008, 38004509, 38048761, 38093662, 38138923, 38184149, 38228955, 38273082, 38316459, 38359219,  # 1972
+    38401645, 38444104, 38486953, 38530454, 38574706, 38619607, 38664868, 38710093, 38754899, 38799027, 38842408, 38885170,  # 1973
+    38927600, 38970060, 39012907, 39056405, 39100654, 39145552, 39190811, 39236037, 39280845, 39324975, 39368358, 39411125,  # 1974
+    39453557, 39496019, 39538866, 39582362, 39626607, 39671502, 39716760, 39761985, 39806793, 39850922, 39894303, 39937066,  # 1975
+    39979497, 40021959, 40064808, 40108306, 40152555, 40197451, 40242711, 40287938, 40332748, 40376878, 40420259, 40463021,  # 1976
+    40505451, 40547913, 40590764, 40634266, 40678516, 40723412, 40768668, 40813890, 40858696, 40902824, 40946206, 40988971,  # 1977
+    41031403, 41073867, 41116718, 41160219, 41204469, 41249363, 41294617, 41339838, 41384642, 41428771, 41472154, 41514920,  # 1978
+    41557351, 41599812, 41642660, 41686158, 41730407, 41775305, 41820565, 41865791, 41910600, 41954730, 41998113, 42040878,  # 1979
+    42083309, 42125769, 42168616, 42212115, 42256365, 42301264, 42346524, 42391749, 42436554, 42480679, 42524058, 42566821,  # 1980
+    42609253, 42651715, 42694565, 42738065, 42782315, 42827213, 42872472, 42917697, 42962503, 43006630, 43050008, 43092771,  # 1981
+    43135202, 43177665, 43220515, 43264013, 43308260, 43353156, 43398415, 43443642, 43488452, 43532582, 43575964, 43618728,  # 1982
+    43661159, 43703620, 43746467, 43789964, 43834211, 43879106, 43924363, 43969590, 44014400, 44058531, 44101912, 44144674,  # 1983
+    44187101, 44229559, 44272405, 44315902, 44360151, 44405049, 44450309, 44495538, 44540350, 44584483, 44627865, 44670628,  # 1984
+    44713055, 44755512, 44798356, 44841854, 44886103, 44931000, 44976259, 45021484, 45066293, 45110425, 45153809, 45196576,  # 1985
+    45239008, 45281468, 45324312, 45367806, 45412051, 45456945, 45502201, 45547426, 45592235, 45636367, 45679753, 45722521,  # 1986
+    45764953, 45807412, 45850254, 45893744, 45937986, 45982879, 46028139, 46073369, 46118184, 46162320, 46205706, 46248472,  # 1987
+    46290903, 46333363, 46376207, 46419699, 46463942, 46508835, 46554093, 46599320, 46644132, 46688265, 46731649, 46774414,  # 1988
+    46816846, 46859307, 46902154, 46945650, 46989894, 47034785, 47080040, 47125264, 47170074, 47214207, 47257593, 47300361,  # 1989
+    47342793, 47385254, 47428099, 47471593, 47515836, 47560726, 47605981, 47651206, 47696018, 47740154, 47783543, 47826314,  # 1990
+    47868748, 47911208, 47954052, 47997545, 48041787, 48086678, 48131933, 48177157, 48221967, 48266101, 48309488, 48352256,  # 1991
+    48394688, 48437148, 48479992, 48523485, 48567729, 48612622, 48657880, 48703108, 48747918, 48792051, 48835437, 48878204,  # 1992
+    48920636, 48963097, 49005942, 49049437, 49093682, 49138575, 49183832, 49229058, 49273868, 49318000, 49361385, 49404154,  # 1993
+    49446588, 49489051, 49531898, 49575392, 49619634, 49664525, 49709780, 49755004, 49799815, 49843949, 49887336, 49930103,  # 1994
+    49972534, 50014993, 50057836, 50101328, 50145570, 50190463, 50235721, 50280952, 50325769, 50369907, 50413295, 50456062,  # 1995
+    50498491, 50540948, 50583790, 50627282, 50671526, 50716421, 50761680, 50806909, 50851722, 50895859, 50939246, 50982014,  # 1996
+    51024444, 51066902, 51109744, 51153236, 51197480, 51242373, 51287630, 51332856, 51377669, 51421805, 51465195, 51507965,  # 1997
+    51550398, 51592857, 51635697, 51679185, 51723423, 51768314, 51813571, 51858800, 51903616, 51947756, 51991148, 52033921,  # 1998
+    52076357, 52118817, 52161658, 52205145, 52249381, 52294269, 52339525, 52384754, 52429570, 52473708, 52517098, 52559867,  # 1999
+    52602301, 52644760, 52687603, 52731092, 52775330, 52820219, 52865474, 52910703, 52955519, 52999658, 53043048, 53085817,  # 2000
+    53128249, 53170709, 53213552, 53257044, 53301285, 53346174, 53391427, 53436652, 53481466, 53525605, 53568997, 53611769,  # 2001
+    53654203, 53696664, 53739507, 53782998, 53827237, 53872125, 53917376, 53962599, 54007411, 54051549, 54094942, 54137714,  # 2002
+    54180148, 54222605, 54265445, 54308933, 54353171, 54398060, 54443316, 54488544, 54533360, 54577501, 54620893, 54663665,  # 2003
+    54706098, 54748556, 54791396, 54834883, 54879123, 54924014, 54969271, 55014500, 55059313, 55103449, 55146838, 55189609,  # 2004
+    55232043, 55274503, 55317345, 55360834, 55405073, 55449962, 55495217, 55540444, 55585257, 55629393, 55672782, 55715553,  # 2005
+    55757987, 55800447, 55843289, 55886775, 55931011, 55975897, 56021152, 56066381, 56111199, 56155341, 56198735, 56241507,  # 2006
+    56283940, 56326398, 56369238, 56412725, 56456960, 56501847, 56547102, 56592331, 56637150, 56681291, 56724684, 56767454,  # 2007
+    56809885, 56852340, 56895179, 56938666, 56982904, 57027792, 57073047, 57118276, 57163094, 57207237, 57250630, 57293402,  # 2008
+    57335834, 57378290, 57421127, 57464614, 57508851, 57553739, 57598994, 57644221, 57689038, 57733180, 57776576, 57819352,  # 2009
+    57861789, 57904248, 57947086, 57990570, 58034804, 58079690, 58124943, 58170169, 58214985, 58259126, 58302522, 58345298,  # 2010
+    58387734, 58430193, 58473030, 58516512, 58560743, 58605628, 58650882, 58696114, 58740934, 58785079, 58828475, 58871249,  # 2011
+    58913684, 58956142, 58998981, 59042466, 59086700, 59131586, 59176841, 59222071, 59266889, 59311032, 59354426, 59397199,  # 2012
+    59439634, 59482093, 59524935, 59568422, 59612658, 59657543, 59702795, 59748021, 59792836, 59836978, 59880374, 59923148,  # 2013
+    59965584, 60008043, 60050882, 60094367, 60138600, 60183483, 60228735, 60273963, 60318782, 60362928, 60406327, 60449104,  # 2014
+    60491540, 60533998, 60576836, 60620319, 60664553, 60709438, 60754692, 60799922, 60844740, 60888883, 60932279, 60975053,  # 2015
+    61017488, 61059946, 61102783, 61146268, 61190502, 61235389, 61280644, 61325873, 61370691, 61414833, 61458228, 61501001,  # 2016
+    61543436, 61585894, 61628733, 61672217, 61716451, 61761337, 61806591, 61851820, 61896639, 61940782, 61984178, 62026953,  # 2017
+    62069389, 62111848, 62154688, 62198173, 62242405, 62287289, 62332542, 62377771, 62422590, 62466735, 62510132, 62552906,  # 2018
+    62595339, 62637794, 62680630, 62724111, 62768343, 62813227, 62858481, 62903713, 62948537, 62992686, 63036084, 63078858,  # 2019
+    63121290, 63163743, 63206577, 63250058, 63294291, 63339179, 63384435, 63429666, 63474488, 63518635, 63562034, 63604809,  # 2020
+    63647243, 63689699, 63732534, 63776015, 63820247, 63865132, 63910386, 63955614, 64000433, 64044579, 64087979, 64130757,  # 2021
+    64173194, 64215651, 64258484, 64301960, 64346186, 64391066, 64436318, 64481549, 64526372, 64570522, 64613925, 64656706,  # 2022
+    64699145, 64741602, 64784436, 64827913, 64872139, 64917018, 64962271, 65007503, 65052327, 65096476, 65139875, 65182653,  # 2023
+    65225089, 65267547, 65310383, 65353862, 65398090, 65442970, 65488220, 65533449, 65578271, 65622420, 65665820, 65708597,  # 2024
+    65751033, 65793490, 65836327, 65879808, 65924037, 65968917, 66014165, 66059392, 66104212, 66148361, 66191764, 66234544,  # 2025
+    66276983, 66319442, 66362279, 66405760, 66449989, 66494868, 66540117, 66585343, 66630161, 66674309, 66717712, 66760492,  # 2026
+    66802930, 66845386, 66888219, 66931697, 66975925, 67020806, 67066057, 67111287, 67156108, 67200257, 67243658, 67286437,  # 2027
+    67328874, 67371331, 67414165, 67457643, 67501872, 67546756, 67592010, 67637241, 67682062, 67726208, 67769607, 67812384,  # 2028
+    67854822, 67897280, 67940117, 67983598, 68027828, 68072710, 68117962, 68163192, 68208012, 68252158, 68295557, 68338334,  # 2029
+    68380770, 68423228, 68466063, 68509541, 68553766, 68598644, 68643895, 68689127, 68733953, 68778105, 68821508, 68864287,  # 2030
+    68906723, 68949178, 68992011, 69035488, 69079715, 69124596, 69169849, 69215083, 69259910, 69304063, 69347465, 69390243,  # 2031
+    69432676, 69475129, 69517960, 69561437, 69605666, 69650548, 69695801, 69741033, 69785858, 69830010, 69873414, 69916193,  # 2032
+    69958628, 70001081, 70043912, 70087388, 70131614, 70176493, 70221745, 70266976, 70311800, 70355954, 70399361, 70442145,  # 2033
+    70484584, 70527041, 70569872, 70613346, 70657569, 70702447, 70747698, 70792929, 70837754, 70881907, 70925313, 70968096,  # 2034
+    71010535, 71052991, 71095821, 71139294, 71183515, 71228391, 71273641, 71318874, 71363702, 71407857, 71451264, 71494045,  # 2035
+    71536483, 71578939, 71621771, 71665246, 71709469, 71754347, 71799597, 71844829, 71889655, 71933809, 71977214, 72019996,  # 2036
+    72062434, 72104891, 72147726, 72191204, 72235429, 72280307, 72325555, 72370783, 72415605, 72459757, 72503164, 72545947,  # 2037
+    72588386, 72630843, 72673675, 72717149, 72761371, 72806245, 72851492, 72896721, 72941546, 72985701, 73029110, 73071896,  # 2038
+    73114336, 73156792, 73199623, 73243095, 73287318, 73332195, 73377446, 73422678, 73467504, 73511657, 73555062, 73597845,  # 2039
+    73640283, 73682739, 73725571, 73769045, 73813269, 73858148, 73903399, 73948630, 73993454, 74037605, 74081009, 74123790,  # 2040
+    74166228, 74208685, 74251517, 74294992, 74339214, 74384090, 74429338, 74474568, 74519393, 74563547, 74606953, 74649735,  # 2041
+    74692175, 74734632, 74777465, 74820940, 74865163, 74910038, 74955287, 75000519, 75045345, 75089500, 75132907, 75175689,  # 2042
+    75218125, 75260578, 75303407, 75346880, 75391102, 75435978, 75481228, 75526460, 75571290, 75615447, 75658855, 75701637,  # 2043
+    75744072, 75786524, 75829351, 75872823, 75917045, 75961924, 76007176, 76052408, 76097236, 76141393, 76184801, 76227585,  # 2044
+    76270022, 76312476, 76355305, 76398777, 76442999, 76487877, 76533128, 76578359, 76623185, 76667340, 76710749, 76753535,  # 2045
+    76795975, 76838430, 76881257, 76924724, 76968940, 77013812, 77059060, 77104293, 77149123, 77193282, 77236694, 77279481,  # 2046
+    77321922, 77364377, 77407205, 77450672, 77494888, 77539761, 77585010, 77630246, 77675078, 77719237, 77762647, 77805430,  # 2047
+    77847869, 77890324, 77933154, 77976625, 78020844, 78065718, 78110966, 78156198, 78201028, 78245186, 78288596, 78331380,  # 2048
+    78373818, 78416273, 78459102, 78502574, 78546792, 78591663, 78636908, 78682138, 78726965, 78771124, 78814538, 78857326,  # 2049
+    78899767, 78942223, 78985052, 79028523, 79072742, 79117614, 79162861, 79208092, 79252920, 79297080, 79340493, 79383281,  # 2050
+    79425721, 79468175, 79511001, 79554469, 79598687, 79643560, 79688809, 79734041, 79778871, 79823030, 79866442, 79909228,  # 2051
+    79951668, 79994122, 80036949, 80080417, 80124634, 80169509, 80214760, 80259993, 80304822, 80348979, 80392389, 80435175,  # 2052
+    80477615, 80520072, 80562903, 80606374, 80650593, 80695467, 80740717, 80785950, 80830778, 80874936, 80918346, 80961131,  # 2053
+    81003572, 81046027, 81088855, 81132322, 81176537, 81221407, 81266653, 81311887, 81356719, 81400882, 81444296, 81487083,  # 2054
+    81529522, 81571975, 81614801, 81658268, 81702483, 81747355, 81792605, 81837841, 81882675, 81926838, 81970252, 82013038,  # 2055
+    82055475, 82097926, 82140751, 82184219, 82228437, 82273312, 82318562, 82363796, 82408627, 82452789, 82496203, 82538990,  # 2056
+    82581429, 82623882, 82666706, 82710172, 82754386, 82799256, 82844502, 82889733, 82934564, 82978726, 83022142, 83064934,  # 2057
+    83107378, 83149834, 83192659, 83236123, 83280335, 83325204, 83370451, 83415685, 83460517, 83504681, 83548096, 83590886,  # 2058
+    83633328, 83675783, 83718608, 83762072, 83806283, 83851152, 83896398, 83941632, 83986466, 84030630, 84074045, 84116833,  # 2059
+    84159273, 84201727, 84244553, 84288019, 84332232, 84377101, 84422347, 84467579, 84512410, 84556573, 84599988, 84642777,  # 2060
+    84685218, 84727673, 84770501, 84813970, 84858186, 84903056, 84948302, 84993532, 85038362, 85082524, 85125939, 85168730,  # 2061
+    85211172, 85253626, 85296451, 85339915, 85384127, 85428994, 85474238, 85519468, 85564300, 85608464, 85651882, 85694674,  # 2062
+    85737116, 85779570, 85822394, 85865856, 85910068, 85954937, 86000185, 86045420, 86090253, 86134416, 86177831, 86220620,  # 2063
+    86263061, 86305514, 86348339, 86391804, 86436018, 86480890, 86526139, 86571374, 86616206, 86660367, 86703781, 86746569,  # 2064
+    86789009, 86831463, 86874288, 86917753, 86961965, 87006832, 87052076, 87097309, 87142141, 87186305, 87229722, 87272512,  # 2065
+    87314954, 87357409, 87400233, 87443697, 87487908, 87532775, 87578021, 87623256, 87668093, 87712260, 87755679, 87798468,  # 2066
+    87840906, 87883357, 87926178, 87969640, 88013852, 88058721, 88103969, 88149205, 88194042, 88238210, 88281630, 88324420,  # 2067
+    88366859, 88409308, 88452128, 88495589, 88539800, 88584669, 88629916, 88675151, 88719985, 88764152, 88807573, 88850365,  # 2068
+    88892808, 88935260, 88978082, 89021543, 89065754, 89110623, 89155870, 89201105, 89245940, 89290106, 89333527, 89376322,  # 2069
+    89418767, 89461221, 89504042, 89547499, 89591704, 89636567, 89681812, 89727046, 89771883, 89816053, 89859475, 89902270,  # 2070
+    89944715, 89987170, 90029992, 90073450, 90117655, 90162517, 90207762, 90252999, 90297837, 90342007, 90385428, 90428220,  # 2071
+    90470662, 90513116, 90555940, 90599403, 90643613, 90688479, 90733725, 90778959, 90823794, 90867963, 90911383, 90954176,  # 2072
+    90996618, 91039072, 91081896, 91125359, 91169567, 91214430, 91259670, 91304900, 91349733, 91393901, 91437323, 91480120,  # 2073
+    91522565, 91565020, 91607844, 91651304, 91695513, 91740377, 91785620, 91830853, 91875688, 91919857, 91963279, 92006074,  # 2074
+    92048517, 92090970, 92133791, 92177250, 92221459, 92266326, 92311573, 92356808, 92401643, 92445811, 92489231, 92532024,  # 2075
+    92574466, 92616919, 92659740, 92703200, 92747408, 92792274, 92837520, 92882754, 92927588, 92971754, 93015173, 93057965,  # 2076
+    93100408, 93142862, 93185686, 93229148, 93273357, 93318224, 93363470, 93408706, 93453543, 93497710, 93541129, 93583922,  # 2077
+    93626364, 93668817, 93711637, 93755095, 93799301, 93844164, 93889408, 93934644, 93979483, 94023655, 94067079, 94109872,  # 2078
+    94152313, 94194762, 94237580, 94281037, 94325242, 94370105, 94415351, 94460589, 94505430, 94549603, 94593026, 94635819,  # 2079
+    94678259, 94720707, 94763524, 94806982, 94851190, 94896057, 94941305, 94986543, 95031382, 95075554, 95118978, 95161773,  # 2080
+    95204215, 95246665, 95289482, 95332937, 95377139, 95422001, 95467243, 95512476, 95557314, 95601486, 95644912, 95687711,  # 2081
+    95730158, 95772611, 95815429, 95858882, 95903082, 95947942, 95993185, 96038421, 96083262, 96127437, 96170863, 96213661,  # 2082
+    96256105, 96298558, 96341375, 96384830, 96429031, 96473891, 96519135, 96564372, 96609214, 96653389, 96696815, 96739611,  # 2083
+    96782054, 96824506, 96867324, 96910780, 96954982, 96999842, 97045083, 97090316, 97135154, 97179326, 97222753, 97265550,  # 2084
+    97307995, 97350449, 97393270, 97436728, 97480932, 97525794, 97571036, 97616269, 97661107, 97705280, 97748707, 97791506,  # 2085
+    97833953, 97876406, 97919223, 97962677, 98006878, 98051738, 98096979, 98142213, 98187052, 98231226, 98274655, 98317455,  # 2086
+    98359902, 98402354, 98445171, 98488624, 98532824, 98577684, 98622927, 98668164, 98713004, 98757177, 98800602, 98843400,  # 2087
+    98885844, 98928297, 98971116, 99014572, 99058776, 99103639, 99148885, 99194123, 99238963, 99283136, 99326560, 99369356,  # 2088
+    99411800, 99454254, 99497074, 99540530, 99584731, 99629590, 99674831, 99720064, 99764903, 99809077, 99852504, 99895302,  # 2089
+    99937748, 99980201, 100023021, 100066475, 100110676, 100155534, 100200776, 100246012, 100290855, 100335033, 100378462, 100421259,  # 2090
+    100463701, 100506150, 100548965, 100592419, 100636622, 100681485, 100726730, 100771969, 100816813, 100860991, 100904420, 100947218,  # 2091
+    100989660, 101032108, 101074922, 101118374, 101162576, 101207437, 101252680, 101297915, 101342756, 101386931, 101430360, 101473160,  # 2092
+    101515606, 101558058, 101600874, 101644325, 101688526, 101733386, 101778630, 101823867, 101868709, 101912885, 101956315, 101999116,  # 2093
+    102041564, 102084016, 102126831, 102170279, 102214475, 102259331, 102304573, 102349811, 102394655, 102438835, 102482266, 102525067,  # 2094
+    102567514, 102609966, 102652781, 102696230, 102740425, 102785280, 102830520, 102875758, 102920603, 102964782, 103008212, 103051011,  # 2095
+    103093455, 103135906, 103178722, 103222175, 103266375, 103311234, 103356476, 103401713, 103446556, 103490735, 103534165, 103576965,  # 2096
+    103619410, 103661861, 103704677, 103748129, 103792328, 103837183, 103882421, 103927652, 103972492, 104016670, 104060103, 104102907,  # 2097
+    104145356, 104187808, 104230623, 104274073, 104318268, 104363123, 104408362, 104453596, 104498438, 104542617, 104586050, 104628852,  # 2098
+    104671298, 104713749, 104756562, 104800011, 104844208, 104889067, 104934311, 104979550, 105024393, 105068571, 105112002, 105154802,  # 2099
+    105197248, 105239699, 105282514, 105325963, 105370160, 105415017, 105460258, 105505493, 105550335, 105594510, 105637939, 105680739,  # 2100
+    105723186,  # 2101
+)
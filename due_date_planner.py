@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+预产期窗口取名模块
+对预产期窗口内每一天的每个时辰做八字分析，按推荐喜用神分组，
+每组只做一次名字搜索，并标注每个名字适用的日期与时辰。
+组内各时辰的五行需求（加权）不尽相同，搜索按组内平均的五行需求评分：
+只含一个时辰的组与按该时刻直接取名（--birthdate）排序相同，多个时辰的组与单个时刻的排序可能略有差异
+"""
+
+import argparse
+import datetime
+
+from bazi_calculator import BaZiCalculator
+from naming_generator import NamingGenerator, Config
+
+
+def group_window_by_xiyongshen(start, end):
+    """
+    按推荐喜用神对窗口内的 (日期, 时辰) 分组
+    每个时辰以其整点（子时取0点）代表
+    :param start: 窗口起始日期（datetime.date）
+    :param end: 窗口结束日期（datetime.date，含）
+    :return: {喜用神元组: [(日期, 时辰序号)]}，按时辰数从多到少排列；
+             喜用神与先后顺序无关（如金水、水金为同一组），元组按木火土金水排列
+    """
+    if end < start:
+        raise ValueError(f"窗口结束日期{end}早于起始日期{start}")
+
+    groups = {}
+    one_day = datetime.timedelta(days=1)
+    date = start
+    while date <= end:
+        for shichen in range(12):
+            analysis = BaZiCalculator.analyze_bazi(date.year, date.month, date.day, shichen * 2)
+            key = tuple(elem for elem in BaZiCalculator.WU_XING_ORDER if elem in analysis["推荐喜用神"])
+            groups.setdefault(key, []).append((date, shichen))
+        date += one_day
+
+    return dict(sorted(groups.items(), key=lambda item: len(item[1]), reverse=True))
+
+
+def plan_due_date_window(surname, gender, start, end, count=Config.MAX_NAME_COUNT, **generator_kwargs):
+    """
+    预产期窗口取名：每个喜用神分组只搜索一次
+    :param surname: 姓氏
+    :param gender: 性别
+    :param start: 窗口起始日期
+    :param end: 窗口结束日期（含）
+    :param count: 每组生成名字数量
+    :param generator_kwargs: 传给 NamingGenerator 的其他参数（如 lexicon、zibei）
+    :return: 分组列表，每组含喜用神、组内平均的五行需求、适用日期/时辰、覆盖比例和名字（名字上标注适用日期）
+    """
+    groups = group_window_by_xiyongshen(start, end)
+    total_slots = sum(len(slots) for slots in groups.values())
+
+    plan = []
+    for xiyongshen, slots in groups.items():
+        dates = sorted({date for date, _ in slots})
+        shichen_labels = [f"{date.isoformat()} {BaZiCalculator.DI_ZHI[shichen]}时"
+                          for date, shichen in slots]
+
+        # 组内各时辰五行需求的平均（八字分析已缓存）
+        needs = [BaZiCalculator.analyze_bazi(date.year, date.month, date.day, shichen * 2)["五行需求"]
+                 for date, shichen in slots]
+        need_vector = tuple(round(sum(column) / len(needs), 3) for column in zip(*needs))
+
+        generator = NamingGenerator(surname, gender, xiyongshen=list(xiyongshen), need_vector=need_vector,
+                                    **generator_kwargs)
+        names = generator.generate_names(count)
+        for item in names:
+            item["适用日期"] = [date.isoformat() for date in dates]
+            item["适用时辰"] = shichen_labels
+
+        plan.append({
+            "喜用神": list(xiyongshen),
+            "五行需求": need_vector,
+            "日期": dates,
+            "时辰": slots,
+            "覆盖比例": round(len(slots) / total_slots, 4),
+            "名字": names,
+        })
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="预产期窗口取名")
+    parser.add_argument("surname", help="姓氏")
+    parser.add_argument("gender", choices=["男", "女"], help="性别")
+    parser.add_argument("start", help="窗口起始日期（YYYY-MM-DD）")
+    parser.add_argument("end", help="窗口结束日期（YYYY-MM-DD）")
+    parser.add_argument("-n", "--count", type=int, default=5, help="每组生成名字数量")
+    args = parser.parse_args()
+
+    plan = plan_due_date_window(args.surname, args.gender,
+                                datetime.date.fromisoformat(args.start),
+                                datetime.date.fromisoformat(args.end),
+                                args.count)
+    for group in plan:
+        print(f"\n{'=' * 60}")
+        print(f"喜用神：{', '.join(group['喜用神']) or '未指定'}"
+              f"（覆盖 {group['覆盖比例']:.0%} 的时辰，{len(group['日期'])} 天）")
+        print("五行需求（组内平均，木火土金水）：" + " ".join(f"{need:.3f}" for need in group["五行需求"]))
+        print(f"{'=' * 60}")
+        for item in group["名字"]:
+            print(f"{item['姓名']} - {item['评分']['总分']}分")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
+import argparse
+import csv
 import json
+import os
 
 # 基础字库（从现有数据中提取并扩展）
 base_chars = {
@@ -277,20 +280,6 @@ base_chars = {
     ]
 }
 
-# 扩充逻辑：生成更多组合或从外部资源模拟
-all_characters = {}
-for wuxing, chars in base_chars.items():
-    for char_data in chars:
-        name, strokes, pinyin, gender, meaning, popularity = char_data
-        all_characters[name] = {
-            "笔画": strokes,
-            "五行": wuxing,
-            "拼音": pinyin,
-            "性别": gender,
-            "字义": meaning,
-            "常用度": popularity
-        }
-
 # 模拟生成更多字（实际应用中应从完整字库导入）
 # 这里为了演示，我们先确保核心字库质量，并添加一些常见的单字
 additional_common = [
@@ -309,23 +298,76 @@ additional_common = [
     ("晓", 16, "xiao", "火", ["男", "女"], "破晓", 5),
 ]
 
-for name, strokes, pinyin, wuxing, gender, meaning, popularity in additional_common:
-    if name not in all_characters:
-        all_characters[name] = {
-            "笔画": strokes,
-            "五行": wuxing,
-            "拼音": pinyin,
-            "性别": gender,
-            "字义": meaning,
-            "常用度": popularity
-        }
 
-# 输出到文件
-with open('/home/ubuntu/naming_system/data_characters.py', 'w', encoding='utf-8') as f:
-    f.write("# -*- coding: utf-8 -*-\n")
-    f.write("\"\"\"\n常用取名汉字字库 (V3.0 扩充版)\n包含笔画、五行、拼音、适合性别、字义等信息\n\"\"\"\n\n")
-    f.write("CHARACTERS = " + json.dumps(all_characters, ensure_ascii=False, indent=4) + "\n\n")
-    f.write("""
+# 默认输出路径：与本脚本同目录的 data_characters.py
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_characters.py")
+
+SOURCE_FIELDS = ["字", "笔画", "五行", "拼音", "性别", "字义", "常用度"]
+
+
+def iter_source_rows():
+    """
+    按来源遍历内置字表
+    :return: 生成器，产出 (来源名, 字, 笔画, 五行, 拼音, 性别列表, 字义, 常用度)
+    """
+    for wuxing, chars in base_chars.items():
+        for name, strokes, pinyin, gender, meaning, popularity in chars:
+            yield "base_chars", name, strokes, wuxing, pinyin, gender, meaning, popularity
+    for name, strokes, pinyin, wuxing, gender, meaning, popularity in additional_common:
+        yield "additional_common", name, strokes, wuxing, pinyin, gender, meaning, popularity
+
+
+def build_all_characters():
+    """
+    合并基础字库与补充常用字（重复字以先出现者为准）
+    :return: 字库字典
+    """
+    all_characters = {}
+    for _, name, strokes, wuxing, pinyin, gender, meaning, popularity in iter_source_rows():
+        if name not in all_characters:
+            all_characters[name] = {
+                "笔画": strokes,
+                "五行": wuxing,
+                "拼音": pinyin,
+                "性别": gender,
+                "字义": meaning,
+                "常用度": popularity
+            }
+    return all_characters
+
+
+def export_sources(output_dir):
+    """
+    将内置字表导出为 CSV 源文件（每个来源一个文件），供 lexicon_build.py 增量构建
+    :param output_dir: 输出目录
+    :return: 生成的文件路径列表
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+    for source, name, strokes, wuxing, pinyin, gender, meaning, popularity in iter_source_rows():
+        if source not in files:
+            path = os.path.join(output_dir, f"{source}.csv")
+            f = open(path, "w", encoding="utf-8", newline="")
+            writer = csv.writer(f)
+            writer.writerow(SOURCE_FIELDS)
+            files[source] = (path, f, writer)
+        files[source][2].writerow([name, strokes, wuxing, pinyin, "/".join(gender), meaning, popularity])
+    for _, f, _ in files.values():
+        f.close()
+    return [path for path, _, _ in files.values()]
+
+
+def write_data_module(all_characters, path=DEFAULT_OUTPUT):
+    """
+    输出 data_characters.py
+    :param all_characters: 字库字典
+    :param path: 输出路径
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# -*- coding: utf-8 -*-\n")
+        f.write("\"\"\"\n常用取名汉字字库 (V3.0 扩充版)\n包含笔画、五行、拼音、适合性别、字义等信息\n\"\"\"\n\n")
+        f.write("CHARACTERS = " + json.dumps(all_characters, ensure_ascii=False, indent=4) + "\n\n")
+        f.write("""
 def get_characters_by_stroke(stroke):
     return [char for char, info in CHARACTERS.items() if info["笔画"] == stroke]
 
@@ -340,4 +382,35 @@ def get_characters_by_stroke_and_gender(stroke, gender):
             if info["笔画"] == stroke and gender in info["性别"]]
 """)
 
-print(f"成功扩充字库，当前总字数: {len(all_characters)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="扩充取名字库")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="data_characters.py 输出路径")
+    parser.add_argument("--export-sources", metavar="DIR",
+                        help="仅导出 CSV 源文件到指定目录（供 lexicon_build.py 使用）")
+    parser.add_argument("--report", metavar="PATH", help="将字库校验报告写入 JSON 文件")
+    args = parser.parse_args()
+
+    # 合并前校验：报告来源间的笔画/五行冲突、缺失字段与非法取值（合并时以先出现者为准）
+    from lexicon_build import validate_records
+    report = validate_records(
+        (source, i, name, {"笔画": strokes, "五行": wuxing, "拼音": pinyin, "性别": gender,
+                           "字义": meaning, "常用度": popularity})
+        for i, (source, name, strokes, wuxing, pinyin, gender, meaning, popularity)
+        in enumerate(iter_source_rows(), 1)
+    )
+    for conflict in report["conflicts"]:
+        print(f"冲突：“{conflict['字']}” {conflict['fields']} {conflict['values']}")
+    for error in report["errors"]:
+        print(f"错误：“{error['字']}” {error['field']}{error['problem']}（{error['source']} 第{error['line']}条）")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.export_sources:
+        for path in export_sources(args.export_sources):
+            print(f"已导出：{path}")
+    else:
+        all_characters = build_all_characters()
+        write_data_module(all_characters, args.output)
+        print(f"成功扩充字库，当前总字数: {len(all_characters)}")
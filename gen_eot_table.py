@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+均时差表生成脚本
+用 PyEphem 计算一年中每天正午（世界时）的均时差（真太阳时 - 平太阳时，单位：秒），
+按闰年日历排列共366项，输出 data_eot.py。仅在更新表格时运行，运行时程序不依赖 ephem。
+
+用法：
+    pip install ephem
+    python gen_eot_table.py
+"""
+
+import datetime
+import math
+import os
+
+import ephem
+
+# 以闰年（含2月29日）排列，任意年份按 (月, 日) 查表
+TABLE_YEAR = 2024
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_eot.py")
+
+
+def equation_of_time(date):
+    """均时差（秒）：格林尼治真太阳时与世界时之差"""
+    observer = ephem.Observer()
+    observer.lon, observer.lat = "0", "0"
+    observer.date = date
+    sun = ephem.Sun(observer)
+    hour_angle = observer.sidereal_time() - sun.ra
+    apparent = (math.degrees(hour_angle) / 15 + 12) % 24
+    universal = (ephem.Date(date).datetime() - datetime.datetime(date.year, date.month, date.day)
+                 ).total_seconds() / 3600
+    return round(((apparent - universal + 12) % 24 - 12) * 3600)
+
+
+def main():
+    start = datetime.datetime(TABLE_YEAR, 1, 1, 12)
+    values = [equation_of_time(start + datetime.timedelta(days=i)) for i in range(366)]
+
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        f.write("# -*- coding: utf-8 -*-\n")
+        f.write('"""\n')
+        f.write("均时差表（真太阳时 - 平太阳时，单位：秒）\n")
+        f.write("按闰年日历排列（第60项为2月29日），每天正午取值\n")
+        f.write("由 gen_eot_table.py 生成，请勿手工修改\n")
+        f.write('"""\n\n')
+        f.write("EOT_SECONDS = (\n")
+        day = datetime.date(TABLE_YEAR, 1, 1)
+        month_values = []
+        for value in values:
+            month_values.append(value)
+            next_day = day + datetime.timedelta(days=1)
+            if next_day.month != day.month or next_day.year != day.year:
+                f.write("    " + ", ".join(str(v) for v in month_values) + f",  # {day.month}月\n")
+                month_values = []
+            day = next_day
+        f.write(")\n")
+    print(f"已生成 {OUTPUT}（共 {len(values)} 项）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+节气表生成脚本
+用 PyEphem 计算 1899年大雪 至 2101年小寒 的十二"节"交节时刻（北京时间，精确到分钟），
+输出 data_jieqi.py。仅在更新节气表时运行，运行时程序不依赖 ephem。
+
+用法：
+    pip install ephem
+    python gen_jieqi_table.py
+"""
+
+import math
+import os
+
+import ephem
+
+# 十二节对应的太阳视黄经（度），按 小寒 起排列，与 data_jieqi.JIE_NAMES 一致
+JIE_LONGITUDES = [285, 315, 345, 15, 45, 75, 105, 135, 165, 195, 225, 255]
+JIE_NAMES = ["小寒", "立春", "惊蛰", "清明", "立夏", "芒种", "小暑", "立秋", "白露", "寒露", "立冬", "大雪"]
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+BEIJING_OFFSET = 8 * ephem.hour
+EPOCH = ephem.Date("1900/1/1 00:00:00")   # 北京时间 1900-01-01 00:00 对应的"本地"零点
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_jieqi.py")
+
+
+def solar_longitude(date):
+    """太阳视黄经（度，当天历元）"""
+    sun = ephem.Sun(date)
+    ecliptic = ephem.Ecliptic(ephem.Equatorial(sun.ra, sun.dec, epoch=date), epoch=date)
+    return math.degrees(ecliptic.lon)
+
+
+def find_term(longitude, guess):
+    """牛顿迭代求太阳视黄经到达 longitude 的时刻（UT）"""
+    date = ephem.Date(guess)
+    for _ in range(50):
+        diff = (longitude - solar_longitude(date) + 180) % 360 - 180
+        date = ephem.Date(date + diff / 0.9856)
+        if abs(diff) < 1e-7:
+            break
+    return date
+
+
+def term_minutes(year, k):
+    """第 k 个节（0=小寒）在 year 年的交节时刻，返回自 1900-01-01 00:00（北京时间）起的分钟数"""
+    month = k + 1
+    date = find_term(JIE_LONGITUDES[k], ephem.Date(f"{year}/{month}/6"))
+    local = date + BEIJING_OFFSET
+    return int(round((local - EPOCH) * 24 * 60))
+
+
+def main():
+    rows = [[term_minutes(FIRST_YEAR - 1, 11)]]
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        rows.append([term_minutes(year, k) for k in range(12)])
+    rows.append([term_minutes(LAST_YEAR + 1, 0)])
+
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        f.write("# -*- coding: utf-8 -*-\n")
+        f.write('"""\n')
+        f.write("十二节交节时刻表（1899年大雪 至 2101年小寒）\n")
+        f.write("每项为自 1900-01-01 00:00（北京时间）起的分钟数，按时间升序排列\n")
+        f.write("由 gen_jieqi_table.py 生成，请勿手工修改\n")
+        f.write('"""\n\n')
+        f.write(f"JIE_NAMES = {JIE_NAMES!r}\n\n")
+        f.write("# 第一项（1899年大雪）在 JIE_NAMES 中的序号\n")
+        f.write("JIE_FIRST_INDEX = 11\n\n")
+        f.write("JIE_MINUTES = (\n")
+        f.write(f"    {rows[0][0]},  # {FIRST_YEAR - 1}\n")
+        for year, row in zip(range(FIRST_YEAR, LAST_YEAR + 1), rows[1:-1]):
+            f.write("    " + ", ".join(str(m) for m in row) + f",  # {year}\n")
+        f.write(f"    {rows[-1][0]},  # {LAST_YEAR + 1}\n")
+        f.write(")\n")
+    print(f"已生成 {OUTPUT}（共 {sum(len(r) for r in rows)} 项）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+农历表生成脚本
+用 PyEphem 按现行农历规则（东经120度日界、冬至所在月为十一月、无中气月置闰）
+计算 1900-2100 年农历，并按经典编码压缩为每年一个整数，输出 data_lunar.py。
+仅在更新农历表时运行，运行时程序不依赖 ephem。
+
+编码（每年17位）：
+    bit 0-3   闰月月份（0为无闰月）
+    bit 4-15  正月至十二月大小（bit 15 为正月，1为大月30天，0为小月29天）
+    bit 16    闰月大小（1为30天）
+
+用法：
+    pip install ephem
+    python gen_lunar_table.py
+"""
+
+import bisect
+import datetime
+import math
+import os
+
+import ephem
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+BEIJING_OFFSET = 8 * ephem.hour
+
+# 与历史上实际颁行的历书（及通行历表）不同于现行规则推算结果的月份：(农历年, 月, 是否闰月) -> 初一公历日期
+# 1929年以前历书按北京地方时（东经116.4度）定日界；1933、1954、1978年朔时刻贴近子夜，沿用当年历书
+HISTORICAL_MONTH_STARTS = {
+    (1914, 10, False): datetime.date(1914, 11, 17),
+    (1916, 1, False): datetime.date(1916, 2, 3),
+    (1920, 10, False): datetime.date(1920, 11, 10),
+    (1933, 6, False): datetime.date(1933, 7, 22),
+    (1954, 11, False): datetime.date(1954, 11, 26),
+    (1978, 8, False): datetime.date(1978, 9, 2),
+}
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_lunar.py")
+
+
+def local_date(date):
+    """ephem 世界时 -> 北京时间日期"""
+    return ephem.Date(date + BEIJING_OFFSET).datetime().date()
+
+
+def solar_longitude(date):
+    sun = ephem.Sun(date)
+    ecliptic = ephem.Ecliptic(ephem.Equatorial(sun.ra, sun.dec, epoch=date), epoch=date)
+    return math.degrees(ecliptic.lon)
+
+
+def find_term(longitude, guess):
+    date = ephem.Date(guess)
+    for _ in range(50):
+        diff = (longitude - solar_longitude(date) + 180) % 360 - 180
+        date = ephem.Date(date + diff / 0.9856)
+        if abs(diff) < 1e-7:
+            break
+    return date
+
+
+def new_moon_dates(first, last):
+    """first 之前最近一次朔 至 last 之后的所有朔日（北京时间日期）"""
+    dates = []
+    moon = ephem.previous_new_moon(ephem.Date(first))
+    while True:
+        date = local_date(moon)
+        dates.append(date)
+        if date > last:
+            return dates
+        moon = ephem.next_new_moon(ephem.Date(moon + 1))
+
+
+def principal_term_dates(first_year, last_year):
+    """各年中气（冬至起每30度）的北京时间日期"""
+    dates = []
+    for year in range(first_year, last_year + 1):
+        for k in range(12):
+            guess = datetime.datetime(year - 1, 12, 22) + datetime.timedelta(days=30.44 * k)
+            dates.append(local_date(find_term((270 + 30 * k) % 360, ephem.Date(guess))))
+    return sorted(set(dates))
+
+
+def compute_months():
+    """
+    推算农历月
+    :return: [(初一公历日期, 月份, 是否闰月)]，按时间排列
+    """
+    terms = principal_term_dates(FIRST_YEAR - 1, LAST_YEAR + 2)
+    starts = new_moon_dates(datetime.datetime(FIRST_YEAR - 2, 11, 1), datetime.date(LAST_YEAR + 1, 12, 31))
+    solstices = {year: local_date(find_term(270, ephem.Date(f"{year}/12/21")))
+                 for year in range(FIRST_YEAR - 2, LAST_YEAR + 2)}
+
+    months = {}
+    for year in range(FIRST_YEAR - 2, LAST_YEAR + 1):
+        # 两个冬至之间：含冬至的月为十一月；若有13个月，第一个无中气的月为闰月
+        first = bisect.bisect_right(starts, solstices[year]) - 1
+        last = bisect.bisect_right(starts, solstices[year + 1]) - 1
+        leap_pending = (last - first) == 13
+        number = 11
+        months[starts[first]] = (11, False)
+        for i in range(first + 1, last):
+            start, end = starts[i], starts[i + 1]
+            j = bisect.bisect_left(terms, start)
+            has_term = j < len(terms) and terms[j] < end
+            if leap_pending and not has_term:
+                leap_pending = False
+                months[start] = (number, True)
+            else:
+                number = number % 12 + 1
+                months[start] = (number, False)
+
+    result = sorted((start, number, leap) for start, (number, leap) in months.items())
+    # 按历史历书修正个别月份的初一
+    # （表中各月初一均与所在农历年同属一个公历年）
+    for i, (start, number, leap) in enumerate(result):
+        h_start = HISTORICAL_MONTH_STARTS.get((start.year, number, leap))
+        if h_start is not None and abs((start - h_start).days) <= 1:
+            result[i] = (h_start, number, leap)
+    return result
+
+
+def encode_years(months):
+    """
+    按农历年（正月初一起）编码
+    :return: ({年: 编码}, {年: 正月初一公历日期})
+    """
+    infos, new_years = {}, {}
+    year = None
+    for i, (start, number, leap) in enumerate(months[:-1]):
+        length = (months[i + 1][0] - start).days
+        if number == 1 and not leap:
+            year = start.year
+            infos[year] = 0
+            new_years[year] = start
+        if year is None:
+            continue
+        big = 1 if length == 30 else 0
+        if leap:
+            infos[year] |= number | (big << 16)
+        elif big:
+            infos[year] |= 1 << (16 - number)
+    return infos, new_years
+
+
+def main():
+    infos, new_years = encode_years(compute_months())
+
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        f.write("# -*- coding: utf-8 -*-\n")
+        f.write('"""\n')
+        f.write(f"农历表（{FIRST_YEAR}-{LAST_YEAR}年），每年一项，经典编码：\n")
+        f.write("    bit 0-3 闰月月份（0为无闰月）；bit 4-15 正月至十二月大小（bit 15 为正月，1为30天）；\n")
+        f.write("    bit 16 闰月大小（1为30天）\n")
+        f.write("由 gen_lunar_table.py 生成，请勿手工修改\n")
+        f.write('"""\n\n')
+        f.write(f"LUNAR_FIRST_YEAR = {FIRST_YEAR}\n\n")
+        first = new_years[FIRST_YEAR]
+        f.write(f"# {FIRST_YEAR}年正月初一的公历日期\n")
+        f.write(f"LUNAR_FIRST_NEW_YEAR = ({first.year}, {first.month}, {first.day})\n\n")
+        f.write("LUNAR_INFO = (\n")
+        years = list(range(FIRST_YEAR, LAST_YEAR + 1))
+        for i in range(0, len(years), 10):
+            row = years[i:i + 10]
+            f.write("    " + ", ".join(f"0x{infos[y]:05x}" for y in row) + f",  # {row[0]}-{row[-1]}\n")
+        f.write(")\n")
+    print(f"已生成 {OUTPUT}（共 {len(infos)} 年）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+字库索引模块
+为共享字库建立性别、五行、笔画、常用度位图索引，
+并提供按请求的写时复制覆盖层（新增/覆盖字、禁用字），覆盖层复用基础字库索引而不重建
+"""
+
+import hashlib
+import json
+import os
+
+from data_characters import CHARACTERS
+
+# 编译字库路径（由 lexicon_build.py 生成），设置后默认字库从该文件加载
+LEXICON_ENV = "NAMING_LEXICON"
+
+
+class Lexicon:
+    """只读字库（带位图索引）"""
+
+    def __init__(self, characters=None, version=None):
+        """
+        初始化
+        :param characters: 字库字典（默认使用 data_characters.CHARACTERS）
+        :param version: 字库版本号（可选，默认按内容哈希计算）
+        """
+        self.characters = CHARACTERS if characters is None else characters
+        self.chars = list(self.characters)                       # 序号 -> 字
+        self.ordinal = {char: i for i, char in enumerate(self.chars)}
+        self._index = None                                        # 延迟构建
+        self._version = version
+
+    @classmethod
+    def load(cls, path):
+        """
+        加载编译字库（lexicon_build.py 输出的 lexicon.json 或其所在目录）
+        :param path: 文件或目录路径
+        :return: Lexicon
+        """
+        if os.path.isdir(path):
+            path = os.path.join(path, "lexicon.json")
+        with open(path, encoding="utf-8") as f:
+            artifact = json.load(f)
+        lexicon = cls(artifact["characters"], version=artifact.get("lexicon_version"))
+        if artifact.get("indexes"):
+            lexicon._index_from_lists(artifact["indexes"])
+        return lexicon
+
+    @property
+    def version(self):
+        """字库版本号（用作缓存键的一部分）"""
+        if self._version is None:
+            payload = json.dumps(self.characters, ensure_ascii=False, sort_keys=True)
+            self._version = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return self._version
+
+    def __len__(self):
+        return len(self.chars)
+
+    def __contains__(self, char):
+        return char in self.characters
+
+    def __iter__(self):
+        return iter(self.chars)
+
+    def get(self, char):
+        """获取单字信息，不存在返回 None"""
+        return self.characters.get(char)
+
+    def _build_index(self):
+        """一次遍历构建全部位图索引（以 int 作为位图）"""
+        index = {"性别": {}, "五行": {}, "笔画": {}, "常用度": {}}
+        for i, char in enumerate(self.chars):
+            info = self.characters[char]
+            bit = 1 << i
+            for gender in info["性别"]:
+                index["性别"][gender] = index["性别"].get(gender, 0) | bit
+            for field in ("五行", "笔画", "常用度"):
+                value = info[field]
+                index[field][value] = index[field].get(value, 0) | bit
+        self._index = index
+        return index
+
+    def _index_from_lists(self, indexes):
+        """由编译字库中的字列表索引直接生成位图（笔画、五行、性别），常用度索引单独补齐"""
+        index = {"性别": {}, "五行": {}, "笔画": {}, "常用度": {}}
+        for field, buckets in indexes.items():
+            for key, chars in buckets.items():
+                bits = 0
+                for char in chars:
+                    bits |= 1 << self.ordinal[char]
+                index[field][int(key) if field == "笔画" else key] = bits
+        for i, char in enumerate(self.chars):
+            usage = self.characters[char]["常用度"]
+            index["常用度"][usage] = index["常用度"].get(usage, 0) | (1 << i)
+        self._index = index
+        return index
+
+    def bitset(self, field, value):
+        """
+        获取单个索引位图
+        :param field: 索引字段（"性别"/"五行"/"笔画"/"常用度"）
+        :param value: 字段取值
+        :return: 位图（int）
+        """
+        index = self._index or self._build_index()
+        return index[field].get(value, 0)
+
+    def mask(self, gender=None, min_usage=0, wuxing=None, stroke=None):
+        """
+        按条件组合位图
+        :param gender: 性别
+        :param min_usage: 最小常用度
+        :param wuxing: 五行（单个或列表）
+        :param stroke: 笔画数
+        :return: 位图（int）
+        """
+        index = self._index or self._build_index()
+        result = (1 << len(self.chars)) - 1
+        if gender is not None:
+            result &= index["性别"].get(gender, 0)
+        if min_usage:
+            usage_mask = 0
+            for usage, bits in index["常用度"].items():
+                if usage >= min_usage:
+                    usage_mask |= bits
+            result &= usage_mask
+        if wuxing is not None:
+            elements = [wuxing] if isinstance(wuxing, str) else wuxing
+            wuxing_mask = 0
+            for element in elements:
+                wuxing_mask |= index["五行"].get(element, 0)
+            result &= wuxing_mask
+        if stroke is not None:
+            result &= index["笔画"].get(stroke, 0)
+        return result
+
+    def chars_in(self, mask):
+        """将位图展开为 (字, 信息) 列表（按序号排列）"""
+        result = []
+        while mask:
+            low = mask & -mask
+            char = self.chars[low.bit_length() - 1]
+            result.append((char, self.characters[char]))
+            mask ^= low
+        return result
+
+    def select(self, gender=None, min_usage=0, wuxing=None, stroke=None):
+        """
+        按条件筛选字
+        :return: (字, 信息) 列表
+        """
+        return self.chars_in(self.mask(gender, min_usage, wuxing, stroke))
+
+    def count(self, gender=None, min_usage=0, wuxing=None, stroke=None):
+        """按条件统计字数（只数位图，不展开字列表）"""
+        return self.mask(gender, min_usage, wuxing, stroke).bit_count()
+
+
+class LexiconOverlay:
+    """
+    字库覆盖层（写时复制）
+    不修改、不复制基础字库：被覆盖或禁用的基础字通过一个屏蔽位图排除，
+    新增/覆盖的字单独建立一个小字库索引，查询时两者组合
+    """
+
+    def __init__(self, base=None, add=None, banned=None):
+        """
+        初始化
+        :param base: 基础字库（Lexicon 或 LexiconOverlay，默认共享字库）
+        :param add: 新增或覆盖的字 {字: 信息}
+        :param banned: 禁用字（如长辈名讳），不参与候选，但仍可查询笔画等信息
+        """
+        self.base = base if base is not None else get_default_lexicon()
+        self.added = dict(add) if add else {}
+        self.banned = frozenset(banned or ())
+        self._extra = Lexicon(self.added)
+        self._version = None
+
+        hidden = 0
+        for char in self.banned | set(self.added):
+            i = self._base_ordinal(char)
+            if i is not None:
+                hidden |= 1 << i
+        self._hidden = hidden
+        self._banned_extra = 0
+        for char in self.banned:
+            if char in self._extra.ordinal:
+                self._banned_extra |= 1 << self._extra.ordinal[char]
+
+    @property
+    def version(self):
+        """覆盖层版本号（基础字库版本 + 覆盖内容）"""
+        if self._version is None:
+            payload = json.dumps([self.base.version, self.added, sorted(self.banned)],
+                                 ensure_ascii=False, sort_keys=True)
+            self._version = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return self._version
+
+    def _base_ordinal(self, char):
+        return self.base.ordinal.get(char) if isinstance(self.base, Lexicon) else None
+
+    def __contains__(self, char):
+        return self.get(char) is not None
+
+    def get(self, char):
+        """获取单字信息（覆盖层优先）"""
+        info = self.added.get(char)
+        return info if info is not None else self.base.get(char)
+
+    def select(self, gender=None, min_usage=0, wuxing=None, stroke=None):
+        """
+        按条件筛选字（基础字库结果屏蔽覆盖/禁用字后，追加覆盖层中的字）
+        :return: (字, 信息) 列表
+        """
+        if isinstance(self.base, Lexicon):
+            base_mask = self.base.mask(gender, min_usage, wuxing, stroke) & ~self._hidden
+            result = self.base.chars_in(base_mask)
+        else:
+            hidden = self.banned | set(self.added)
+            result = [(char, info) for char, info in
+                      self.base.select(gender, min_usage, wuxing, stroke)
+                      if char not in hidden]
+        extra_mask = self._extra.mask(gender, min_usage, wuxing, stroke) & ~self._banned_extra
+        result.extend(self._extra.chars_in(extra_mask))
+        return result
+
+    def count(self, gender=None, min_usage=0, wuxing=None, stroke=None):
+        """按条件统计字数"""
+        extra = (self._extra.mask(gender, min_usage, wuxing, stroke) & ~self._banned_extra).bit_count()
+        if isinstance(self.base, Lexicon):
+            return (self.base.mask(gender, min_usage, wuxing, stroke) & ~self._hidden).bit_count() + extra
+        return len(self.select(gender, min_usage, wuxing, stroke))
+
+
+_DEFAULT_LEXICON = None
+
+
+def get_default_lexicon():
+    """获取共享的默认字库（进程内单例，设置 NAMING_LEXICON 时加载编译字库）"""
+    global _DEFAULT_LEXICON
+    if _DEFAULT_LEXICON is None:
+        path = os.environ.get(LEXICON_ENV)
+        _DEFAULT_LEXICON = Lexicon.load(path) if path else Lexicon()
+    return _DEFAULT_LEXICON
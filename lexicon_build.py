@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+字库增量构建模块
+从 CSV/JSON 源文件构建编译字库（lexicon.json）及其索引，
+按源文件内容哈希缓存解析结果，只重建发生变化的部分，并输出带字库版本号的清单（manifest.json）
+构建时单次遍历校验字库（缺失字段、非法取值、来源间笔画/五行冲突），输出 validation_report.json
+
+用法：
+    python expand_characters.py --export-sources sources/
+    python lexicon_build.py sources/base_chars.csv sources/additional_common.csv -o build/lexicon
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+
+INDEX_FIELDS = ("笔画", "五行", "性别")
+REQUIRED_FIELDS = ("笔画", "五行", "拼音", "性别", "字义", "常用度")
+CONFLICT_FIELDS = ("笔画", "五行")
+VALID_WUXING = ("木", "火", "土", "金", "水")
+VALID_GENDERS = ("男", "女")
+GENDER_SEPARATORS = ("/", "|", "、", ",", " ")
+
+ARTIFACT_NAME = "lexicon.json"
+MANIFEST_NAME = "manifest.json"
+REPORT_NAME = "validation_report.json"
+FRAGMENT_DIR = "fragments"
+
+
+def hash_file(path):
+    """计算源文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _split_gender(value):
+    if isinstance(value, list):
+        return value
+    value = (value or "").strip()
+    for sep in GENDER_SEPARATORS:
+        if sep in value:
+            return [g.strip() for g in value.split(sep) if g.strip()]
+    return [value] if value else []
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def normalize_record(raw):
+    """
+    将源记录规范化为 (字, 信息)
+    :param raw: 源记录字典（需含"字"字段）
+    :return: (字, 信息字典)
+    """
+    info = {
+        "笔画": _to_int(raw.get("笔画")),
+        "五行": raw.get("五行"),
+        "拼音": raw.get("拼音"),
+        "性别": _split_gender(raw.get("性别")),
+        "字义": raw.get("字义"),
+        "常用度": _to_int(raw.get("常用度")),
+    }
+    return (raw.get("字") or "").strip(), info
+
+
+def load_source(path):
+    """
+    读取源文件
+    支持 CSV（表头：字,笔画,五行,拼音,性别,字义,常用度）和
+    JSON（{字: 信息} 字典，或含"字"字段的记录列表）
+    :param path: 源文件路径
+    :return: [(字, 信息)] 列表（保持源文件顺序）
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [dict(info, 字=char) for char, info in data.items()]
+        return [normalize_record(raw) for raw in data]
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [normalize_record(row) for row in csv.DictReader(f)]
+
+
+def check_record(char, info):
+    """
+    校验单条记录
+    :return: [(字段, 问题描述)] 列表，无问题返回空列表
+    """
+    problems = []
+    if not char:
+        problems.append(("字", "缺失"))
+    elif len(char) != 1:
+        problems.append(("字", "应为单个汉字"))
+    for field in REQUIRED_FIELDS:
+        if info.get(field) in (None, "", []):
+            problems.append((field, "缺失"))
+    stroke = info.get("笔画")
+    if stroke not in (None, "") and not (isinstance(stroke, int) and stroke > 0):
+        problems.append(("笔画", "应为正整数"))
+    wuxing = info.get("五行")
+    if wuxing and wuxing not in VALID_WUXING:
+        problems.append(("五行", "非法五行"))
+    invalid_genders = [g for g in info.get("性别") or [] if g not in VALID_GENDERS]
+    if invalid_genders:
+        problems.append(("性别", "非法性别标签"))
+    usage = info.get("常用度")
+    if usage not in (None, "") and not (isinstance(usage, int) and 1 <= usage <= 5):
+        problems.append(("常用度", "应为1-5的整数"))
+    return problems
+
+
+def _fingerprint(info, fields):
+    """记录指定字段的哈希指纹（用于冲突检测）"""
+    payload = json.dumps([info.get(field) for field in fields], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest()
+
+
+class LexiconValidator:
+    """
+    字库校验器（单次遍历）
+    逐条 add 记录：行级校验 + 以指纹哈希检测同字的笔画/五行冲突与重复
+    """
+
+    def __init__(self, check_rows=True):
+        """
+        初始化
+        :param check_rows: 是否做行级字段校验（合并阶段只需冲突检测时设为 False）
+        """
+        self.check_rows = check_rows
+        self.record_count = 0
+        self.errors = []
+        self.conflicts = []
+        self.duplicates = []
+        self._seen = {}     # 字 -> (冲突指纹, 完整指纹, 来源, 行号, 信息)
+
+    def add(self, source, line, char, info):
+        """
+        校验一条记录
+        :param source: 来源（文件路径）
+        :param line: 行号（或记录序号）
+        :param char: 字
+        :param info: 信息字典
+        """
+        self.record_count += 1
+        if self.check_rows:
+            for field, problem in check_record(char, info):
+                self.errors.append({"source": source, "line": line, "字": char,
+                                    "field": field, "problem": problem, "value": info.get(field)})
+        if not char:
+            return
+
+        key = _fingerprint(info, CONFLICT_FIELDS)
+        full = _fingerprint(info, REQUIRED_FIELDS)
+        seen = self._seen.get(char)
+        if seen is None:
+            self._seen[char] = (key, full, source, line, info)
+            return
+
+        first_key, first_full, first_source, first_line, first_info = seen
+        location = [{"source": first_source, "line": first_line},
+                    {"source": source, "line": line}]
+        if key != first_key:
+            fields = [field for field in CONFLICT_FIELDS if info.get(field) != first_info.get(field)]
+            self.conflicts.append({
+                "字": char, "fields": fields, "locations": location,
+                "values": [{field: first_info.get(field) for field in fields},
+                           {field: info.get(field) for field in fields}],
+            })
+        else:
+            fields = [] if full == first_full else [
+                field for field in REQUIRED_FIELDS if info.get(field) != first_info.get(field)]
+            self.duplicates.append({"字": char, "differing_fields": fields, "locations": location})
+
+    def report(self):
+        """
+        生成机器可读的校验报告
+        :return: 报告字典
+        """
+        return {
+            "ok": not self.errors and not self.conflicts,
+            "record_count": self.record_count,
+            "error_count": len(self.errors),
+            "conflict_count": len(self.conflicts),
+            "duplicate_count": len(self.duplicates),
+            "errors": self.errors,
+            "conflicts": self.conflicts,
+            "duplicates": self.duplicates,
+        }
+
+
+def validate_records(records):
+    """
+    单次遍历校验记录
+    :param records: 可迭代的 (来源, 行号, 字, 信息)
+    :return: 校验报告字典
+    """
+    validator = LexiconValidator()
+    for source, line, char, info in records:
+        validator.add(source, line, char, info)
+    return validator.report()
+
+
+def build_fragment(path, sha256):
+    """
+    编译单个源文件为片段（字表 + 片段内索引 + 片段内校验报告），校验不通过的记录不进入字表
+    :param path: 源文件路径
+    :param sha256: 源文件内容哈希
+    :return: 片段字典
+    """
+    characters = {}
+    lines = {}
+    validator = LexiconValidator()
+    # CSV 第1行为表头，数据从第2行开始；JSON 按记录序号（从1开始）
+    first_line = 1 if path.lower().endswith(".json") else 2
+    for line, (char, info) in enumerate(load_source(path), first_line):
+        error_count = len(validator.errors)
+        validator.add(path, line, char, info)
+        if len(validator.errors) > error_count:
+            continue
+        if char not in characters:
+            characters[char] = info
+            lines[char] = line
+
+    indexes = {field: {} for field in INDEX_FIELDS}
+    for char, info in characters.items():
+        indexes["笔画"].setdefault(str(info["笔画"]), []).append(char)
+        indexes["五行"].setdefault(info["五行"], []).append(char)
+        for gender in info["性别"]:
+            indexes["性别"].setdefault(gender, []).append(char)
+
+    return {"path": path, "sha256": sha256, "characters": characters, "lines": lines,
+            "indexes": indexes, "report": validator.report()}
+
+
+def merge_fragments(fragments):
+    """
+    按源文件顺序合并片段（重复字以先出现者为准），索引按片段合并而不重新扫描字表；
+    合并时顺带检测来源间冲突
+    :param fragments: 片段列表
+    :return: (字库字典, 索引字典, 校验报告)
+    """
+    characters = {}
+    owner = {}
+    validator = LexiconValidator(check_rows=False)
+    for i, fragment in enumerate(fragments):
+        lines = fragment.get("lines", {})
+        for char, info in fragment["characters"].items():
+            validator.add(fragment["path"], lines.get(char), char, info)
+            if char not in characters:
+                characters[char] = info
+                owner[char] = i
+
+    indexes = {field: {} for field in INDEX_FIELDS}
+    for i, fragment in enumerate(fragments):
+        for field, buckets in fragment["indexes"].items():
+            merged = indexes[field]
+            for key, chars in buckets.items():
+                kept = [char for char in chars if owner[char] == i]
+                if kept:
+                    merged.setdefault(key, []).extend(kept)
+
+    # 汇总各片段的行级报告与来源间冲突
+    report = validator.report()
+    report["record_count"] = 0
+    for fragment in fragments:
+        partial = fragment["report"]
+        report["record_count"] += partial["record_count"]
+        for field in ("errors", "conflicts", "duplicates"):
+            report[field] = partial[field] + report[field]
+    for field in ("errors", "conflicts", "duplicates"):
+        report[field[:-1] + "_count"] = len(report[field])
+    report["ok"] = not report["errors"] and not report["conflicts"]
+    return characters, indexes, report
+
+
+def lexicon_version(source_hashes):
+    """根据各源文件哈希（按顺序）计算字库版本号"""
+    digest = hashlib.sha256()
+    for sha256 in source_hashes:
+        digest.update(sha256.encode("ascii"))
+    return digest.hexdigest()[:16]
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data, indent=None):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def build_lexicon(sources, output_dir, force=False):
+    """
+    增量构建编译字库
+    :param sources: 源文件路径列表（顺序即优先级）
+    :param output_dir: 输出目录
+    :param force: 是否忽略缓存强制重建
+    :return: 清单字典（含 lexicon_version、各源文件哈希、是否重建等）
+    """
+    start = time.perf_counter()
+    fragment_dir = os.path.join(output_dir, FRAGMENT_DIR)
+    os.makedirs(fragment_dir, exist_ok=True)
+
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    artifact_path = os.path.join(output_dir, ARTIFACT_NAME)
+    previous = _read_json(manifest_path) or {}
+
+    hashes = [hash_file(path) for path in sources]
+    version = lexicon_version(hashes)
+
+    if (not force and previous.get("lexicon_version") == version
+            and os.path.exists(artifact_path)):
+        previous["rebuilt"] = []
+        previous["build_seconds"] = round(time.perf_counter() - start, 4)
+        return previous
+
+    fragments = []
+    rebuilt = []
+    for path, sha256 in zip(sources, hashes):
+        fragment_path = os.path.join(fragment_dir, sha256 + ".json")
+        fragment = None if force else _read_json(fragment_path)
+        if fragment is None or "report" not in fragment:
+            fragment = build_fragment(path, sha256)
+            _write_json(fragment_path, fragment)
+            rebuilt.append(path)
+        fragment["path"] = path
+        fragments.append(fragment)
+
+    characters, indexes, report = merge_fragments(fragments)
+    report["lexicon_version"] = version
+    _write_json(os.path.join(output_dir, REPORT_NAME), report, indent=2)
+    _write_json(artifact_path, {
+        "lexicon_version": version,
+        "characters": characters,
+        "indexes": indexes,
+    })
+
+    manifest = {
+        "lexicon_version": version,
+        "artifact": ARTIFACT_NAME,
+        "count": len(characters),
+        "sources": [
+            {"path": path, "sha256": sha256, "count": len(fragment["characters"])}
+            for path, sha256, fragment in zip(sources, hashes, fragments)
+        ],
+        "rebuilt": rebuilt,
+        "validation": {
+            "ok": report["ok"],
+            "report": REPORT_NAME,
+            "error_count": report["error_count"],
+            "conflict_count": report["conflict_count"],
+            "duplicate_count": report["duplicate_count"],
+        },
+        "build_seconds": round(time.perf_counter() - start, 4),
+    }
+    _write_json(manifest_path, manifest, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="增量构建编译字库")
+    parser.add_argument("sources", nargs="+", help="CSV/JSON 源文件（顺序即优先级）")
+    parser.add_argument("-o", "--output", default=os.path.join("build", "lexicon"), help="输出目录")
+    parser.add_argument("--force", action="store_true", help="忽略缓存强制重建")
+    parser.add_argument("--strict", action="store_true", help="校验存在错误或冲突时以非零状态退出")
+    args = parser.parse_args()
+
+    manifest = build_lexicon(args.sources, args.output, force=args.force)
+    validation = manifest["validation"]
+    print(f"字库版本：{manifest['lexicon_version']}（共 {manifest['count']} 字）")
+    print(f"重建源文件：{', '.join(manifest['rebuilt']) if manifest['rebuilt'] else '无（使用缓存）'}")
+    print(f"校验：错误 {validation['error_count']}，冲突 {validation['conflict_count']}，"
+          f"重复 {validation['duplicate_count']}（详见 {os.path.join(args.output, REPORT_NAME)}）")
+    print(f"耗时：{manifest['build_seconds']} 秒")
+    if args.strict and not validation["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+农历公历互转模块
+基于 data_lunar.py 的压缩农历表（1900-2100年），离线查表换算。
+导入时预先累计各年正月初一的序数，按年定位为 O(1)，年内最多遍历13个月
+"""
+
+import datetime
+import re
+
+from data_lunar import LUNAR_FIRST_YEAR, LUNAR_FIRST_NEW_YEAR, LUNAR_INFO
+
+LUNAR_LAST_YEAR = LUNAR_FIRST_YEAR + len(LUNAR_INFO) - 1
+
+MONTH_NAMES = ["正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "冬", "腊"]
+
+# 农历日期文本：农历2024-01-15、农历2023-闰02-15、农历2023年闰2月15日
+LUNAR_DATE_PATTERN = re.compile(
+    r"^\s*(?:农历|阴历|L)\s*(\d{4})\s*[-/年]\s*(闰)?\s*(\d{1,2})\s*[-/月]\s*(\d{1,2})\s*日?\s*$")
+
+
+def leap_month(year):
+    """闰月月份，无闰月返回 0"""
+    return LUNAR_INFO[year - LUNAR_FIRST_YEAR] & 0xf
+
+
+def month_days(year, month, is_leap=False):
+    """农历某月天数（29或30）"""
+    info = LUNAR_INFO[year - LUNAR_FIRST_YEAR]
+    if is_leap:
+        return 30 if info & 0x10000 else 29
+    return 30 if info & (0x10000 >> month) else 29
+
+
+def year_months(year):
+    """
+    农历年内各月
+    :return: [(月份, 是否闰月, 天数)]，按时间排列
+    """
+    leap = leap_month(year)
+    months = []
+    for month in range(1, 13):
+        months.append((month, False, month_days(year, month)))
+        if month == leap:
+            months.append((month, True, month_days(year, month, True)))
+    return months
+
+
+def _new_year_ordinals():
+    """各年正月初一（及表末一年结束后一天）的公历序数"""
+    ordinal = datetime.date(*LUNAR_FIRST_NEW_YEAR).toordinal()
+    ordinals = [ordinal]
+    for year in range(LUNAR_FIRST_YEAR, LUNAR_LAST_YEAR + 1):
+        ordinal += sum(days for _, _, days in year_months(year))
+        ordinals.append(ordinal)
+    return ordinals
+
+
+NEW_YEAR_ORDINALS = _new_year_ordinals()
+
+
+def _check_year(year):
+    if not LUNAR_FIRST_YEAR <= year <= LUNAR_LAST_YEAR:
+        raise ValueError(f"农历年份{year}超出农历表范围（{LUNAR_FIRST_YEAR}-{LUNAR_LAST_YEAR}）")
+
+
+def lunar_to_solar(year, month, day, is_leap=False):
+    """
+    农历转公历
+    :param year: 农历年
+    :param month: 农历月（1-12）
+    :param day: 农历日（1-30）
+    :param is_leap: 是否闰月
+    :return: datetime.date
+    """
+    _check_year(year)
+    if is_leap and leap_month(year) != month:
+        raise ValueError(f"农历{year}年没有闰{month}月")
+    if not 1 <= month <= 12:
+        raise ValueError(f"农历月份无效: {month}")
+    if not 1 <= day <= month_days(year, month, is_leap):
+        raise ValueError(f"农历{year}年{'闰' if is_leap else ''}{month}月没有{day}日")
+
+    ordinal = NEW_YEAR_ORDINALS[year - LUNAR_FIRST_YEAR]
+    for m, leap, days in year_months(year):
+        if (m, leap) == (month, is_leap):
+            break
+        ordinal += days
+    return datetime.date.fromordinal(ordinal + day - 1)
+
+
+def solar_to_lunar(date):
+    """
+    公历转农历
+    :param date: datetime.date（或 datetime.datetime，按其日期）
+    :return: (农历年, 月, 日, 是否闰月)
+    """
+    ordinal = date.toordinal()
+    # 正月初一总在公历1月21日至2月20日之间，所属农历年只可能是当年或上一年
+    year = date.year
+    if year - LUNAR_FIRST_YEAR < len(NEW_YEAR_ORDINALS) and ordinal < NEW_YEAR_ORDINALS[year - LUNAR_FIRST_YEAR]:
+        year -= 1
+    if not LUNAR_FIRST_YEAR <= year <= LUNAR_LAST_YEAR or ordinal >= NEW_YEAR_ORDINALS[-1]:
+        raise ValueError(f"日期{date}超出农历表范围")
+
+    offset = ordinal - NEW_YEAR_ORDINALS[year - LUNAR_FIRST_YEAR]
+    for month, is_leap, days in year_months(year):
+        if offset < days:
+            return year, month, offset + 1, is_leap
+        offset -= days
+    raise ValueError(f"日期{date}超出农历表范围")
+
+
+def format_lunar(year, month, day, is_leap=False):
+    """格式化为 农历2023年闰二月十五 形式"""
+    if day <= 10:
+        day_text = "初" + "一二三四五六七八九十"[day - 1]
+    elif day < 20:
+        day_text = "十" + "一二三四五六七八九"[day - 11]
+    elif day == 20:
+        day_text = "二十"
+    elif day < 30:
+        day_text = "廿" + "一二三四五六七八九"[day - 21]
+    else:
+        day_text = "三十"
+    return f"农历{year}年{'闰' if is_leap else ''}{MONTH_NAMES[month - 1]}月{day_text}"
+
+
+def parse_lunar_date(text):
+    """
+    解析农历日期文本
+    :param text: 如 "农历2024-01-15"、"农历2023-闰02-15"、"农历2023年闰2月15日"
+    :return: (农历年, 月, 日, 是否闰月)；不是农历写法返回 None
+    """
+    match = LUNAR_DATE_PATTERN.match(str(text))
+    if not match:
+        return None
+    year, leap, month, day = match.groups()
+    return int(year), int(month), int(day), leap is not None
+
+
+def split_date_time(text):
+    """
+    拆分出生日期文本中的日期与时间（只把末尾的 HH:MM 视为时间，"农历 2024-01-15" 中的空格不作分隔）
+    :param text: 如 "2024-01-15 08:30"、"农历 2024-01-15"、"农历2023年闰2月15日 08:30"
+    :return: (日期部分, 时间部分)；没有时间时时间部分为空字符串
+    """
+    text = str(text).strip()
+    date_part, _, time_part = text.rpartition(" ")
+    if date_part and ":" in time_part:
+        return date_part.strip(), time_part
+    return text, ""
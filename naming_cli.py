@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+交互式取名命令行
+读取姓氏、性别、出生日期等输入后，先尝试把搜索（连同八字分析）转发给本地守护进程（naming_daemon.py），
+守护进程在运行时本进程不导入取名流水线（评分、八字、解析模块），启动开销只剩读取输入和收发请求；
+守护进程不可用或繁忙时才加载 NamingGenerator 在本进程内计算。
+
+本模块顶层只导入轻量模块（标准库、农历换算、守护进程客户端、报告写入），
+取名流水线在本机计算的路径上按需导入。
+
+用法：
+    python naming_generator.py（或 python naming_cli.py）
+"""
+
+import datetime
+import os
+
+from lunar_calendar import format_lunar, lunar_to_solar, parse_lunar_date
+from naming_daemon import DaemonError, forward
+from report_writer import ReportWriter, ResultContext, report_header
+from result_export import open_exporter
+from search_stats import NameList, SearchStats
+
+
+def _get_xiyongshen_input(birthdate):
+    """
+    获取喜用神输入（提取重复逻辑）
+    :param birthdate: 出生日期对象或None
+    :return: 喜用神列表
+    """
+    xiyongshen = []
+
+    if birthdate:
+        use_auto = input("是否根据八字自动计算喜用神？(y/n，默认y)：").strip().lower()
+        if use_auto != 'n':
+            # 自动计算，返回空列表，让NamingGenerator自动计算
+            return []
+        else:
+            # 手动输入
+            print("\n提示：支持五行（金、木、水、火、土），最多输入2个，空格分隔。")
+            xiyongshen_str = input("请输入喜用神（可选）：").strip()
+            xiyongshen = xiyongshen_str.split() if xiyongshen_str else []
+    else:
+        print("\n提示：支持五行（金、木、水、火、土），最多输入2个，空格分隔。")
+        xiyongshen_str = input("请输入喜用神（可选）：").strip()
+        xiyongshen = xiyongshen_str.split() if xiyongshen_str else []
+
+    return xiyongshen
+
+
+def _forward_to_daemon(params):
+    """
+    本地守护进程（naming_daemon.py）在运行时把搜索转发给它，八字分析也由守护进程完成
+    :param params: generate 接口参数
+    :return: (名字列表（NameList，带守护进程的搜索统计）, 渲染用的 ResultContext)；
+             守护进程不可用或繁忙时返回 None（在本进程内计算）
+    """
+    try:
+        response = forward("generate", params)
+    except DaemonError as e:
+        print(f"守护进程未能处理（{e}），改为本机计算")
+        return None
+    if response is None:
+        return None
+    if response["bazi"] and not params["xiyongshen"]:
+        print(f"根据八字分析，自动推荐喜用神：{', '.join(response['xiyongshen'])}")
+    print("已由取名守护进程完成搜索")
+    context = ResultContext(params["surname"], params["gender"], bazi_analysis=response["bazi"],
+                            xiyongshen=response["xiyongshen"], baxi_score_max=response["baxi_score_max"])
+    stats = response.get("stats")
+    return NameList(response["results"], SearchStats.from_dict(stats) if stats else None), context
+
+
+def _generate_locally(surname, gender, birthdate, xiyongshen, birthplace, count):
+    """
+    在本进程内生成（只在此时导入取名流水线）
+    :return: (名字生成器, NamingGenerator)
+    """
+    from naming_generator import NamingGenerator
+    generator = NamingGenerator(surname, gender, birthdate=birthdate, xiyongshen=xiyongshen,
+                                birthplace=birthplace)
+    return generator.iter_names(count), generator
+
+
+def main():
+    print("=" * 60)
+    print("三才五格智能取名系统 V3.2 (八字增强版)")
+    print("=" * 60)
+
+    surname = input("\n请输入姓氏：").strip()
+    if not surname: return
+
+    gender = input("请输入性别（男/女）：").strip()
+    if gender not in ["男", "女"]: return
+
+    # 新增：输入出生日期
+    birthdate_str = input("\n请输入出生日期（YYYY-MM-DD，农历请写作 农历YYYY-MM-DD，闰月如 农历2023-闰02-15，可选）：").strip()
+    birthdate = None
+    birthplace = None
+    lunar_label = ""
+    if birthdate_str:
+        try:
+            lunar = parse_lunar_date(birthdate_str)
+            if lunar:
+                birthdate = lunar_to_solar(*lunar)
+                print(f"{format_lunar(*lunar)}即公历{birthdate.isoformat()}")
+                birthdate_str = birthdate.isoformat()
+                lunar_label = f"（{format_lunar(*lunar)}）"
+            else:
+                year, month, day = map(int, birthdate_str.split('-'))
+                birthdate = datetime.date(year, month, day)
+        except:
+            print("日期格式错误，将跳过八字分析")
+    if birthdate:
+        time_str = input("请输入出生时间（HH:MM，可选，默认12:00）：").strip()
+        if time_str:
+            try:
+                hour, minute = map(int, time_str.split(':'))
+                birthdate = datetime.datetime(birthdate.year, birthdate.month, birthdate.day, hour, minute)
+                birthdate_str = f"{birthdate_str} {hour:02d}:{minute:02d}"
+            except ValueError:
+                print("时间格式错误，将按中午12点计算")
+        birthplace = input("请输入出生地（城市名或东经度数，可选，用于真太阳时校正）：").strip() or None
+
+    # 使用提取的函数获取喜用神输入
+    xiyongshen = _get_xiyongshen_input(birthdate)
+
+    count = input("\n请输入生成名字数量（默认 5）：").strip()
+    count = int(count) if count.isdigit() else 5
+
+    # 先决定是否保存：保存时结果边生成边写入报告
+    save_option = input("是否保存结果到文件？(y/n): ").strip().lower()
+    save_format = "txt"
+    if save_option == 'y':
+        save_format = input("保存格式（txt 报告 / jsonl / csv，默认 txt）：").strip().lower() or "txt"
+        if save_format not in ("txt", "jsonl", "csv"):
+            print("格式无效，将保存为 txt 报告")
+            save_format = "txt"
+
+    # 输入读完即尝试守护进程，不可用时才在本进程内构建生成器
+    params = {
+        "surname": surname,
+        "gender": gender,
+        "birthdate": (birthdate.strftime("%Y-%m-%d %H:%M") if isinstance(birthdate, datetime.datetime)
+                      else birthdate.isoformat() if birthdate else None),
+        "birthplace": birthplace,
+        "xiyongshen": xiyongshen,
+        "count": count,
+    }
+    forwarded = _forward_to_daemon(params)
+    if forwarded is None:
+        names, context = _generate_locally(surname, gender, birthdate, xiyongshen, birthplace, count)
+    else:
+        names, context = forwarded
+
+    report = None
+    if save_option == 'y':
+        filename = f"取名结果_{surname}{gender}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{save_format}"
+        if save_format == "txt":
+            report = ReportWriter(filename)
+            report.write_header(report_header(context, birthdate_str if birthdate else None,
+                                              lunar_label, birthplace))
+        else:
+            report = open_exporter(filename)
+
+    total = 0
+    try:
+        for total, name_data in enumerate(names, 1):
+            print(context.format_result(name_data, total))
+            if report:
+                report.write_result(context, name_data)
+    finally:
+        if report:
+            report.close()
+
+    if not total:
+        if report:
+            os.remove(filename)
+        print("\n抱歉，未能生成符合条件的名字。")
+        stats = getattr(names, "stats", None) or context.last_stats
+        if stats:
+            for reason in stats.diagnose():
+                print(f"原因：{reason}")
+            for line in stats.lines():
+                print(f"  {line}")
+        print("建议：1. 降低分数要求 2. 减少喜用神限制 3. 扩充字库")
+        return
+
+    if report:
+        print(f"\n结果已保存到：{filename}")
+
+
+if __name__ == "__main__":
+    main()
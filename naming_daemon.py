@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+取名守护进程模块
+本地常驻进程在 Unix 域套接字上提供与 naming_service 相同的接口（generate / evaluate / bazi / health），
+交互式命令行（naming_cli.py）读完输入即检测守护进程，把搜索和八字分析转发给它，复用其预热的字库索引、语料和各级缓存，
+命令行本身不导入取名流水线；守护进程不可用时命令行照常在本进程内计算。
+
+协议：每行一个 JSON 请求 {"endpoint": "generate", ...参数}，每行一个 JSON 响应
+    {"ok": 响应} 或 {"error": "...", "status": 400/503/500}；同一连接可连续发送多个请求。
+
+本模块顶层只导入标准库，客户端（DaemonClient / forward）不加载取名服务相关模块。
+
+用法：
+    python naming_daemon.py serve [--socket /tmp/naming-1000.sock] [--workers 4]
+    python naming_daemon.py status
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+
+# 设置后守护进程和命令行使用该套接字路径
+DAEMON_SOCKET_ENV = "NAMING_DAEMON_SOCKET"
+
+
+class DaemonConfig:
+    """守护进程配置常量"""
+    CONNECT_TIMEOUT = 0.2     # 连接超时（秒），守护进程不在时命令行很快回退
+    TIMEOUT = 60.0            # 请求超时（秒）
+    MAX_LINE = 64 * 1024      # 单个请求上限（字节）
+
+
+def default_socket_path():
+    """默认套接字路径（NAMING_DAEMON_SOCKET，未设置时为临时目录下按用户区分的文件）"""
+    path = os.environ.get(DAEMON_SOCKET_ENV)
+    if path:
+        return path
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"naming-{uid}.sock")
+
+
+class DaemonError(Exception):
+    """守护进程返回的错误"""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+class DaemonClient:
+    """守护进程客户端（一个连接，可连续发送多个请求）"""
+
+    def __init__(self, path=None, timeout=DaemonConfig.TIMEOUT):
+        """
+        初始化（连接守护进程）
+        :param path: 套接字路径（默认 default_socket_path()）
+        :param timeout: 请求超时（秒）
+        :raise OSError: 守护进程不可用
+        """
+        self.path = path or default_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(DaemonConfig.CONNECT_TIMEOUT)
+            self._sock.connect(self.path)
+            self._sock.settimeout(timeout)
+        except OSError:
+            self._sock.close()
+            raise
+        self._reader = self._sock.makefile("rb")
+
+    def call(self, endpoint, params=None):
+        """
+        调用接口
+        :param endpoint: 接口名（generate / evaluate / bazi / health）
+        :param params: 请求参数
+        :return: 响应字典
+        :raise DaemonError: 守护进程返回错误（status 400 为参数错误，503 为繁忙）
+        :raise OSError: 连接中断
+        """
+        request = dict(params or {}, endpoint=endpoint)
+        self._sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("守护进程关闭了连接")
+        response = json.loads(line.decode("utf-8"))
+        if "error" in response:
+            raise DaemonError(response["error"], response.get("status", 500))
+        return response["ok"]
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def forward(endpoint, params, path=None):
+    """
+    把请求转发给守护进程
+    :return: 响应字典；守护进程不可用或繁忙时返回 None（调用方在本进程内计算）
+    :raise DaemonError: 参数错误等非繁忙错误
+    """
+    try:
+        with DaemonClient(path) as client:
+            return client.call(endpoint, params)
+    except DaemonError as e:
+        if e.status == 503:
+            return None
+        raise
+    except OSError:
+        return None
+
+
+class NamingDaemon:
+    """取名守护进程（Unix 域套接字，每连接一个线程，接口调用交给 NamingService）"""
+
+    def __init__(self, service=None, path=None):
+        """
+        初始化（绑定套接字；同一路径上已有守护进程在运行时抛出 OSError）
+        :param service: NamingService（可选，默认新建并预热）
+        :param path: 套接字路径（默认 default_socket_path()）
+        """
+        from naming_service import NamingService
+        self.service = service if service is not None else NamingService().warm()
+        self.path = path or default_socket_path()
+        if os.path.exists(self.path):
+            try:
+                DaemonClient(self.path).close()
+            except OSError:
+                os.unlink(self.path)    # 上次异常退出遗留的套接字文件
+            else:
+                raise OSError(f"守护进程已在运行：{self.path}")
+        self._thread = None
+        self.server = socketserver.ThreadingUnixStreamServer(self.path, self._handler_class())
+        self.server.daemon_threads = True
+        os.chmod(self.path, 0o600)
+
+    def _handler_class(self):
+        from admission import Overloaded
+        service = self.service
+        endpoints = {"generate", "evaluate", "bazi"}
+
+        class Handler(socketserver.StreamRequestHandler):
+            def _respond(self, line):
+                try:
+                    request = json.loads(line.decode("utf-8"))
+                    if not isinstance(request, dict):
+                        raise ValueError("请求应为 JSON 对象")
+                    endpoint = request.pop("endpoint", None)
+                    if endpoint == "health":
+                        return {"ok": service.health()}
+                    if endpoint not in endpoints:
+                        raise ValueError(f"未知接口 {endpoint}")
+                    return {"ok": service.call(endpoint, request)}
+                except ValueError as e:
+                    return {"error": str(e), "status": 400}
+                except Overloaded as e:
+                    return {"error": str(e), "status": 503}
+                except Exception as e:
+                    return {"error": f"{type(e).__name__}: {e}", "status": 500}
+
+            def handle(self):
+                while True:
+                    line = self.rfile.readline(DaemonConfig.MAX_LINE + 1)
+                    if not line:
+                        return
+                    if len(line) > DaemonConfig.MAX_LINE:
+                        response = {"error": "请求过大", "status": 413}
+                    else:
+                        response = self._respond(line)
+                    self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                    if response.get("status") == 413:
+                        return
+
+        return Handler
+
+    def start(self):
+        """后台线程启动"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止并删除套接字文件"""
+        self.server.shutdown()
+        self.close()
+
+    def close(self):
+        self.server.server_close()
+        self.service.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="取名守护进程")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="启动守护进程")
+    serve_parser.add_argument("--socket", help="套接字路径")
+    serve_parser.add_argument("--workers", type=int, help="搜索工作线程数")
+    status_parser = subparsers.add_parser("status", help="查看守护进程状态")
+    status_parser.add_argument("--socket", help="套接字路径")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        try:
+            with DaemonClient(args.socket) as client:
+                print(json.dumps(client.call("health"), ensure_ascii=False, indent=2))
+        except OSError:
+            print(f"守护进程未运行：{args.socket or default_socket_path()}")
+        return
+
+    from naming_service import NamingService
+    service = NamingService(**({"workers": args.workers} if args.workers else {})).warm(full=True)
+    daemon = NamingDaemon(service, args.socket)
+    print(f"取名守护进程已启动：{daemon.path}", flush=True)
+    # SIGTERM 时同样清理套接字文件
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        daemon.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+
+
+if __name__ == "__main__":
+    main()
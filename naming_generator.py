@@ -2,16 +2,29 @@
 """
 取名生成器主程序 (V3.2 八字增强版)
 根据姓氏、性别、出生日期生成推荐名字，集成八字自动计算和喜用神推荐
+直接运行本文件进入交互式命令行（见 naming_cli.py）
 """
 
+if __name__ == "__main__":
+    # 命令行先读取输入并尝试转发给守护进程，在此之前不导入取名流水线
+    from naming_cli import main
+    main()
+    raise SystemExit(0)
+
+import contextlib
 import datetime
 import random
 from wuge_calculator import WuGeCalculator
 from sancai_analyzer import SanCaiAnalyzer
 from data_81_numbers import get_number_luck, get_number_meaning
-from data_characters import get_character_info, CHARACTERS
 from ai_analyzer import AIAnalyzer
+from ai_backend import AsyncAnalyzer, default_backend
 from bazi_calculator import BaZiCalculator  # 新增：导入八字计算模块
+from lexicon import get_default_lexicon
+from solar_time import resolve_longitude
+from lunar_calendar import parse_lunar_date, lunar_to_solar, format_lunar, split_date_time
+from report_writer import render_result
+from search_stats import NameList, SearchStats
 
 
 class Config:
@@ -27,53 +40,120 @@ class Config:
     MAX_SEARCH_PREFERRED = 5000   # 优先搜索最大次数
     MAX_SEARCH_OTHER = 10000      # 其他搜索最大次数
     
+    # 成本估算（以评分一个名字为1）
+    ANALYSIS_COST = 1             # 模板解析一个名字
+    REMOTE_ANALYSIS_COST = 50     # 模型服务解析一个名字
+    
     # 评分相关
     MAX_MEANING_SOUND_SCORE = 20  # 字义音韵最大得分
     WUGE_SCORE_PER_GOOD = 8       # 五格每吉得分
-    BAXI_SCORE_BASE = 5           # 八字基础得分
-    BAXI_SCORE_ONE_MATCH = 5      # 八字一个匹配得分
-    BAXI_SCORE_TWO_MATCH = 10     # 八字两个匹配得分
+    BAXI_SCORE_BASE = 5           # 八字基础得分（未指定喜用神时）
+    BAXI_SCORE_MAX = 10           # 八字满分（两个字都属需求最大的五行）
 
 
 class NamingGenerator:
     """取名生成器"""
     
-    def __init__(self, surname, gender, birthdate=None, xiyongshen=None, bazi_analysis=None):
+    def __init__(self, surname, gender, birthdate=None, xiyongshen=None, bazi_analysis=None,
+                 lexicon=None, zibei=None, zibei_position=0, birthplace=None, analysis_backend=None,
+                 seed=None, need_vector=None):
         """
         初始化
         :param surname: 姓氏
         :param gender: 性别（"男"/"女"）
-        :param birthdate: 出生日期（可选，用于八字分析）
+        :param birthdate: 出生日期（可选，用于八字分析；datetime 或 "YYYY-MM-DD HH:MM" 可带出生时间，
+                          农历写作 "农历YYYY-MM-DD"，闰月如 "农历2023-闰02-15"）
         :param xiyongshen: 喜用神列表（可选，如 ["金", "水"]）
         :param bazi_analysis: 八字分析结果（可选）
+        :param lexicon: 字库（可选，Lexicon 或 LexiconOverlay，默认共享字库）
+        :param zibei: 字辈（可选，名字中必须包含的字）
+        :param zibei_position: 字辈位置（0为名字第一字，1为第二字）
+        :param birthplace: 出生地（可选，城市名或东经度数，用于真太阳时校正时柱）
+        :param analysis_backend: 文化解析模型后端（可选，默认按 NAMING_ANALYSIS_URL，未设置则用模板解析）
+        :param seed: 候选字洗牌种子（可选，相同种子得到相同的搜索顺序和排序结果，分页用）
+        :param need_vector: 五行需求向量（可选，按木火土金水；默认由八字分析或喜用神得出）
         """
         self.surname = surname
         self.gender = gender
         self.birthdate = birthdate
         self.xiyongshen = xiyongshen if xiyongshen else []
         self.bazi_analysis = bazi_analysis
-        self.ai_analyzer = AIAnalyzer()
+        self.lexicon = lexicon if lexicon is not None else get_default_lexicon()
+        self.zibei = zibei
+        self.zibei_position = zibei_position
+        self.birthplace = birthplace
+        self.ai_analyzer = AIAnalyzer(self.lexicon)
+        self.async_analyzer = AsyncAnalyzer(
+            analysis_backend if analysis_backend is not None else default_backend(),
+            fallback=self.ai_analyzer)
+        self.need_vector = None
+        # 搜索次数上限（服务降级时可调低，得到近似结果）
+        self.max_search_preferred = Config.MAX_SEARCH_PREFERRED
+        self.max_search_other = Config.MAX_SEARCH_OTHER
+        self.seed = seed
+        # 最近一次搜索的统计（SearchStats）
+        self.last_stats = None
         
         # 获取姓氏笔画
-        surname_info = get_character_info(surname[0]) if len(surname) > 0 else None
+        surname_info = self.lexicon.get(surname[0]) if len(surname) > 0 else None
         self.surname_stroke = surname_info["笔画"] if surname_info else None
         
         # 如果提供了出生日期但没有喜用神，自动计算八字和喜用神
         if birthdate and not xiyongshen:
             self._auto_calculate_xiyongshen()
+        self._update_need_vector(need_vector)
+    
+    def _update_need_vector(self, need_vector=None):
+        """
+        确定五行需求向量（按木火土金水）：指定时直接使用；喜用神来自八字分析时用其五行需求，
+        手工指定的喜用神按所列五行均分；未指定喜用神时为 None
+        """
+        if need_vector:
+            self.need_vector = tuple(need_vector)
+        elif (self.bazi_analysis and "五行需求" in self.bazi_analysis
+                and list(self.bazi_analysis.get("推荐喜用神", [])) == list(self.xiyongshen)):
+            self.need_vector = tuple(self.bazi_analysis["五行需求"])
+        else:
+            self.need_vector = BaZiCalculator.xiyongshen_vector(self.xiyongshen)
+        
+        # 各五行的单字八字亲和度（0-1，需求最大的五行为1）
+        self._wuxing_affinity = {}
+        if self.need_vector:
+            top = max(self.need_vector)
+            self._wuxing_affinity = {elem: need / top
+                                     for elem, need in zip(BaZiCalculator.WU_XING_ORDER, self.need_vector)}
+    
+    def _char_affinity(self, info):
+        """单字的八字亲和度"""
+        return self._wuxing_affinity.get(info["五行"], 0.0) if info else 0.0
     
     def _auto_calculate_xiyongshen(self):
         """自动计算八字和喜用神"""
         try:
+            hour, minute = 12, 0  # 未提供出生时间时默认中午12点
             if isinstance(self.birthdate, str):
-                # 解析日期字符串
+                # 解析日期字符串（可带 HH:MM 出生时间）
                 try:
-                    year, month, day = map(int, self.birthdate.split('-'))
+                    date_part, time_part = split_date_time(self.birthdate)
+                    lunar = parse_lunar_date(date_part)
+                    if lunar:
+                        # 农历日期先换算为公历
+                        solar = lunar_to_solar(*lunar)
+                        year, month, day = solar.year, solar.month, solar.day
+                        print(f"{format_lunar(*lunar)}即公历{solar.isoformat()}")
+                    else:
+                        year, month, day = map(int, date_part.split('-'))
+                    if time_part:
+                        hour, minute = map(int, time_part.strip().split(':'))
                 except ValueError as e:
                     print(f"日期格式错误：{e}")
-                    print("请使用YYYY-MM-DD格式，例如：2024-01-15")
+                    print("请使用YYYY-MM-DD或YYYY-MM-DD HH:MM格式，例如：2024-01-15 08:30"
+                          "（农历写作 农历2024-01-15）")
                     print("将使用默认设置（不限制五行）")
                     return
+            elif isinstance(self.birthdate, datetime.datetime):
+                year, month, day = self.birthdate.year, self.birthdate.month, self.birthdate.day
+                hour, minute = self.birthdate.hour, self.birthdate.minute
             elif isinstance(self.birthdate, datetime.date):
                 # 已经是date对象
                 year, month, day = self.birthdate.year, self.birthdate.month, self.birthdate.day
@@ -100,8 +180,18 @@ class NamingGenerator:
                 print("将使用默认设置（不限制五行）")
                 return
             
+            if not (0 <= hour <= 23 and 0 <= minute <= 59):
+                print(f"出生时间{hour}:{minute:02d}无效，将按中午12点计算")
+                hour, minute = 12, 0
+            
+            # 出生地经度（用于真太阳时校正）
+            longitude = resolve_longitude(self.birthplace)
+            if self.birthplace and longitude is None:
+                print(f"未识别的出生地“{self.birthplace}”，将按北京时间计算时柱")
+            
             # 计算八字
-            self.bazi_analysis = BaZiCalculator.analyze_bazi(year, month, day)
+            self.bazi_analysis = BaZiCalculator.analyze_bazi(year, month, day, hour, minute,
+                                                             longitude=longitude)
             
             # 使用推荐的喜用神
             if self.bazi_analysis and "推荐喜用神" in self.bazi_analysis:
@@ -124,99 +214,159 @@ class NamingGenerator:
         """
         生成推荐名字列表（优化版）
         :param count: 生成数量
-        :return: 名字列表（已评分排序）
+        :return: 名字列表（已评分排序；NameList，stats 为本次搜索的分阶段统计）
         """
-        # 预筛选符合条件的字
-        filtered_chars = []
-        for char, info in CHARACTERS.items():
-            if (self.gender in info["性别"] and 
-                info["常用度"] >= Config.MIN_COMMON_USAGE):
-                filtered_chars.append((char, info))
-        
-        if not filtered_chars:
-            print("没有找到符合条件的字")
-            return []
-        
-        # 根据喜用神分组（优化筛选）
-        preferred_chars = []
-        other_chars = []
-        
-        for char, info in filtered_chars:
-            if self.xiyongshen and info["五行"] in self.xiyongshen:
-                preferred_chars.append((char, info))
+        names = NameList(self.iter_names(count))
+        names.stats = self.last_stats
+        return names
+    
+    def iter_names(self, count=Config.MAX_NAME_COUNT):
+        """
+        逐个产出推荐名字（按评分排序），文化解析按批进行，每批解析完即产出，
+        调用方可边生成边输出；搜索统计见 self.last_stats
+        :param count: 生成数量
+        :return: 名字生成器
+        """
+        final_results = self._rank_candidates(count)
+        yield from self.analyze_candidates(final_results, final_results.stats)
+    
+    def ranked_candidates(self, count=Config.MAX_NAME_COUNT):
+        """
+        与 generate_names(count) 相同的搜索（搜索量相同），但返回全部达到阈值的候选的排序结果
+        （至多 Config.MAX_CANDIDATES 个）；指定 seed 时多次调用结果相同，分页按此列表切片
+        :param count: 生成数量（决定是否搜索喜用神以外的首字）
+        :return: 候选列表（尚未做文化解析；NameList，stats 为搜索统计）
+        """
+        return self._rank_candidates(count, keep_all=True)
+    
+    def analyze_candidates(self, final_results, stats=None):
+        """
+        为已排序的候选逐个补上文化解析并产出（按批解析，每批解析完即产出）
+        :param final_results: 候选列表（_rank_candidates / ranked_candidates 的结果或其切片）
+        :param stats: 搜索统计（可选，解析耗时记入其“文化解析”阶段）
+        :return: 名字生成器
+        """
+        if not final_results:
+            return
+        
+        print(f"正在进行文化深度解析（共 {len(final_results)} 个名字）...")
+        # 每块正好占满解析器的并发批数
+        chunk_size = self.async_analyzer.batch_size * self.async_analyzer.concurrency
+        for start in range(0, len(final_results), chunk_size):
+            chunk = final_results[start:start + chunk_size]
+            with stats.stage("文化解析") if stats else contextlib.nullcontext():
+                analyses = self.async_analyzer.analyze_many_sync(
+                    (self.surname, item["名字"], self.gender) for item in chunk)
+            for item, analysis in zip(chunk, analyses):
+                item["文化解析"] = analysis
+                yield item
+    
+    def estimate_cost(self, count=Config.MAX_NAME_COUNT):
+        """
+        估算 generate_names 的成本：按候选池大小（位图计数，搜索前即可得到）推算评分次数上界，
+        加上文化解析的折算成本
+        :param count: 生成数量
+        :return: 成本（评分次数当量）
+        """
+        total = self.lexicon.count(gender=self.gender, min_usage=Config.MIN_COMMON_USAGE)
+        preferred = (self.lexicon.count(gender=self.gender, min_usage=Config.MIN_COMMON_USAGE,
+                                        wuxing=self.xiyongshen) if self.xiyongshen else 0)
+        first_preferred, first_other, second = preferred, total - preferred, total
+        if self.zibei:
+            zibei_info = self.lexicon.get(self.zibei)
+            if not zibei_info:
+                return 0
+            if self.zibei_position == 0:
+                first_preferred = 1 if self.xiyongshen and zibei_info["五行"] in self.xiyongshen else 0
+                first_other = 1 - first_preferred
             else:
-                other_chars.append((char, info))
-        
-        # 增加随机性
-        random.shuffle(preferred_chars)
-        random.shuffle(other_chars)
-        
-        # 限制搜索范围，提高性能
-        max_search = min(100, len(filtered_chars))
-        preferred_chars = preferred_chars[:max_search]
-        other_chars = other_chars[:max_search]
+                second = 1
+        
+        # 与 _rank_candidates 相同的截断：每组首字最多100个，两轮各有搜索次数上限
+        searched = min(min(100, first_preferred) * second, self.max_search_preferred)
+        if searched < self.max_search_preferred:
+            searched = min(searched + min(100, first_other) * second, self.max_search_other)
+        analysis_cost = Config.REMOTE_ANALYSIS_COST if self.async_analyzer.backend else Config.ANALYSIS_COST
+        return searched + min(count, Config.MAX_CANDIDATES) * analysis_cost
+    
+    def _rank_candidates(self, count, keep_all=False):
+        """
+        搜索并评分候选名字（各阶段计数与耗时记入 self.last_stats）
+        :param count: 生成数量
+        :param keep_all: 返回全部候选（默认只返回前 count 个）
+        :return: 评分最高的 count 个名字（尚未做文化解析；NameList，stats 为本次搜索统计）
+        """
+        stats = self.last_stats = SearchStats()
+        threshold = stats.threshold = (Config.SCORE_THRESHOLD_WITH_XIYONGSHEN
+                                       if self.xiyongshen else Config.SCORE_THRESHOLD_NO_XIYONGSHEN)
+        
+        with stats.stage("筛选"):
+            # 预筛选符合条件的字（使用字库位图索引）
+            filtered_chars = self.lexicon.select(gender=self.gender,
+                                                 min_usage=Config.MIN_COMMON_USAGE)
+            stats.gender_pool = self.lexicon.count(gender=self.gender)
+            stats.usage_pool = len(filtered_chars)
+            
+            if not filtered_chars:
+                print("没有找到符合条件的字")
+                stats.stopped_by = "no_chars"
+                return NameList(stats=stats)
+            
+            # 字辈：固定名字中的一个位置
+            first_pool = filtered_chars
+            second_pool = filtered_chars
+            if self.zibei:
+                zibei_info = self.lexicon.get(self.zibei)
+                if not zibei_info:
+                    print(f"字辈“{self.zibei}”不在字库中，请通过字库覆盖层补充该字")
+                    stats.stopped_by = "zibei_missing"
+                    return NameList(stats=stats)
+                if self.zibei_position == 0:
+                    first_pool = [(self.zibei, zibei_info)]
+                else:
+                    second_pool = [(self.zibei, zibei_info)]
+            
+            # 本次请求的单字八字亲和度，按候选字预先算好
+            second_affinity = [self._char_affinity(info) for _, info in second_pool]
+            
+            # 根据喜用神分组（优化筛选）
+            preferred_chars = []
+            other_chars = []
+            
+            for char, info in first_pool:
+                if self.xiyongshen and info["五行"] in self.xiyongshen:
+                    preferred_chars.append((char, info, self._char_affinity(info)))
+                else:
+                    other_chars.append((char, info, self._char_affinity(info)))
+            
+            # 增加随机性（指定种子时可复现）
+            rng = random.Random(self.seed) if self.seed is not None else random
+            rng.shuffle(preferred_chars)
+            rng.shuffle(other_chars)
+            
+            # 限制搜索范围，提高性能
+            max_search = min(100, len(first_pool))
+            stats.first_preferred = len(preferred_chars)
+            stats.first_other = len(other_chars)
+            stats.second_pool = len(second_pool)
+            preferred_chars = preferred_chars[:max_search]
+            other_chars = other_chars[:max_search]
         
         candidates = []
         search_count = 0
+        # 循环内只累加局部计数，结束后写入统计
+        considered = skipped_same = skipped_xiyongshen = passed = 0
+        best_score = None
+        first_searched = len(preferred_chars)
         
         # 优先使用喜用神匹配的字
-        for char1, info1 in preferred_chars:
-            for char2, info2 in filtered_chars:
-                if char1 == char2:
-                    continue
-                    
-                # 检查第二个字是否适合该性别和常用度
-                if (self.gender not in info2["性别"] or 
-                    info2["常用度"] < Config.MIN_COMMON_USAGE):
-                    continue
-                
-                # 喜用神匹配检查
-                if self.xiyongshen:
-                    if len(self.xiyongshen) == 2:
-                        match1 = info1["五行"] in self.xiyongshen
-                        match2 = info2["五行"] in self.xiyongshen
-                        if not (match1 or match2):
-                            continue
-                    else:
-                        if (info1["五行"] not in self.xiyongshen and 
-                            info2["五行"] not in self.xiyongshen):
-                            continue
-                
-                # 生成完整姓名
-                full_name = self.surname + char1 + char2
-                
-                # 计算评分
-                score_result = self.evaluate_name(full_name)
-                
-                # 使用配置常量
-                threshold = (Config.SCORE_THRESHOLD_WITH_XIYONGSHEN 
-                           if self.xiyongshen else Config.SCORE_THRESHOLD_NO_XIYONGSHEN)
-                
-                if score_result["总分"] >= threshold:
-                    candidates.append({
-                        "姓名": full_name,
-                        "名字": char1 + char2,
-                        "评分": score_result
-                    })
-                
-                search_count += 1
-                if (len(candidates) >= Config.MAX_CANDIDATES or 
-                    search_count >= Config.MAX_SEARCH_PREFERRED):  # 限制总搜索次数
-                    break
-            
-            if (len(candidates) >= Config.MAX_CANDIDATES or 
-                search_count >= Config.MAX_SEARCH_PREFERRED):
-                break
-        
-        # 如果喜用神匹配的字不够，再搜索其他字
-        if len(candidates) < count * 2 and search_count < Config.MAX_SEARCH_PREFERRED:
-            for char1, info1 in other_chars:
-                for char2, info2 in filtered_chars:
+        with stats.stage("优先搜索"):
+            stats.phases["优先搜索"] = "exhausted" if preferred_chars else "no_first"
+            for char1, info1, affinity1 in preferred_chars:
+                for (char2, info2), affinity2 in zip(second_pool, second_affinity):
+                    considered += 1
                     if char1 == char2:
-                        continue
-                        
-                    if (self.gender not in info2["性别"] or 
-                        info2["常用度"] < Config.MIN_COMMON_USAGE):
+                        skipped_same += 1
                         continue
                     
                     # 喜用神匹配检查
@@ -225,19 +375,25 @@ class NamingGenerator:
                             match1 = info1["五行"] in self.xiyongshen
                             match2 = info2["五行"] in self.xiyongshen
                             if not (match1 or match2):
+                                skipped_xiyongshen += 1
                                 continue
                         else:
                             if (info1["五行"] not in self.xiyongshen and 
                                 info2["五行"] not in self.xiyongshen):
+                                skipped_xiyongshen += 1
                                 continue
                     
+                    # 生成完整姓名
                     full_name = self.surname + char1 + char2
-                    score_result = self.evaluate_name(full_name)
                     
-                    threshold = (Config.SCORE_THRESHOLD_WITH_XIYONGSHEN 
-                               if self.xiyongshen else Config.SCORE_THRESHOLD_NO_XIYONGSHEN)
+                    # 计算评分
+                    score_result = self.evaluate_name(full_name, self._pair_bazi_score(affinity1, affinity2))
+                    total = score_result["总分"]
+                    if best_score is None or total > best_score:
+                        best_score = total
                     
-                    if score_result["总分"] >= threshold:
+                    if total >= threshold:
+                        passed += 1
                         candidates.append({
                             "姓名": full_name,
                             "名字": char1 + char2,
@@ -246,34 +402,101 @@ class NamingGenerator:
                     
                     search_count += 1
                     if (len(candidates) >= Config.MAX_CANDIDATES or 
-                        search_count >= Config.MAX_SEARCH_OTHER):
+                        search_count >= self.max_search_preferred):  # 限制总搜索次数
                         break
                 
                 if (len(candidates) >= Config.MAX_CANDIDATES or 
-                    search_count >= Config.MAX_SEARCH_OTHER):
+                    search_count >= self.max_search_preferred):
+                    stats.stopped_by = ("candidates" if len(candidates) >= Config.MAX_CANDIDATES
+                                        else "search_preferred")
+                    stats.phases["优先搜索"] = ("candidates" if stats.stopped_by == "candidates"
+                                            else "search_limit")
                     break
         
-        # 按总分排序
-        candidates.sort(key=lambda x: x["评分"]["总分"], reverse=True)
+        # 如果喜用神匹配的字不够，再搜索其他字
+        if len(candidates) < count * 2 and search_count < self.max_search_preferred:
+            first_searched += len(other_chars)
+            with stats.stage("其他搜索"):
+                stats.phases["其他搜索"] = "exhausted" if other_chars else "no_first"
+                for char1, info1, affinity1 in other_chars:
+                    for (char2, info2), affinity2 in zip(second_pool, second_affinity):
+                        considered += 1
+                        if char1 == char2:
+                            skipped_same += 1
+                            continue
+                        
+                        # 喜用神匹配检查
+                        if self.xiyongshen:
+                            if len(self.xiyongshen) == 2:
+                                match1 = info1["五行"] in self.xiyongshen
+                                match2 = info2["五行"] in self.xiyongshen
+                                if not (match1 or match2):
+                                    skipped_xiyongshen += 1
+                                    continue
+                            else:
+                                if (info1["五行"] not in self.xiyongshen and 
+                                    info2["五行"] not in self.xiyongshen):
+                                    skipped_xiyongshen += 1
+                                    continue
+                        
+                        full_name = self.surname + char1 + char2
+                        score_result = self.evaluate_name(full_name, self._pair_bazi_score(affinity1, affinity2))
+                        total = score_result["总分"]
+                        if best_score is None or total > best_score:
+                            best_score = total
+                        
+                        if total >= threshold:
+                            passed += 1
+                            candidates.append({
+                                "姓名": full_name,
+                                "名字": char1 + char2,
+                                "评分": score_result
+                            })
+                        
+                        search_count += 1
+                        if (len(candidates) >= Config.MAX_CANDIDATES or 
+                            search_count >= self.max_search_other):
+                            break
+                    
+                    if (len(candidates) >= Config.MAX_CANDIDATES or 
+                        search_count >= self.max_search_other):
+                        stats.stopped_by = ("candidates" if len(candidates) >= Config.MAX_CANDIDATES
+                                            else "search_other")
+                        stats.phases["其他搜索"] = ("candidates" if stats.stopped_by == "candidates"
+                                                else "search_limit")
+                        break
+        elif len(candidates) >= count * 2:
+            # 优先搜索的候选已够，其他字未搜索（不是搜完）
+            stats.phases["其他搜索"] = "enough"
+            stats.stopped_by = stats.stopped_by or "enough"
+        else:
+            stats.phases["其他搜索"] = "no_budget"
         
-        # 只取前 count 个进行文化分析
-        final_results = candidates[:count]
+        stats.considered = considered
+        stats.skipped_same_char = skipped_same
+        stats.skipped_xiyongshen = skipped_xiyongshen
+        stats.scored = search_count
+        stats.passed = passed
+        stats.best_score = best_score
+        stats.first_searched = first_searched
         
-        if final_results:
-            print(f"正在进行文化深度解析（共 {len(final_results)} 个名字）...")
-            for item in final_results:
-                item["文化解析"] = self.ai_analyzer.analyze_name(
-                    self.surname, item["名字"], self.gender
-                )
+        # 按总分排序
+        with stats.stage("排序"):
+            candidates.sort(key=lambda x: x["评分"]["总分"], reverse=True)
         
-        return final_results
+        # 只取前 count 个进行文化分析
+        return NameList(candidates if keep_all else candidates[:count], stats)
     
-    def evaluate_name(self, full_name):
-        """评估名字得分"""
+    def evaluate_name(self, full_name, bazi_score=None):
+        """
+        评估名字得分
+        :param full_name: 完整姓名
+        :param bazi_score: 预先算好的八字得分（可选，批量搜索时传入）
+        """
         surname = self.surname
         name = full_name[len(surname):]
         
-        calc = WuGeCalculator(surname, name)
+        calc = WuGeCalculator(surname, name, self.lexicon)
         wuge_result = calc.calculate_all()
         
         wuge_score = 0
@@ -298,7 +521,8 @@ class NamingGenerator:
         sancai_score = sancai_result["得分"]
         
         ziyi_score = self._evaluate_meaning_and_sound(name)
-        bazi_score = self._calculate_bazi_score(name)
+        if bazi_score is None:
+            bazi_score = self._calculate_bazi_score(name)
         
         total_score = wuge_score + sancai_score + ziyi_score + bazi_score
         
@@ -317,163 +541,44 @@ class NamingGenerator:
         """评估字义和音韵"""
         score = 0
         for char in name:
-            char_info = get_character_info(char)
+            char_info = self.lexicon.get(char)
             if char_info:
                 score += char_info["常用度"]
         
         if len(name) == 2:
-            char1_info = get_character_info(name[0])
-            char2_info = get_character_info(name[1])
+            char1_info = self.lexicon.get(name[0])
+            char2_info = self.lexicon.get(name[1])
             if char1_info and char2_info:
                 if char1_info["拼音"][0] != char2_info["拼音"][0]:
                     score += 5  # 音韵差异加分，这个值较小且固定，不需要配置常量
         return min(score, Config.MAX_MEANING_SOUND_SCORE)
     
+    def _pair_bazi_score(self, affinity1, affinity2):
+        """两字亲和度 -> 八字得分（名字五行向量与需求向量的点积，按满分缩放）"""
+        if not self.need_vector:
+            return Config.BAXI_SCORE_BASE
+        return round(Config.BAXI_SCORE_MAX * (affinity1 + affinity2) / 2, 2)
+    
     def _calculate_bazi_score(self, name):
         """计算八字匹配得分"""
-        if not self.xiyongshen:
+        if not self.need_vector:
             return Config.BAXI_SCORE_BASE
         
-        wuxing_list = []
-        for char in name:
-            char_info = get_character_info(char)
-            if char_info:
-                wuxing_list.append(char_info["五行"])
-        
-        if not wuxing_list: return 0
+        infos = [self.lexicon.get(char) for char in name]
+        infos = [info for info in infos if info]
+        if not infos: return 0
         
-        if len(self.xiyongshen) == 2:
-            match_count = sum(1 for wx in wuxing_list if wx in self.xiyongshen)
-            unique_matches = len(set(wx for wx in wuxing_list if wx in self.xiyongshen))
-            if unique_matches == 2: return Config.BAXI_SCORE_TWO_MATCH
-            if match_count >= 1: return Config.BAXI_SCORE_ONE_MATCH
-        else:
-            match_count = sum(1 for wx in wuxing_list if wx in self.xiyongshen)
-            if match_count == 2: return Config.BAXI_SCORE_TWO_MATCH
-            if match_count == 1: return Config.BAXI_SCORE_ONE_MATCH
-            
-        return 0
+        return round(Config.BAXI_SCORE_MAX * sum(self._char_affinity(info) for info in infos) / len(infos), 2)
     
     def format_result(self, name_data, rank):
         """格式化输出"""
-        full_name = name_data["姓名"]
-        name_only = name_data["名字"]
-        score_data = name_data["评分"]
-        culture_analysis = name_data.get("文化解析", "暂无文化解析。")
-        
-        output = []
-        output.append(f"\n{'='*60}")
-        output.append(f"推荐名字 {rank}：{full_name}（综合评分：{score_data['总分']}分）")
-        output.append(f"{'='*60}")
-        
-        # 显示八字信息（如果有）
-        if self.bazi_analysis:
-            output.append(f"【八字信息】{self.bazi_analysis['八字字符串']}")
-            output.append(f"【日主五行】{self.bazi_analysis['日主']}（{self.bazi_analysis['日主五行']}）")
-            output.append(f"【喜用神】{', '.join(self.xiyongshen) if self.xiyongshen else '未指定'}")
-        
-        output.append("\n【五格分析】得分：{}".format(score_data["五格得分"]))
-        wuge_details = score_data["五格详情"]
-        for ge_name in ["天格", "人格", "地格", "总格", "外格"]:
-            ge_info = wuge_details[ge_name]
-            luck_symbol = "✓" if ge_info["吉凶"] == "吉" else "✗"
-            output.append(f"  {ge_name}：{ge_info['数值']}（{ge_info['五行']}）- {ge_info['吉凶']} {luck_symbol}")
-        
-        output.append("\n【三才配置】得分：{}".format(score_data["三才得分"]))
-        sancai_info = score_data["三才详情"]
-        output.append(f"  {sancai_info['三才']} - {sancai_info['评价']}")
-        
-        output.append("\n【八字匹配】得分：{}".format(score_data["八字得分"]))
-        if self.xiyongshen:
-            output.append(f"  喜用神匹配度：{score_data['八字得分']}/10分")
-        
-        output.append("\n【文化深度解析】")
-        output.append(culture_analysis)
-        
-        return "\n".join(output)
-
-
-def _get_xiyongshen_input(birthdate):
-    """
-    获取喜用神输入（提取重复逻辑）
-    :param birthdate: 出生日期对象或None
-    :return: 喜用神列表
-    """
-    xiyongshen = []
+        return "\n".join(self.result_lines(name_data, rank))
     
-    if birthdate:
-        use_auto = input("是否根据八字自动计算喜用神？(y/n，默认y)：").strip().lower()
-        if use_auto != 'n':
-            # 自动计算，返回空列表，让NamingGenerator自动计算
-            return []
-        else:
-            # 手动输入
-            print("\n提示：支持五行（金、木、水、火、土），最多输入2个，空格分隔。")
-            xiyongshen_str = input("请输入喜用神（可选）：").strip()
-            xiyongshen = xiyongshen_str.split() if xiyongshen_str else []
-    else:
-        print("\n提示：支持五行（金、木、水、火、土），最多输入2个，空格分隔。")
-        xiyongshen_str = input("请输入喜用神（可选）：").strip()
-        xiyongshen = xiyongshen_str.split() if xiyongshen_str else []
-    
-    return xiyongshen
-
-
-def main():
-    print("=" * 60)
-    print("三才五格智能取名系统 V3.2 (八字增强版)")
-    print("=" * 60)
+    def result_lines(self, name_data, rank):
+        """逐行产出单个结果的报告文本（供 format_result 和流式报告写入使用）"""
+        return render_result(self, name_data, rank)
     
-    surname = input("\n请输入姓氏：").strip()
-    if not surname: return
-    
-    gender = input("请输入性别（男/女）：").strip()
-    if gender not in ["男", "女"]: return
-    
-    # 新增：输入出生日期
-    birthdate_str = input("\n请输入出生日期（YYYY-MM-DD，可选）：").strip()
-    birthdate = None
-    if birthdate_str:
-        try:
-            year, month, day = map(int, birthdate_str.split('-'))
-            birthdate = datetime.date(year, month, day)
-        except:
-            print("日期格式错误，将跳过八字分析")
-    
-    # 使用提取的函数获取喜用神输入
-    xiyongshen = _get_xiyongshen_input(birthdate)
-    
-    count = input("\n请输入生成名字数量（默认 5）：").strip()
-    count = int(count) if count.isdigit() else 5
-    
-    generator = NamingGenerator(surname, gender, birthdate=birthdate, xiyongshen=xiyongshen)
-    results = generator.generate_names(count)
-    
-    if not results:
-        print("\n抱歉，未能生成符合条件的名字。")
-        print("建议：1. 降低分数要求 2. 减少喜用神限制 3. 扩充字库")
-        return
-    
-    for i, name_data in enumerate(results, 1):
-        print(generator.format_result(name_data, i))
-    
-    save_option = input("\n\n是否保存结果到文件？(y/n): ").strip().lower()
-    if save_option == 'y':
-        filename = f"取名结果_{surname}{gender}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"三才五格智能取名系统 V3.2 八字增强版报告\n")
-            f.write(f"姓氏：{surname} 性别：{gender}\n")
-            if birthdate:
-                f.write(f"出生日期：{birthdate_str}\n")
-            if generator.bazi_analysis:
-                f.write(f"八字：{generator.bazi_analysis['八字字符串']}\n")
-                f.write(f"日主：{generator.bazi_analysis['日主']}（{generator.bazi_analysis['日主五行']}）\n")
-                f.write(f"喜用神：{', '.join(generator.xiyongshen) if generator.xiyongshen else '未指定'}\n")
-            f.write("\n")
-            for i, name_data in enumerate(results, 1):
-                f.write(generator.format_result(name_data, i) + "\n")
-        print(f"\n结果已保存到：{filename}")
-
-
-if __name__ == "__main__":
-    main()
+    @property
+    def baxi_score_max(self):
+        """八字满分（报告渲染用）"""
+        return Config.BAXI_SCORE_MAX
@@ -0,0 +1,512 @@
+# -*- coding: utf-8 -*-
+"""
+取名 HTTP 服务模块
+常驻进程提供 JSON 接口，字库索引、81数理表、三才表、诗词语料及各级缓存在请求间保持预热；
+耗时的搜索、评分在工作线程池中执行，HTTP 线程只负责收发。仅依赖标准库，无需外部服务。
+请求参数先规范化，规范化后相同的并发请求合并为一次执行（single-flight），其余请求等待其结果。
+搜索按候选池大小估算成本，分到廉价/昂贵两条通道执行，昂贵通道繁忙时降级、已满时返回 503（见 admission.py）；
+通道只限制并发数，同一进程内的两条通道共用 GIL，CPU 隔离依靠多进程模式。
+多进程模式下父进程预热并冻结堆后 fork 出工作进程，共享同一监听套接字和只读内存页（见 prefork.py）；
+批处理模式同样在预热、冻结后 fork 进程池，逐行处理 JSON Lines 请求。
+
+接口（请求与响应均为 JSON）：
+    POST /generate  {"surname": "李", "gender": "男", "birthdate": "2024-03-15 08:30",
+                     "birthplace": "成都", "xiyongshen": ["金", "水"], "count": 5,
+                     "zibei": "思", "zibei_position": 0}
+                    -> {"results": [...], "bazi": {...} 或 null, "xiyongshen": [...], "baxi_score_max": 八字满分,
+                        "next_cursor": "..." 或 null,
+                        "stats": 搜索统计（各阶段字数、组合数与耗时，见 search_stats.py）}
+                    可选 "seed"（洗牌种子，默认由查询参数确定，相同请求得到相同结果）；
+                    翻页时同样的参数加上 "cursor": 上一页的 next_cursor，count 为每页数量，
+                    续取同一份排序结果（见 result_pager.py）
+                    已在客户端算好八字时可改传 "bazi_analysis"（BaZiCalculator.analyze_bazi 的结果）与 "xiyongshen"，
+                    服务端不再重算
+    POST /evaluate  {"surname": "李", "gender": "男", "name": "沐书", ...（同上八字参数）}
+                    -> {"result": {...}, "bazi": ..., "xiyongshen": [...]}
+    POST /bazi      {"birthdate": "农历2023-闰02-15 08:30", "birthplace": "成都"} -> {"bazi": {...}}
+    GET  /health    -> {"status": "ok", ...}
+    参数错误返回 400 {"error": "..."}；服务繁忙返回 503（带 Retry-After）
+    生成、评估、八字响应另含 "admission": {"lane": 通道, "cost": 估算成本, "degraded": 是否降级}
+
+用法：
+    python naming_service.py --port 8080 --workers 4
+    python naming_service.py --port 8080 --processes 8
+    python naming_service.py --batch requests.jsonl --processes 8 > responses.jsonl
+        （每行一个请求，{"endpoint": "generate", "surname": "李", ...}，输出按输入顺序）
+    curl -d '{"surname": "李", "gender": "男", "count": 3}' http://127.0.0.1:8080/generate
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from admission import AdmissionController, Overloaded
+from bazi_calculator import BaZiCalculator
+from lexicon import get_default_lexicon
+from lunar_calendar import parse_lunar_date, lunar_to_solar, split_date_time
+from naming_generator import NamingGenerator, Config
+from poem_corpus import get_default_corpus
+from prefork import freeze_heap, run_workers, memory_usage
+from result_pager import ResultPager
+from single_flight import SingleFlight
+from solar_time import resolve_longitude
+
+WU_XING = ("金", "木", "水", "火", "土")
+# 客户端传入八字分析结果时须包含的字段
+BAZI_KEYS = ("八字", "八字字符串", "日主", "日主五行", "推荐喜用神", "五行需求")
+
+
+class ServiceConfig:
+    """服务配置常量"""
+    HOST = "127.0.0.1"
+    PORT = 8080
+    WORKERS = os.cpu_count() or 4   # 搜索工作线程数
+    MAX_COUNT = 50                  # 单次最多生成名字数
+    MAX_BODY = 64 * 1024            # 请求体上限（字节）
+    DEGRADED_COUNT = 5              # 降级时最多生成名字数
+    DEGRADED_SEARCH = 1000          # 降级时的搜索次数上限（近似结果）
+    ENDPOINT_COST = {"evaluate": 2, "bazi": 1}   # 评估、八字接口的固定成本
+
+
+def parse_birthdate(text):
+    """
+    解析出生日期
+    :param text: "YYYY-MM-DD" 或 "YYYY-MM-DD HH:MM"，农历写作 "农历YYYY-MM-DD"（闰月如 "农历2023-闰02-15"）
+    :return: datetime.datetime（未给出生时间时为中午12点）
+    """
+    date_part, time_part = split_date_time(text)
+    lunar = parse_lunar_date(date_part)
+    if lunar:
+        date = lunar_to_solar(*lunar)
+    else:
+        year, month, day = map(int, date_part.split("-"))
+        date = datetime.date(year, month, day)
+    if not 1900 <= date.year <= 2100:
+        raise ValueError(f"年份{date.year}超出计算范围（1900-2100）")
+    hour, minute = map(int, time_part.split(":")) if time_part else (12, 0)
+    return datetime.datetime(date.year, date.month, date.day, hour, minute)
+
+
+def _required(params, key):
+    value = params.get(key)
+    if value is None or value == "":
+        raise ValueError(f"缺少参数 {key}")
+    return value
+
+
+def _text_param(params, key):
+    """必填的文本参数（去除首尾空白后不能为空）"""
+    value = params.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"参数 {key} 应为文本")
+    value = (value or "").strip()
+    if not value:
+        raise ValueError(f"缺少参数 {key}")
+    return value
+
+
+def _int_param(params, key, default, low, high):
+    value = params.get(key, default)
+    if not isinstance(value, int) or isinstance(value, bool) or not low <= value <= high:
+        raise ValueError(f"参数 {key} 应为 {low}-{high} 的整数")
+    return value
+
+
+class NamingService:
+    """取名服务（常驻状态 + 按成本分通道的工作线程池）"""
+
+    def __init__(self, lexicon=None, workers=ServiceConfig.WORKERS, admission=None):
+        """
+        初始化
+        :param lexicon: 字库（可选，默认共享字库）
+        :param workers: 搜索工作线程数（廉价、昂贵通道各分一半，至少各1个）
+        :param admission: 准入控制器（可选，默认按 workers 创建）
+        """
+        self.lexicon = lexicon if lexicon is not None else get_default_lexicon()
+        self.workers = workers
+        self.admission = admission if admission is not None else AdmissionController(
+            cheap_workers=max(1, workers - workers // 2), expensive_workers=max(1, workers // 2))
+        self.started = time.time()
+        self.request_count = 0
+        self.error_count = 0
+        self.flight = SingleFlight()
+        self.pager = ResultPager()
+        self._lock = threading.Lock()
+
+    def warm(self, full=False):
+        """
+        预热：构建字库索引、加载诗词语料，并各走一遍评分、八字和解析路径
+        :param full: 同时生成字库中全部字的解析片段（多进程模式在 fork 前调用，让子进程共享）
+        """
+        get_default_corpus()
+        generator = NamingGenerator("李", "男", birthdate=datetime.datetime(2000, 1, 1, 12, 0),
+                                    lexicon=self.lexicon)
+        self.lexicon.select(gender="男", min_usage=Config.MIN_COMMON_USAGE)
+        self.lexicon.select(gender="女", min_usage=Config.MIN_COMMON_USAGE)
+        generator.evaluate_name("李沐书")
+        generator.ai_analyzer.analyze_name("李", "沐书", "男")
+        if full:
+            for char, _ in self.lexicon.select():
+                generator.ai_analyzer._fragment(char)
+        return self
+
+    def normalize(self, endpoint, params):
+        """
+        校验并规范化请求参数（出生日期统一为 ISO 格式，出生地统一为经度，缺省项补默认值）
+        :param endpoint: 接口名（generate / evaluate / bazi）
+        :param params: 请求参数
+        :return: 规范化参数字典（等价请求得到相同字典）
+        """
+        birthdate = params.get("birthdate")
+        if endpoint == "bazi":
+            birthdate = _required(params, "birthdate")
+        birthplace = params.get("birthplace") or None
+        longitude = resolve_longitude(birthplace)
+        if birthplace is not None and longitude is None:
+            raise ValueError(f"未识别的出生地“{birthplace}”")
+        if longitude is not None and not -180 <= longitude <= 180:
+            raise ValueError("参数 birthplace 的经度应在 -180 到 180 之间")
+        normalized = {
+            "birthdate": parse_birthdate(birthdate).isoformat() if birthdate else None,
+            "birthplace": longitude,
+        }
+        if endpoint == "bazi":
+            return normalized
+
+        surname = _text_param(params, "surname")
+        gender = _required(params, "gender")
+        if gender not in ("男", "女"):
+            raise ValueError("参数 gender 应为 男 或 女")
+        xiyongshen = params.get("xiyongshen") or []
+        if (not isinstance(xiyongshen, list) or len(xiyongshen) > Config.MAX_XIYONGSHEN
+                or any(elem not in WU_XING for elem in xiyongshen)):
+            raise ValueError(f"参数 xiyongshen 应为最多 {Config.MAX_XIYONGSHEN} 个五行（金木水火土）")
+        bazi_analysis = params.get("bazi_analysis") or None
+        if bazi_analysis is not None:
+            if not isinstance(bazi_analysis, dict) or any(key not in bazi_analysis for key in BAZI_KEYS):
+                raise ValueError(f"参数 bazi_analysis 应包含 {'、'.join(BAZI_KEYS)}")
+            xiyongshen = xiyongshen or list(bazi_analysis["推荐喜用神"])
+        zibei = params.get("zibei") or None
+        if zibei is not None and not (isinstance(zibei, str) and len(zibei.strip()) == 1):
+            raise ValueError("参数 zibei 应为一个汉字")
+        normalized.update(
+            surname=surname,
+            gender=gender,
+            xiyongshen=xiyongshen,
+            bazi_analysis=bazi_analysis,
+            zibei=zibei.strip() if zibei else None,
+            zibei_position=_int_param(params, "zibei_position", 0, 0, 1),
+        )
+        if endpoint == "generate":
+            normalized["count"] = _int_param(params, "count", Config.MAX_NAME_COUNT, 1, ServiceConfig.MAX_COUNT)
+            cursor = params.get("cursor") or None
+            if cursor is not None and not isinstance(cursor, str):
+                raise ValueError("参数 cursor 应为上一页返回的 next_cursor")
+            normalized["cursor"] = cursor
+            seed = params.get("seed")
+            normalized["seed"] = None if seed is None else _int_param(params, "seed", 0, 0, 2 ** 32 - 1)
+        else:
+            name = _text_param(params, "name")
+            if len(name) > 2 or any(self.lexicon.get(char) is None for char in name):
+                raise ValueError("参数 name 应为 1-2 个字库中的汉字")
+            normalized["name"] = name
+        return normalized
+
+    def _generator(self, params):
+        """按规范化参数创建生成器"""
+        birthdate = datetime.datetime.fromisoformat(params["birthdate"]) if params["birthdate"] else None
+        return NamingGenerator(params["surname"], params["gender"], birthdate=birthdate,
+                               xiyongshen=params["xiyongshen"], bazi_analysis=params["bazi_analysis"],
+                               lexicon=self.lexicon,
+                               zibei=params["zibei"], zibei_position=params["zibei_position"],
+                               birthplace=params["birthplace"], seed=params.get("seed"))
+
+    @staticmethod
+    def _context(generator):
+        return {"bazi": generator.bazi_analysis, "xiyongshen": list(generator.xiyongshen),
+                "baxi_score_max": generator.baxi_score_max}
+
+    def generate(self, params, generator=None):
+        """生成推荐名字（一页；参数须已规范化，下同；generator 为已按参数创建的生成器，可选）"""
+        generator = generator if generator is not None else self._generator(params)
+        results, next_cursor = self.pager.page(generator, params["count"], params["cursor"])
+        return dict(self._context(generator), results=results, next_cursor=next_cursor,
+                    stats=results.stats.to_dict() if results.stats else None)
+
+    def evaluate(self, params, generator=None):
+        """评估指定名字"""
+        name = params["name"]
+        generator = generator if generator is not None else self._generator(params)
+        result = {
+            "姓名": generator.surname + name,
+            "名字": name,
+            "评分": generator.evaluate_name(generator.surname + name),
+            "文化解析": generator.ai_analyzer.analyze_name(generator.surname, name, generator.gender),
+        }
+        return dict(self._context(generator), result=result)
+
+    def bazi(self, params, generator=None):
+        """八字分析"""
+        moment = datetime.datetime.fromisoformat(params["birthdate"])
+        return {"bazi": BaZiCalculator.analyze_bazi(moment.year, moment.month, moment.day,
+                                                    moment.hour, moment.minute, longitude=params["birthplace"])}
+
+    def health(self, params=None):
+        """服务状态"""
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 3),
+            "workers": self.workers,
+            "requests": self.request_count,
+            "errors": self.error_count,
+            "coalesced": self.flight.followers,
+            "pager": self.pager.stats(),
+            "admission": self.admission.stats(),
+            "lexicon_version": self.lexicon.version,
+            "corpus_version": get_default_corpus().version,
+            "memory_kb": memory_usage(),
+        }
+
+    def call(self, endpoint, params):
+        """
+        规范化参数后经准入控制在对应通道执行接口（阻塞等待结果）；
+        规范化参数相同的请求正在执行时，合并到该请求，等待其结果；通道已满时抛出 Overloaded
+        :param endpoint: 接口名（generate / evaluate / bazi）
+        :param params: 请求参数
+        :return: 响应字典（合并的请求共享同一对象，不应修改）
+        """
+        with self._lock:
+            self.request_count += 1
+        try:
+            params = self.normalize(endpoint, params)
+            key = (endpoint, json.dumps(params, ensure_ascii=False, sort_keys=True))
+            return self.flight.do(key, self._execute, endpoint, params)
+        except Exception:
+            with self._lock:
+                self.error_count += 1
+            raise
+
+    def estimate(self, endpoint, params):
+        """
+        估算请求成本（生成接口按候选池大小估算，搜索前即可得到；排序列表已缓存时只计解析成本）
+        :return: (成本, 生成器或 None)
+        """
+        if endpoint != "generate":
+            return ServiceConfig.ENDPOINT_COST[endpoint], None
+        generator = self._generator(params)
+        if self.pager.cached(generator, params["count"], params["cursor"]):
+            return generator.estimate_cost(params["count"]) - generator.estimate_cost(0), generator
+        return generator.estimate_cost(params["count"]), generator
+
+    def _execute(self, endpoint, params):
+        cost, generator = self.estimate(endpoint, params)
+        lane, degraded = self.admission.admit(cost, degradable=generator is not None)
+        if degraded:
+            # 降级：减少生成数量，收紧搜索上限（得到近似结果；续页沿用游标中首页的搜索上限）
+            params = dict(params, count=min(params["count"], ServiceConfig.DEGRADED_COUNT))
+            generator.max_search_preferred = min(generator.max_search_preferred, ServiceConfig.DEGRADED_SEARCH)
+            generator.max_search_other = min(generator.max_search_other, ServiceConfig.DEGRADED_SEARCH)
+        response = self.admission.run(lane, getattr(self, endpoint), params, generator)
+        return dict(response, admission={"lane": lane.name, "cost": cost, "degraded": degraded})
+
+    def close(self):
+        self.admission.shutdown()
+
+
+class NamingServer:
+    """取名 HTTP 服务（ThreadingHTTPServer，每连接一个线程，接口调用交给 NamingService 的执行通道）"""
+
+    ROUTES = {"/generate": "generate", "/evaluate": "evaluate", "/bazi": "bazi"}
+
+    def __init__(self, service=None, host=ServiceConfig.HOST, port=ServiceConfig.PORT):
+        """
+        初始化
+        :param service: NamingService（可选，默认新建）
+        :param host: 监听地址
+        :param port: 端口（0为自动分配）
+        """
+        self.service = service if service is not None else NamingService()
+        self._thread = None
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        service = self.service
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, status, payload, headers=None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._send_json(200, service.health())
+                else:
+                    self._send_json(404, {"error": f"未知接口 {self.path}"})
+
+            def do_POST(self):
+                endpoint = NamingServer.ROUTES.get(self.path)
+                if endpoint is None:
+                    self._send_json(404, {"error": f"未知接口 {self.path}"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", ""))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self._send_json(400, {"error": "缺少或无效的 Content-Length"})
+                    return
+                if length > ServiceConfig.MAX_BODY:
+                    self._send_json(413, {"error": "请求体过大"})
+                    return
+                try:
+                    params = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+                    if not isinstance(params, dict):
+                        raise ValueError("请求体应为 JSON 对象")
+                    payload = service.call(endpoint, params)
+                except ValueError as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+                except Overloaded as e:
+                    self._send_json(503, {"error": str(e)}, {"Retry-After": str(e.retry_after)})
+                    return
+                except Exception as e:
+                    self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+                    return
+                self._send_json(200, payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """后台线程启动服务"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# 批处理进程池中各子进程使用的服务（fork 前设置，子进程继承）
+_BATCH_SERVICE = None
+
+
+def _batch_init():
+    """批处理子进程初始化：取名过程中的提示信息改写到标准错误，标准输出只有 JSON 响应行"""
+    sys.stdout = sys.stderr
+
+
+def _batch_call(line):
+    """处理一行批处理请求，返回一行 JSON 响应（单行出错不影响其余各行）"""
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("请求应为 JSON 对象")
+        endpoint = request.pop("endpoint", "generate")
+        if endpoint not in NamingServer.ROUTES.values():
+            raise ValueError(f"未知接口 {endpoint}")
+        response = {"endpoint": endpoint, "response": _BATCH_SERVICE.call(endpoint, request)}
+    except ValueError as e:
+        response = {"error": str(e), "status": 400}
+    except Overloaded as e:
+        response = {"error": str(e), "status": 503}
+    except Exception as e:
+        response = {"error": f"{type(e).__name__}: {e}", "status": 500}
+    return json.dumps(response, ensure_ascii=False)
+
+
+def run_batch(service, lines, processes):
+    """
+    批处理：预热后的服务冻结堆再 fork 进程池，逐行处理请求
+    :param service: 已预热的 NamingService
+    :param lines: JSON Lines 请求（可迭代）
+    :param processes: 进程数
+    :return: 响应行生成器（按输入顺序）
+    """
+    global _BATCH_SERVICE
+    _BATCH_SERVICE = service
+    freeze_heap()
+    with multiprocessing.get_context("fork").Pool(processes, initializer=_batch_init) as pool:
+        yield from pool.imap(_batch_call, (line for line in lines if line.strip()))
+
+
+def serve_prefork(server, processes):
+    """
+    多进程服务：父进程已绑定套接字并预热，冻结堆后 fork 出工作进程共同 accept，父进程只负责监管
+    :param server: NamingServer（尚未启动）
+    :param processes: 工作进程数
+    """
+    frozen = freeze_heap()
+    usage = memory_usage()
+    print(f"已冻结 {frozen} 个对象" + (f"，父进程常驻内存 {usage['rss'] // 1024} MB" if usage else ""),
+          flush=True)
+    run_workers(processes, lambda index: server.server.serve_forever())
+    server.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="取名 HTTP 服务")
+    parser.add_argument("--host", default=ServiceConfig.HOST, help="监听地址")
+    parser.add_argument("--port", type=int, default=ServiceConfig.PORT, help="端口")
+    parser.add_argument("--workers", type=int, default=ServiceConfig.WORKERS, help="搜索工作线程数")
+    parser.add_argument("--processes", type=int, default=1, help="工作进程数（大于1时预派生多进程）")
+    parser.add_argument("--batch", help="批处理 JSON Lines 请求文件（- 为标准输入），结果写到标准输出")
+    args = parser.parse_args()
+
+    if args.batch:
+        # 标准输出只写 JSON 响应行，预热时的提示信息改写到标准错误
+        output, sys.stdout = sys.stdout, sys.stderr
+        service = NamingService(workers=1).warm(full=True)
+        with open(args.batch, encoding="utf-8") if args.batch != "-" else sys.stdin as f:
+            for line in run_batch(service, f, args.processes):
+                print(line, file=output, flush=True)
+        return
+
+    service = NamingService(workers=args.workers).warm(full=args.processes > 1)
+    server = NamingServer(service, args.host, args.port)
+    print(f"取名服务已启动：{server.url}（{args.processes} 个进程，每进程 {args.workers} 个工作线程）",
+          flush=True)
+    if args.processes > 1:
+        serve_prefork(server, args.processes)
+        return
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
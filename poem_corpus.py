@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+诗词语料模块
+加载诗词语料（data_poems.txt，每行：作者\t篇名\t正文），按句读切分为句，
+建立 字 -> 句号 的倒排索引，为名字检索包含其用字的诗句。
+
+句子按长度排序后编号（短句编号小），倒排表为升序 array('I')，
+检索时两字倒排表二分求交，再按相关度（命中字数多者优先，同分短句优先）取前几句。
+
+用法：
+    python poem_corpus.py search 沐书
+    python poem_corpus.py import poet.tang.0.json [--output data_poems.txt]
+"""
+
+import argparse
+import bisect
+import hashlib
+import heapq
+import json
+import os
+import re
+from array import array
+
+# 语料路径，设置后默认语料从该文件加载
+POEMS_ENV = "NAMING_POEMS"
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_poems.txt")
+
+# 句读：句子连同句末标点一起切出
+SENTENCE_RE = re.compile(r"[^。！？；]+[。！？；]?")
+
+# 不建索引的字（标点及常见虚字，命中它们的句子与名字无关）
+SKIP_CHARS = frozenset("，、：“”‘’《》（）·—…　 之乎者也而以其")
+
+
+class PoemCorpus:
+    """只读诗词语料（带字到句的倒排索引）"""
+
+    def __init__(self, poems, version=None):
+        """
+        初始化
+        :param poems: [(作者, 篇名, 正文)]
+        :param version: 语料版本号（可选，默认按内容哈希计算）
+        """
+        self.sources = []                      # 篇号 -> (作者, 篇名)
+        sentences = {}                         # 句 -> 篇号（重复句保留首次出现）
+        for author, title, text in poems:
+            poem_id = len(self.sources)
+            self.sources.append((author, title))
+            for match in SENTENCE_RE.finditer(text):
+                sentence = match.group().strip("，、 ")
+                if len(sentence) > 1:
+                    sentences.setdefault(sentence, poem_id)
+
+        # 短句在前，倒排表升序即相关度次序
+        self.lines = sorted(sentences, key=len)                                   # 句号 -> 句
+        self.line_sources = array("I", (sentences[line] for line in self.lines))  # 句号 -> 篇号
+        self.index = self._build_index()
+        self._version = version
+
+    def _build_index(self):
+        postings = {}
+        for line_id, line in enumerate(self.lines):
+            for char in set(line):
+                if char not in SKIP_CHARS:
+                    postings.setdefault(char, []).append(line_id)
+        return {char: array("I", ids) for char, ids in postings.items()}
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """
+        加载语料文件
+        :param path: 语料路径（每行：作者\t篇名\t正文，# 开头为注释）
+        :return: PoemCorpus
+        """
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        poems = []
+        for number, row in enumerate(content.splitlines(), 1):
+            if not row.strip() or row.startswith("#"):
+                continue
+            fields = row.split("\t")
+            if len(fields) != 3:
+                raise ValueError(f"{path} 第{number}行格式错误：应为 作者\\t篇名\\t正文")
+            poems.append(fields)
+        version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        return cls(poems, version=version)
+
+    @property
+    def version(self):
+        """语料版本号（用作缓存键的一部分）"""
+        if self._version is None:
+            payload = "\n".join(self.lines) + json.dumps(self.sources, ensure_ascii=False)
+            self._version = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return self._version
+
+    def __len__(self):
+        return len(self.lines)
+
+    def search(self, name, limit=5, best_only=False):
+        """
+        检索包含名字用字的诗句
+        :param name: 名（一至二字）
+        :param limit: 最多返回句数
+        :param best_only: 有同时含两字的句子时只返回这些句子
+        :return: 句号列表，按相关度排列（同时含两字者在前，同分短句在前）
+        """
+        postings = [self.index[char] for char in dict.fromkeys(name) if char in self.index]
+        if not postings:
+            return []
+        if len(postings) == 1:
+            return list(postings[0][:limit])
+
+        shorter, longer = sorted(postings, key=len)
+        both = []
+        for line_id in shorter:
+            i = bisect.bisect_left(longer, line_id)
+            if i < len(longer) and longer[i] == line_id:
+                both.append(line_id)
+                if len(both) == limit:
+                    return both
+        if both and best_only:
+            return both
+        result = list(both)
+        matched = set(both)
+        for line_id in heapq.merge(shorter, longer):
+            if line_id not in matched:
+                result.append(line_id)
+                matched.add(line_id)
+                if len(result) == limit:
+                    break
+        return result
+
+    def quote(self, line_id):
+        """格式化引文：“句。”——作者《篇名》（佚名不署作者，句末分号改为句号）"""
+        author, title = self.sources[self.line_sources[line_id]]
+        source = f"《{title}》" if author == "佚名" else f"{author}《{title}》"
+        line = self.lines[line_id]
+        if line[-1] == "；":
+            line = line[:-1] + "。"
+        return f"“{line}”——{source}"
+
+    def quotes(self, name, limit=5, best_only=False):
+        """
+        检索并格式化引文
+        :return: 引文列表（按相关度排列）
+        """
+        return [self.quote(line_id) for line_id in self.search(name, limit, best_only)]
+
+
+_DEFAULT_CORPUS = None
+
+
+def get_default_corpus():
+    """获取默认语料（NAMING_POEMS 指定的文件，未设置时为 data_poems.txt），进程内只加载一次"""
+    global _DEFAULT_CORPUS
+    if _DEFAULT_CORPUS is None:
+        _DEFAULT_CORPUS = PoemCorpus.load(os.environ.get(POEMS_ENV) or DEFAULT_PATH)
+    return _DEFAULT_CORPUS
+
+
+def import_poems(paths, output):
+    """
+    从 chinese-poetry 格式的 JSON（[{"author", "title", "paragraphs"}]）追加篇目到语料文件
+    注意：该项目唐诗宋词为繁体，须先转为简体（如 opencc t2s）再导入，否则与字库用字对不上
+    :return: 追加的篇数
+    """
+    count = 0
+    with open(output, "a", encoding="utf-8") as out:
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                poems = json.load(f)
+            for poem in poems:
+                text = "".join(poem.get("paragraphs") or poem.get("content") or [])
+                fields = [poem.get("author") or "佚名", poem.get("title") or poem.get("rhythmic") or "", text]
+                fields = [re.sub(r"\s+", "", field) for field in fields]
+                if fields[1] and fields[2]:
+                    out.write("\t".join(fields) + "\n")
+                    count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="诗词语料工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    search_parser = subparsers.add_parser("search", help="检索包含名字用字的诗句")
+    search_parser.add_argument("name", help="名")
+    search_parser.add_argument("--limit", type=int, default=5, help="最多返回句数")
+    import_parser = subparsers.add_parser("import", help="导入 chinese-poetry JSON")
+    import_parser.add_argument("paths", nargs="+", help="JSON 文件")
+    import_parser.add_argument("--output", default=DEFAULT_PATH, help="语料文件")
+    args = parser.parse_args()
+
+    if args.command == "search":
+        corpus = get_default_corpus()
+        for quote in corpus.quotes(args.name, args.limit):
+            print(quote)
+    else:
+        count = import_poems(args.paths, args.output)
+        print(f"已追加 {count} 篇到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+预派生（pre-fork）工作进程模块
+父进程先导入并构建全部只读结构（字库位图索引、81数理表、三才表、诗词语料、单字解析片段等），
+gc.freeze() 把此时的堆移出分代回收，然后 fork 出 N 个工作进程：
+子进程的垃圾回收不再触碰（写入）这些对象的 GC 头，写时复制的内存页保持父子共享，
+每个工作进程的私有内存只剩各自的请求状态和缓存。仅适用于支持 fork 的平台（Linux/macOS）。
+"""
+
+import gc
+import os
+import signal
+
+
+def freeze_heap():
+    """回收一次垃圾后冻结当前堆（之后 fork 的子进程共享这些页）"""
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def _spawn(index, target):
+    pid = os.fork()
+    if pid == 0:
+        # 子进程：恢复默认信号处理，执行完即退出（不返回父进程代码）
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 0
+        try:
+            target(index)
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def run_workers(count, target, restart=True):
+    """
+    派生工作进程并监管，直到收到 SIGTERM/SIGINT（转发给全部子进程后返回）
+    :param count: 工作进程数
+    :param target: 子进程入口 target(序号)
+    :param restart: 子进程异常退出时是否重新派生
+    """
+    workers = {_spawn(i, target): i for i in range(count)}
+    stopping = []
+
+    def stop(signum, frame):
+        # os.wait 在信号处理后会自动重试，须先让子进程退出才能返回
+        stopping.append(signum)
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    previous = {sig: signal.signal(sig, stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        while workers and not stopping:
+            try:
+                pid, status = os.wait()
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+            index = workers.pop(pid, None)
+            if index is None or stopping:
+                continue
+            if restart and os.waitstatus_to_exitcode(status) != 0:
+                print(f"工作进程 {index}（pid {pid}）异常退出，重新派生")
+                workers[_spawn(index, target)] = index
+    finally:
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in workers:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+
+def memory_usage(pid=None):
+    """
+    进程内存占用（读取 /proc，仅 Linux）
+    :param pid: 进程号（默认当前进程）
+    :return: {"rss": 常驻内存KB, "private": 私有（未与其他进程共享）内存KB}；无法读取时返回 None
+    """
+    pid = os.getpid() if pid is None else pid
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line and not line.startswith(" "))
+    except OSError:
+        return None
+    kb = {key: int(value.split()[0]) for key, value in fields.items() if value.strip().endswith("kB")}
+    return {"rss": kb.get("Rss", 0), "private": kb.get("Private_Clean", 0) + kb.get("Private_Dirty", 0)}
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+流式报告写入模块
+结果由 NamingGenerator.iter_names 逐个产出，逐行渲染写入带缓冲的文件，
+每条结果写完即刷新：报告头在生成开始前就已落盘，内存占用与结果数无关。
+渲染只用到取名上下文（姓氏、性别、八字、喜用神），本模块不导入取名流水线，
+搜索由守护进程完成时命令行以 ResultContext 代替 NamingGenerator
+"""
+
+
+class ReportConfig:
+    """报告写入配置常量"""
+    BUFFER_SIZE = 64 * 1024   # 写缓冲（字节）
+    TITLE = "三才五格智能取名系统 V3.2 八字增强版报告"
+
+
+class ReportWriter:
+    """流式报告写入器"""
+
+    def __init__(self, path, buffer_size=ReportConfig.BUFFER_SIZE):
+        """
+        初始化（打开报告文件）
+        :param path: 报告路径
+        :param buffer_size: 写缓冲大小（字节）
+        """
+        self.path = path
+        self.count = 0            # 已写入的结果数
+        self._file = open(path, "w", encoding="utf-8", buffering=buffer_size)
+
+    def write_header(self, lines):
+        """
+        写入报告头（标题之后的各行）并刷新
+        :param lines: 报告头各行
+        """
+        write = self._file.write
+        write(ReportConfig.TITLE + "\n")
+        for line in lines:
+            write(line + "\n")
+        write("\n")
+        self._file.flush()
+
+    def write_result(self, generator, name_data):
+        """
+        写入一条结果并刷新（按写入顺序编号）
+        :param generator: 生成该结果的 NamingGenerator（提供报告行）
+        :param name_data: 名字结果
+        """
+        self.count += 1
+        write = self._file.write
+        for i, line in enumerate(generator.result_lines(name_data, self.count)):
+            if i:
+                write("\n")
+            write(line)
+        write("\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResultContext:
+    """渲染结果所需的取名上下文（属性与 NamingGenerator 的同名属性一致）"""
+
+    def __init__(self, surname, gender, bazi_analysis=None, xiyongshen=(), baxi_score_max=None):
+        """
+        初始化
+        :param surname: 姓氏
+        :param gender: 性别
+        :param bazi_analysis: 八字分析结果（可选）
+        :param xiyongshen: 喜用神列表
+        :param baxi_score_max: 八字满分
+        """
+        self.surname = surname
+        self.gender = gender
+        self.bazi_analysis = bazi_analysis
+        self.xiyongshen = list(xiyongshen or [])
+        self.baxi_score_max = baxi_score_max
+        self.last_stats = None
+
+    def format_result(self, name_data, rank):
+        """格式化输出"""
+        return "\n".join(self.result_lines(name_data, rank))
+
+    def result_lines(self, name_data, rank):
+        return render_result(self, name_data, rank)
+
+
+def render_result(context, name_data, rank):
+    """
+    逐行产出单个结果的报告文本
+    :param context: 取名上下文（NamingGenerator 或 ResultContext）
+    :param name_data: 名字结果
+    :param rank: 排名
+    :return: 行生成器
+    """
+    full_name = name_data["姓名"]
+    score_data = name_data["评分"]
+    culture_analysis = name_data.get("文化解析", "暂无文化解析。")
+    
+    yield f"\n{'='*60}"
+    yield f"推荐名字 {rank}：{full_name}（综合评分：{score_data['总分']}分）"
+    yield f"{'='*60}"
+    
+    # 显示八字信息（如果有）
+    if context.bazi_analysis:
+        yield f"【八字信息】{context.bazi_analysis['八字字符串']}"
+        yield f"【日主五行】{context.bazi_analysis['日主']}（{context.bazi_analysis['日主五行']}）"
+        yield f"【喜用神】{', '.join(context.xiyongshen) if context.xiyongshen else '未指定'}"
+    
+    yield "\n【五格分析】得分：{}".format(score_data["五格得分"])
+    wuge_details = score_data["五格详情"]
+    for ge_name in ["天格", "人格", "地格", "总格", "外格"]:
+        ge_info = wuge_details[ge_name]
+        luck_symbol = "✓" if ge_info["吉凶"] == "吉" else "✗"
+        yield f"  {ge_name}：{ge_info['数值']}（{ge_info['五行']}）- {ge_info['吉凶']} {luck_symbol}"
+    
+    yield "\n【三才配置】得分：{}".format(score_data["三才得分"])
+    sancai_info = score_data["三才详情"]
+    yield f"  {sancai_info['三才']} - {sancai_info['评价']}"
+    
+    yield "\n【八字匹配】得分：{}".format(score_data["八字得分"])
+    if context.xiyongshen:
+        yield f"  喜用神匹配度：{score_data['八字得分']}/{context.baxi_score_max}分"
+    
+    yield "\n【文化深度解析】"
+    yield culture_analysis
+
+
+def report_header(generator, birthdate_str=None, lunar_label="", birthplace=None):
+    """
+    报告头各行
+    :param generator: NamingGenerator
+    :param birthdate_str: 出生日期文本（可选）
+    :param lunar_label: 农历日期标注（可选）
+    :param birthplace: 出生地（可选）
+    :return: 行列表
+    """
+    lines = [f"姓氏：{generator.surname} 性别：{generator.gender}"]
+    if birthdate_str:
+        lines.append(f"出生日期：{birthdate_str}{lunar_label}")
+    if birthplace:
+        lines.append(f"出生地：{birthplace}")
+    if generator.bazi_analysis:
+        lines.append(f"八字：{generator.bazi_analysis['八字字符串']}")
+        lines.append(f"日主：{generator.bazi_analysis['日主']}（{generator.bazi_analysis['日主五行']}）")
+        lines.append(f"喜用神：{', '.join(generator.xiyongshen) if generator.xiyongshen else '未指定'}")
+    return lines
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+结构化结果导出模块
+把评分结果逐条导出为 JSON Lines 或 CSV（含各项得分、五格数理、三才、八字上下文和文化解析），
+供下游分析直接读取，无需解析文本报告；对应的加载函数把导出文件读回为结果字典，
+可直接交给 NamingGenerator.format_result 等使用，无需重新计算。
+
+导出器与 report_writer.ReportWriter 接口相同（write_result(generator, name_data)，逐条写入并刷新）。
+"""
+
+import csv
+import json
+import os
+
+from report_writer import ReportConfig
+
+WUGE_NAMES = ("天格", "人格", "地格", "总格", "外格")
+SCORE_FIELDS = ("总分", "五格得分", "三才得分", "字义得分", "八字得分")
+# 三才详情中的“得分”与总评分的“三才得分”相同，CSV 中不重复成列
+SANCAI_FIELDS = ("三才", "天人关系", "人地关系", "评价", "详情")
+BAZI_FIELDS = ("八字字符串", "日主", "日主五行")
+
+CSV_COLUMNS = (
+    ("排名", "姓", "性别", "姓名", "名字")
+    + SCORE_FIELDS
+    + tuple(f"{ge_name}{field}" for ge_name in WUGE_NAMES for field in ("数值", "五行", "吉凶"))
+    + tuple(f"三才{field}" if field != "三才" else field for field in SANCAI_FIELDS)
+    + ("三才配置",)
+    + BAZI_FIELDS
+    + ("喜用神", "文化解析")
+)
+
+
+def _bazi_context(generator):
+    """八字上下文（未提供出生日期时为 None）"""
+    if not generator.bazi_analysis:
+        return None
+    context = {field: generator.bazi_analysis[field] for field in BAZI_FIELDS}
+    context["喜用神"] = list(generator.xiyongshen or [])
+    return context
+
+
+def _number(text):
+    """CSV 数值列还原为 int 或 float"""
+    return float(text) if "." in text else int(text)
+
+
+class _Exporter:
+    """导出器基类（逐条写入并刷新）"""
+
+    def __init__(self, path, buffer_size=ReportConfig.BUFFER_SIZE):
+        """
+        初始化（打开导出文件）
+        :param path: 导出路径
+        :param buffer_size: 写缓冲大小（字节）
+        """
+        self.path = path
+        self.count = 0            # 已写入的结果数
+        self._file = open(path, "w", encoding="utf-8", newline="", buffering=buffer_size)
+
+    def write_result(self, generator, name_data):
+        """
+        写入一条结果并刷新（按写入顺序编号）
+        :param generator: 生成该结果的 NamingGenerator（提供姓、性别和八字上下文）
+        :param name_data: 名字结果
+        """
+        self.count += 1
+        self._write(generator, name_data)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONLExporter(_Exporter):
+    """JSON Lines 导出器：每行一个结果（结构与 generate_names 的结果相同，另含排名、姓、性别、八字）"""
+
+    def _write(self, generator, name_data):
+        record = {
+            "排名": self.count,
+            "姓": generator.surname,
+            "性别": generator.gender,
+            "八字": _bazi_context(generator),
+        }
+        record.update(name_data)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CSVExporter(_Exporter):
+    """CSV 导出器：每行一个结果，嵌套得分展开为列（列见 CSV_COLUMNS）"""
+
+    def __init__(self, path, buffer_size=ReportConfig.BUFFER_SIZE):
+        super().__init__(path, buffer_size)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_COLUMNS)
+        self._file.flush()
+
+    def _write(self, generator, name_data):
+        score = name_data["评分"]
+        sancai = score["三才详情"]
+        bazi = _bazi_context(generator) or {}
+        row = [self.count, generator.surname, generator.gender, name_data["姓名"], name_data["名字"]]
+        row += [score[field] for field in SCORE_FIELDS]
+        for ge_name in WUGE_NAMES:
+            ge_info = score["五格详情"][ge_name]
+            row += [ge_info["数值"], ge_info["五行"], ge_info["吉凶"]]
+        row += [sancai[field] for field in SANCAI_FIELDS]
+        row.append(score["三才配置"])
+        row += [bazi.get(field, "") for field in BAZI_FIELDS]
+        row.append(" ".join(bazi.get("喜用神", [])))
+        row.append(name_data.get("文化解析", ""))
+        self._writer.writerow(row)
+
+
+EXPORTERS = {".jsonl": JSONLExporter, ".csv": CSVExporter}
+
+
+def open_exporter(path):
+    """按扩展名（.jsonl / .csv）创建导出器"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORTERS:
+        raise ValueError(f"不支持的导出格式：{ext}（支持 {', '.join(EXPORTERS)}）")
+    return EXPORTERS[ext](path)
+
+
+def _load_jsonl(f):
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _load_csv(f):
+    for row in csv.DictReader(f):
+        wuge_details = {
+            ge_name: {
+                "数值": int(row[f"{ge_name}数值"]),
+                "五行": row[f"{ge_name}五行"],
+                "吉凶": row[f"{ge_name}吉凶"],
+            }
+            for ge_name in WUGE_NAMES
+        }
+        score = {field: _number(row[field]) for field in SCORE_FIELDS}
+        sancai = {field: row[f"三才{field}" if field != "三才" else field] for field in SANCAI_FIELDS}
+        sancai["得分"] = score["三才得分"]
+        score.update({"五格详情": wuge_details, "三才详情": sancai, "三才配置": row["三才配置"]})
+        bazi = None
+        if row["八字字符串"]:
+            bazi = {field: row[field] for field in BAZI_FIELDS}
+            bazi["喜用神"] = row["喜用神"].split()
+        record = {
+            "排名": int(row["排名"]),
+            "姓": row["姓"],
+            "性别": row["性别"],
+            "八字": bazi,
+            "姓名": row["姓名"],
+            "名字": row["名字"],
+            "评分": score,
+        }
+        if row["文化解析"]:
+            record["文化解析"] = row["文化解析"]
+        yield record
+
+
+def load_results(path):
+    """
+    逐条读回导出的结果（按扩展名识别 JSON Lines / CSV）
+    :param path: 导出文件路径
+    :return: 结果字典生成器（含 姓名、名字、评分、文化解析，及 排名、姓、性别、八字）
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORTERS:
+        raise ValueError(f"不支持的导出格式：{ext}（支持 {', '.join(EXPORTERS)}）")
+    loader = _load_jsonl if ext == ".jsonl" else _load_csv
+    with open(path, encoding="utf-8", newline="") as f:
+        yield from loader(f)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+结果分页模块
+翻页不再以更大的 count 重新生成（重新洗牌、重新搜索，顺序也会变），而是用不透明游标续取同一份排序结果：
+首页的洗牌种子由查询摘要确定（也可由调用方指定），相同的请求共用同一份排序列表；
+首页按其数量做与 generate_names(count) 相同的搜索，保留全部达到阈值的候选（至多 Config.MAX_CANDIDATES 个）
+排序后缓存，首页的搜索代价与原先相同。
+游标记录查询摘要、种子、搜索上限、首页数量和偏移量，续页命中缓存时只切片并解析本页的名字；
+缓存未命中（已淘汰、或由另一个工作进程处理）时按同样的参数重新搜索，得到相同的排序，
+因此第 N 页的代价不超过首页，且各页之间不重复、不遗漏。
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from search_stats import NameList
+
+
+class PagerConfig:
+    """分页配置常量"""
+    CACHE_SIZE = 128          # 缓存的排序列表数
+
+
+def query_digest(generator):
+    """
+    查询摘要（决定排序结果的全部生成器参数；八字以五行需求向量体现）
+    :param generator: NamingGenerator
+    :return: 16位十六进制字符串
+    """
+    query = [generator.surname, generator.gender, list(generator.xiyongshen),
+             list(generator.need_vector) if generator.need_vector else None,
+             generator.zibei, generator.zibei_position, generator.lexicon.version]
+    payload = json.dumps(query, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(digest, seed, limits, depth, offset):
+    """编码游标（URL 安全的 base64，不含填充）"""
+    payload = json.dumps({"q": digest, "s": seed, "l": list(limits), "d": depth, "o": offset},
+                         separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    解码游标
+    :return: (查询摘要, 种子, (优先搜索上限, 其他搜索上限), 首页数量, 偏移量)
+    :raise ValueError: 游标格式错误
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(payload.decode("ascii"))
+        digest, seed, limits, depth, offset = data["q"], data["s"], tuple(data["l"]), data["d"], data["o"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise ValueError("无效的游标") from None
+    if not (isinstance(digest, str) and len(limits) == 2
+            and all(isinstance(value, int) and value >= 0 for value in (seed, offset, *limits))
+            and isinstance(depth, int) and depth > 0):
+        raise ValueError("无效的游标")
+    return digest, seed, limits, depth, offset
+
+
+class ResultPager:
+    """排序结果分页器（LRU 缓存完整排序列表，线程安全）"""
+
+    def __init__(self, capacity=PagerConfig.CACHE_SIZE):
+        """
+        初始化
+        :param capacity: 缓存的排序列表数
+        """
+        self.capacity = capacity
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _resolve(generator, size, cursor):
+        """
+        解析游标，返回 (查询摘要, 种子, 搜索上限, 首页数量, 偏移量)；
+        无游标时为首页：种子取生成器指定的种子，未指定时由查询摘要确定，
+        搜索上限取生成器当前值（降级的首页收紧了上限，续页沿用，排序不变）
+        """
+        digest = query_digest(generator)
+        if not cursor:
+            seed = generator.seed if generator.seed is not None else int(digest[:8], 16)
+            return digest, seed, (generator.max_search_preferred, generator.max_search_other), size, 0
+        cursor_digest, seed, limits, depth, offset = decode_cursor(cursor)
+        if cursor_digest != digest:
+            raise ValueError("游标与本次查询参数不符")
+        return digest, seed, limits, depth, offset
+
+    def cached(self, generator, size, cursor=None):
+        """本页对应的排序列表是否已缓存（成本估算用）"""
+        key = self._resolve(generator, size, cursor)[:4]
+        with self._lock:
+            return key in self._cache
+
+    def ranked(self, generator, digest, seed, limits, depth):
+        """
+        按种子、搜索上限和首页数量取排序列表（未缓存时搜索并缓存）
+        :return: 候选列表（尚未做文化解析，调用方不应修改）
+        """
+        key = (digest, seed, limits, depth)
+        with self._lock:
+            ranked = self._cache.get(key)
+            if ranked is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return ranked
+            self.misses += 1
+        generator.seed = seed
+        generator.max_search_preferred, generator.max_search_other = limits
+        ranked = generator.ranked_candidates(depth)
+        with self._lock:
+            self._cache[key] = ranked
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        return ranked
+
+    def page(self, generator, size, cursor=None):
+        """
+        取一页结果
+        :param generator: NamingGenerator
+        :param size: 每页数量
+        :param cursor: 上一页返回的游标（None 为首页）
+        :return: (本页名字列表（已做文化解析；NameList，stats 为排序列表的搜索统计加上本页的解析耗时）,
+                  下一页游标；没有更多结果时为 None)
+        :raise ValueError: 游标无效或与查询参数不符
+        """
+        digest, seed, limits, depth, offset = self._resolve(generator, size, cursor)
+        ranked = self.ranked(generator, digest, seed, limits, depth)
+        stats = ranked.stats.copy() if getattr(ranked, "stats", None) else None
+        # 浅拷贝，文化解析不写入缓存的候选
+        chunk = [dict(item) for item in ranked[offset:offset + size]]
+        items = NameList(generator.analyze_candidates(chunk, stats), stats)
+        end = offset + size
+        return items, (encode_cursor(digest, seed, limits, depth, end) if end < len(ranked) else None)
+
+    def stats(self):
+        with self._lock:
+            return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
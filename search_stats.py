@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+搜索统计模块
+记录一次候选搜索各阶段的计数与耗时：性别、常用度过滤后的字数，首字分组与截断，
+考察、跳过（同字、喜用神配对）、评分、达到阈值的组合数，各搜索阶段的结束状态与提前结束的原因，以及各阶段耗时。
+搜索循环中只累加局部整数，结束后一次写入，几乎不增加开销；
+结果以 NameList（带 stats 属性的列表）返回，可转为字典导出（to_dict / from_dict）。
+"""
+
+import contextlib
+import copy
+import time
+
+
+class SearchStats:
+    """一次候选搜索的分阶段计数与计时"""
+
+    COUNTERS = (
+        "gender_pool",          # 符合性别的字数
+        "usage_pool",           # 再经常用度过滤后的字数
+        "first_preferred",      # 首字中属喜用神的字数（截断前）
+        "first_other",          # 首字中其他字数（截断前）
+        "first_searched",       # 两组截断后实际参与搜索的首字数
+        "second_pool",          # 次字候选数
+        "considered",           # 考察的组合数
+        "skipped_same_char",    # 两字相同跳过
+        "skipped_xiyongshen",   # 喜用神配对不符跳过
+        "scored",               # 评分的组合数
+        "passed",               # 达到分数阈值的组合数
+    )
+
+    # 提前结束的原因
+    STOP_REASONS = {
+        "no_chars": "性别、常用度过滤后没有可用的字",
+        "zibei_missing": "字辈不在字库中",
+        "candidates": "候选数已满",
+        "search_preferred": "优先搜索达到次数上限",
+        "search_other": "其他搜索达到次数上限",
+        "enough": "优先搜索已得到足够候选，未搜索其他字",
+    }
+
+    # 搜索阶段（优先搜索 / 其他搜索）的结束状态
+    PHASE_STATES = {
+        "exhausted": "搜完",
+        "no_first": "未执行（该组没有首字）",
+        "candidates": "候选数已满",
+        "search_limit": "达到次数上限",
+        "enough": "未执行（已得到足够候选）",
+        "no_budget": "未执行（搜索次数已用完）",
+    }
+
+    def __init__(self):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.threshold = None        # 分数阈值
+        self.best_score = None       # 评分最高的组合得分
+        self.stopped_by = None       # 提前结束的原因（STOP_REASONS 的键；各阶段均搜完为 None）
+        self.phases = {}             # 搜索阶段 -> 结束状态（PHASE_STATES 的键；未进入搜索时为空）
+        self.timings = {}            # 阶段 -> 耗时（秒）
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """计时一个阶段（同名阶段累加）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def copy(self):
+        """副本（计时独立，如在缓存的搜索统计上追加某一页的解析耗时）"""
+        stats = copy.copy(self)
+        stats.timings = dict(self.timings)
+        stats.phases = dict(self.phases)
+        return stats
+
+    def to_dict(self):
+        """转为可 JSON 序列化的字典（耗时以毫秒计）"""
+        data = {name: getattr(self, name) for name in self.COUNTERS}
+        data.update(threshold=self.threshold, best_score=self.best_score, stopped_by=self.stopped_by,
+                    phases=dict(self.phases),
+                    timings_ms={name: round(seconds * 1000, 3) for name, seconds in self.timings.items()})
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """由 to_dict 的结果还原"""
+        stats = cls()
+        for name in cls.COUNTERS:
+            setattr(stats, name, data.get(name, 0))
+        stats.threshold = data.get("threshold")
+        stats.best_score = data.get("best_score")
+        stats.stopped_by = data.get("stopped_by")
+        stats.phases = dict(data.get("phases") or {})
+        stats.timings = {name: ms / 1000 for name, ms in (data.get("timings_ms") or {}).items()}
+        return stats
+
+    def diagnose(self):
+        """
+        推断没有结果（或结果偏少）的原因
+        :return: 原因说明列表（按过滤顺序）
+        """
+        reasons = []
+        if self.gender_pool == 0:
+            reasons.append("字库中没有符合性别的字")
+        elif self.usage_pool == 0:
+            reasons.append(f"符合性别的 {self.gender_pool} 个字常用度均不足")
+        if self.stopped_by == "zibei_missing":
+            reasons.append(self.STOP_REASONS["zibei_missing"])
+        if self.considered and self.scored == 0:
+            if self.skipped_xiyongshen:
+                reasons.append(f"喜用神配对过滤掉了全部 {self.skipped_xiyongshen} 个组合")
+            else:
+                reasons.append("没有可评分的组合")
+        if self.scored and self.passed == 0:
+            reasons.append(f"评分的 {self.scored} 个组合均未达到阈值 {self.threshold} 分（最高 {self.best_score} 分）")
+        if self.stopped_by in ("search_preferred", "search_other"):
+            reasons.append(f"{self.STOP_REASONS[self.stopped_by]}（已评分 {self.scored} 个组合）")
+        return reasons
+
+    def lines(self):
+        """逐行可读的统计"""
+        yield f"字库过滤：符合性别 {self.gender_pool} 字，常用度过滤后 {self.usage_pool} 字"
+        yield (f"首字：喜用神 {self.first_preferred} 字，其他 {self.first_other} 字，"
+               f"截断后搜索 {self.first_searched} 字；次字 {self.second_pool} 字")
+        yield (f"组合：考察 {self.considered}，同字跳过 {self.skipped_same_char}，"
+               f"喜用神配对跳过 {self.skipped_xiyongshen}，评分 {self.scored}，"
+               f"达到阈值（{self.threshold} 分）{self.passed}")
+        if self.phases:
+            yield "搜索阶段：" + "；".join(f"{name}{self.PHASE_STATES[state]}" for name, state in self.phases.items())
+        yield f"结束原因：{self.STOP_REASONS.get(self.stopped_by, '候选字已搜完')}"
+        if self.timings:
+            yield "耗时：" + "，".join(f"{name} {seconds * 1000:.1f} 毫秒" for name, seconds in self.timings.items())
+
+
+class NameList(list):
+    """名字列表，附带生成时的搜索统计（stats）"""
+
+    def __init__(self, items=(), stats=None):
+        super().__init__(items)
+        self.stats = stats
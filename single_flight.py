@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+请求合并模块（single-flight）
+同一键的调用在进行中时，后到的调用不再重复执行，而是等待进行中那次（leader）的结果；
+leader 完成后该键即释放，之后的调用重新执行。结果对象由 leader 和所有 follower 共享，调用方不应修改。
+"""
+
+import threading
+
+
+class _Call:
+    """进行中的一次调用"""
+
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """按键合并并发的相同调用（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0      # 实际执行的次数
+        self.followers = 0    # 合并掉（等待 leader 结果）的次数
+
+    def do(self, key, fn, *args):
+        """
+        执行调用（同一键已有调用进行中时等待其结果）
+        :param key: 合并键（须可哈希，相同键代表等价的调用）
+        :param fn: 调用函数
+        :return: fn(*args) 的结果；leader 抛出的异常同样抛给所有 follower
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.followers += 1
+                self.followers += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """进行中的键数"""
+        with self._lock:
+            return len(self._calls)
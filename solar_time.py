@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+真太阳时校正模块
+将北京时间（东经120度标准时）按出生地经度和均时差换算为真太阳时，
+用于确定时柱（及跨零点时的日柱）。全部为查表计算，不做实时天文计算
+"""
+
+import datetime
+
+from data_cities import CITY_LONGITUDES
+from data_eot import EOT_SECONDS
+
+STANDARD_MERIDIAN = 120.0   # 北京时间所用的标准经线
+LEAP_YEAR = 2000            # 均时差表按闰年日历排列
+
+
+def resolve_longitude(birthplace):
+    """
+    解析出生地
+    :param birthplace: 经度（数字或数字字符串），或城市名（如"成都"、"成都市"）
+    :return: 东经度数；无法识别返回 None
+    """
+    if birthplace is None or birthplace == "":
+        return None
+    if isinstance(birthplace, (int, float)):
+        return float(birthplace)
+    text = str(birthplace).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if text in CITY_LONGITUDES:
+        return CITY_LONGITUDES[text]
+    for suffix in ("市", "县", "区"):
+        if text.endswith(suffix) and text[:-1] in CITY_LONGITUDES:
+            return CITY_LONGITUDES[text[:-1]]
+    return None
+
+
+def equation_of_time(month, day):
+    """
+    查表获取均时差
+    :return: 均时差（秒）
+    """
+    return EOT_SECONDS[datetime.date(LEAP_YEAR, month, day).timetuple().tm_yday - 1]
+
+
+def true_solar_time(moment, longitude):
+    """
+    北京时间换算为真太阳时
+    真太阳时 = 北京时间 + (经度 - 120) × 4分钟 + 均时差
+    :param moment: 北京时间（datetime.datetime）
+    :param longitude: 出生地东经度数
+    :return: 真太阳时（datetime.datetime）
+    """
+    offset = (longitude - STANDARD_MERIDIAN) * 240 + equation_of_time(moment.month, moment.day)
+    return moment + datetime.timedelta(seconds=round(offset))
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+八字计算测试脚本
+"""
+
+import datetime
+import os
+import tempfile
+
+from bazi_atlas import BaZiAtlas
+from bazi_calculator import BaZiCalculator
+from lunar_calendar import format_lunar, lunar_to_solar, parse_lunar_date, solar_to_lunar, split_date_time
+from naming_generator import NamingGenerator
+from solar_time import equation_of_time, resolve_longitude, true_solar_time
+
+
+def test_jieqi_pillars():
+    """测试以节气为界的年柱、月柱"""
+    print("=" * 60)
+    print("节气年柱/月柱测试")
+    print("=" * 60)
+
+    cases = [
+        # (年, 月, 日, 时, 分), 年柱, 月柱
+        ((2024, 2, 4, 16, 26), "癸卯", "乙丑"),   # 2024年立春 16:27 之前
+        ((2024, 2, 4, 16, 27), "甲辰", "丙寅"),   # 立春之后
+        ((2024, 1, 15, 12, 0), "癸卯", "乙丑"),   # 公历新年但未过立春
+        ((2024, 3, 5, 10, 0), "甲辰", "丙寅"),    # 惊蛰 10:23 之前
+        ((2024, 3, 5, 11, 0), "甲辰", "丁卯"),
+        ((2000, 6, 1, 8, 0), "庚辰", "辛巳"),
+        ((1900, 1, 1, 12, 0), "己亥", "丙子"),
+        ((2100, 12, 31, 12, 0), "庚申", "戊子"),
+    ]
+    for args, year_pillar, month_pillar in cases:
+        bazi = BaZiCalculator.calculate_bazi(*args)
+        print(f"{args}：{bazi['年柱']} {bazi['月柱']}")
+        assert bazi["年柱"] == year_pillar
+        assert bazi["月柱"] == month_pillar
+
+    # 仅给出年份时，按该年立春之后计算
+    assert BaZiCalculator.calculate_year_pillar(2024) == ("甲", "辰")
+
+    try:
+        BaZiCalculator.calculate_bazi(1899, 11, 1)
+        assert False, "超出节气表范围应抛出 ValueError"
+    except ValueError as e:
+        print(f"范围检查：{e}")
+
+
+def test_day_pillar():
+    """测试儒略日数日柱（单日与批量）"""
+    print("=" * 60)
+    print("日柱测试")
+    print("=" * 60)
+
+    # 参考日期
+    references = {
+        (1900, 1, 1): ("甲", "戌"),
+        (1949, 10, 1): ("甲", "子"),
+        (2000, 1, 1): ("戊", "午"),
+        (2024, 2, 4): ("戊", "戌"),
+    }
+    for (year, month, day), expected in references.items():
+        pillar = BaZiCalculator.calculate_day_pillar(year, month, day)
+        print(f"{year}-{month:02d}-{day:02d}：{''.join(pillar)}")
+        assert pillar == expected
+
+    # 参考六十甲子周期：2000-01-07 为甲子日，此后60天依次为六十甲子，第61天回到甲子
+    start = datetime.date(2000, 1, 7)
+    pillars = BaZiCalculator.calculate_day_pillars(start, start + datetime.timedelta(days=60))
+    assert [(gan, zhi) for _, gan, zhi in pillars[:60]] == BaZiCalculator.JIA_ZI
+    assert pillars[60][1:] == ("甲", "子")
+
+    # 批量结果与单日计算一致（跨闰年、跨世纪）
+    start, end = datetime.date(1999, 12, 1), datetime.date(2001, 3, 31)
+    for date, gan, zhi in BaZiCalculator.calculate_day_pillars(start, end):
+        assert (gan, zhi) == BaZiCalculator.calculate_day_pillar(date.year, date.month, date.day)
+    assert len(BaZiCalculator.day_ganzhi_indices(end, start)) == 0
+    print("批量日柱与单日计算一致")
+
+
+def test_analyze_cache_and_atlas():
+    """测试八字分析缓存与图谱查表"""
+    print("=" * 60)
+    print("八字缓存与图谱测试")
+    print("=" * 60)
+
+    # 同一时辰内的不同小时命中同一缓存项，返回值互不影响
+    BaZiCalculator.clear_cache()
+    first = BaZiCalculator.analyze_bazi(2024, 5, 20, 9)
+    first["推荐喜用神"].append("篡改")
+    second = BaZiCalculator.analyze_bazi(2024, 5, 20, 10)
+    assert "篡改" not in second["推荐喜用神"]
+    assert BaZiCalculator._analyze_cached.cache_info().hits == 1
+
+    # 交节时辰内按分钟区分
+    assert (BaZiCalculator.analyze_bazi(2024, 2, 4, 16, 0)["八字"]["月柱"]
+            != BaZiCalculator.analyze_bazi(2024, 2, 4, 16, 30)["八字"]["月柱"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "atlas.bin")
+        BaZiAtlas.build(path, datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))
+        expected = [BaZiCalculator.analyze_bazi(2024, month, day, hour, minute)
+                    for month, day, hour, minute in [(1, 6, 5, 0), (2, 4, 16, 0), (2, 4, 16, 30),
+                                                     (3, 1, 23, 30), (3, 31, 0, 10)]]
+        # 立春前后带经度：真太阳时校正把时刻移到交节之后的时辰，年柱、月柱仍按北京时间
+        with_longitude = [BaZiCalculator.analyze_bazi(2024, 2, 4, hour, minute, longitude=87.6)
+                          for hour, minute in [(16, 10), (16, 40), (18, 30)]]
+        assert with_longitude[1]["八字字符串"] == "甲辰 丙寅 戊戌 己未"
+        BaZiCalculator.load_atlas(path)
+        try:
+            atlas = BaZiCalculator._atlas
+            assert atlas.lookup(2024, 2, 4, 8) is None           # 立春 16:27 落在申时内
+            assert atlas.lookup(2024, 4, 1, 0) is None           # 超出图谱范围
+            assert atlas.lookup(2024, 3, 1, 6) == BaZiCalculator._analyze(
+                2024, 3, 1, 6, BaZiCalculator._jie_sequence(2024, 3, 1, 12))
+            actual = [BaZiCalculator.analyze_bazi(2024, month, day, hour, minute)
+                      for month, day, hour, minute in [(1, 6, 5, 0), (2, 4, 16, 0), (2, 4, 16, 30),
+                                                       (3, 1, 23, 30), (3, 31, 0, 10)]]
+            assert actual == expected
+            BaZiCalculator.clear_cache()
+            assert [BaZiCalculator.analyze_bazi(2024, 2, 4, hour, minute, longitude=87.6)
+                    for hour, minute in [(16, 10), (16, 40), (18, 30)]] == with_longitude
+            print(f"图谱查表结果与实时计算一致（{len(actual)} 例）")
+        finally:
+            BaZiCalculator.load_atlas(None)
+
+
+def test_wuxing_strength():
+    """测试月令加权的五行强度与确定性的喜用神推荐"""
+    print("=" * 60)
+    print("五行强度测试")
+    print("=" * 60)
+
+    # 寅月木旺、火相、水休、金囚、土死
+    assert BaZiCalculator.SEASON_COEFFICIENTS["寅"] == (1.5, 1.2, 0.6, 0.8, 1.0)
+    assert BaZiCalculator.ZHI_VECTORS["丑"] == (0.0, 0.0, 1.0, 0.3, 0.5)
+
+    result = BaZiCalculator.analyze_bazi(2024, 1, 15, 12)
+    print(f"{result['八字字符串']}：{result['五行统计']} → {result['推荐喜用神']}，需求 {result['五行需求']}")
+    # 癸卯 乙丑 戊寅 戊午，丑月土旺
+    assert result["五行统计"] == {"木": 2.4, "火": 1.5, "土": 5.7, "金": 0.36, "水": 0.9}
+    assert result["推荐喜用神"] == ["金", "水"]
+    assert len(result["五行需求"]) == 5 and abs(sum(result["五行需求"]) - 1) < 0.01
+    assert result["五行需求"][2] == 0          # 最旺的土没有需求
+
+    # 同样的五行强度总是得到同样的推荐（并列时按木火土金水先后）
+    tied = {"木": 1.0, "火": 3.0, "土": 3.0, "金": 1.0, "水": 3.0}
+    assert BaZiCalculator.recommend_xiyongshen(tied) == ["木", "金"]
+    assert BaZiCalculator.recommend_xiyongshen(dict(reversed(tied.items()))) == ["木", "金"]
+
+
+def test_true_solar_time():
+    """测试真太阳时校正"""
+    print("=" * 60)
+    print("真太阳时测试")
+    print("=" * 60)
+
+    assert resolve_longitude("成都市") == resolve_longitude("成都") == 104.07
+    assert resolve_longitude("116.5") == 116.5
+    assert resolve_longitude("不存在的地方") is None
+
+    # 均时差：2月中旬约 -14 分钟，11月初约 +16 分钟
+    assert -15 * 60 < equation_of_time(2, 12) < -14 * 60
+    assert 16 * 60 < equation_of_time(11, 3) < 17 * 60
+
+    # 乌鲁木齐（东经87.62度）比北京时间晚约2小时10分
+    solar = true_solar_time(datetime.datetime(2024, 11, 3, 0, 30), 87.62)
+    print(f"乌鲁木齐 2024-11-03 00:30 → 真太阳时 {solar}")
+    assert solar.date() == datetime.date(2024, 11, 2) and solar.hour == 22
+
+    plain = BaZiCalculator.analyze_bazi(2024, 11, 3, 0, 30)
+    corrected = BaZiCalculator.analyze_bazi(2024, 11, 3, 0, 30, longitude=87.62)
+    print(f"北京时间：{plain['八字字符串']}；真太阳时：{corrected['八字字符串']}")
+    assert corrected["八字"]["时支"] == "亥"
+    assert corrected["八字"]["日柱"] == "".join(BaZiCalculator.calculate_day_pillar(2024, 11, 2))
+    assert corrected["八字"]["月柱"] == plain["八字"]["月柱"]
+
+    # 东部城市在时辰边界附近：上海 08:55 北京时间仍为辰时，真太阳时进入巳时
+    assert BaZiCalculator.calculate_bazi(2024, 11, 3, 8, 55)["时支"] == "辰"
+    assert BaZiCalculator.calculate_bazi(2024, 11, 3, 8, 55, longitude=121.47)["时支"] == "巳"
+
+
+def test_lunar_calendar():
+    """测试农历公历互转"""
+    print("=" * 60)
+    print("农历换算测试")
+    print("=" * 60)
+
+    # 正月初一
+    assert lunar_to_solar(1900, 1, 1) == datetime.date(1900, 1, 31)
+    assert lunar_to_solar(2024, 1, 1) == datetime.date(2024, 2, 10)
+    assert lunar_to_solar(2100, 1, 1) == datetime.date(2100, 2, 9)
+
+    # 闰月：2023年闰二月、2033年闰十一月
+    assert lunar_to_solar(2023, 2, 1, is_leap=True) == datetime.date(2023, 3, 22)
+    assert solar_to_lunar(datetime.date(2023, 4, 5)) == (2023, 2, 15, True)
+    assert lunar_to_solar(2033, 11, 1, is_leap=True) == datetime.date(2033, 12, 22)
+    assert format_lunar(2023, 2, 15, True) == "农历2023年闰二月十五"
+    try:
+        lunar_to_solar(2024, 2, 1, is_leap=True)
+        assert False, "2024年没有闰二月"
+    except ValueError:
+        pass
+
+    # 除夕与往返换算
+    assert solar_to_lunar(datetime.date(2024, 2, 9)) == (2023, 12, 30, False)
+    day = datetime.date(1999, 12, 31)
+    for _ in range(800):
+        assert lunar_to_solar(*solar_to_lunar(day)) == day
+        day += datetime.timedelta(days=37)
+
+    assert parse_lunar_date("农历2023-闰02-15") == (2023, 2, 15, True)
+    assert parse_lunar_date("农历2024年1月15日") == (2024, 1, 15, False)
+    assert parse_lunar_date("2024-01-15") is None
+
+    # 农历出生日期用于八字分析
+    generator = NamingGenerator("张", "男", birthdate="农历2023-闰02-15 08:30")
+    solar = BaZiCalculator.analyze_bazi(2023, 4, 5, 8, 30)
+    print(f"农历2023-闰02-15 08:30 → {generator.bazi_analysis['八字字符串']}")
+    assert generator.bazi_analysis["八字字符串"] == solar["八字字符串"]
+    
+    # “农历”后带空格同样识别为农历（不把空格当作日期与时间的分隔）
+    assert split_date_time("农历 2024-01-15") == ("农历 2024-01-15", "")
+    assert split_date_time(" 农历 2023-闰02-15  08:30 ") == ("农历 2023-闰02-15", "08:30")
+    assert split_date_time("2024-01-15 08:30") == ("2024-01-15", "08:30")
+    spaced = NamingGenerator("张", "男", birthdate="农历 2024-01-15")
+    plain = NamingGenerator("张", "男", birthdate="农历2024-01-15")
+    assert spaced.bazi_analysis and spaced.bazi_analysis["八字字符串"] == plain.bazi_analysis["八字字符串"]
+    spaced = NamingGenerator("张", "男", birthdate="农历 2023-闰02-15 08:30")
+    assert spaced.bazi_analysis["八字字符串"] == solar["八字字符串"]
+
+
+if __name__ == "__main__":
+    test_jieqi_pillars()
+    test_day_pillar()
+    test_analyze_cache_and_atlas()
+    test_wuxing_strength()
+    test_true_solar_time()
+    test_lunar_calendar()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+字库索引与覆盖层测试脚本
+"""
+
+import json
+import os
+import tempfile
+
+from data_characters import CHARACTERS
+from expand_characters import build_all_characters, export_sources
+from lexicon_build import build_lexicon, validate_records
+from lexicon import Lexicon, LexiconOverlay, get_default_lexicon
+from naming_generator import NamingGenerator, Config
+
+
+def test_lexicon():
+    """测试字库位图索引与覆盖层"""
+    print("=" * 60)
+    print("字库索引与覆盖层测试")
+    print("=" * 60)
+
+    base = get_default_lexicon()
+
+    # 测试1：位图筛选与直接遍历结果一致
+    print("\n【测试1】位图索引筛选")
+    expected = [c for c, info in CHARACTERS.items()
+                if "女" in info["性别"] and info["常用度"] >= 4 and info["五行"] in ["金", "水"]]
+    selected = [c for c, _ in base.select(gender="女", min_usage=4, wuxing=["金", "水"])]
+    assert selected == expected
+    print(f"女、常用度>=4、金水：{len(selected)} 字")
+
+    # 测试2：覆盖层（禁用、新增、覆盖）
+    print("\n【测试2】覆盖层")
+    overlay = LexiconOverlay(
+        base,
+        add={
+            "昀": {"笔画": 8, "五行": "火", "拼音": "yun", "性别": ["男", "女"], "字义": "日光", "常用度": 4},
+            "晨": dict(CHARACTERS["晨"], 五行="水"),
+        },
+        banned=["书", "瑞"],
+    )
+    chars = [c for c, _ in overlay.select(gender="男", min_usage=Config.MIN_COMMON_USAGE)]
+    assert "书" not in chars and "瑞" not in chars
+    assert "昀" in chars and chars.count("晨") == 1
+    assert overlay.get("晨")["五行"] == "水"
+    assert overlay.get("书") is not None             # 禁用字仍可查询笔画
+    assert CHARACTERS["晨"]["五行"] == "火"           # 基础字库不被修改
+    shui = [c for c, _ in overlay.select(wuxing="水")]
+    assert "晨" in shui and "昀" not in shui
+    print(f"覆盖层可选男用字：{len(chars)} 字（基础字库未被修改）")
+
+    # 测试3：覆盖层叠加
+    nested = LexiconOverlay(overlay, banned=["昀"])
+    assert "昀" not in [c for c, _ in nested.select()]
+    assert nested.get("晨")["五行"] == "水"
+
+    # 测试4：字辈与禁用字参与取名
+    print("\n【测试4】字辈取名")
+    generator = NamingGenerator("李", "男", lexicon=overlay, zibei="昀")
+    results = generator.generate_names(5)
+    for item in results:
+        assert item["名字"][0] == "昀"
+        assert "书" not in item["名字"] and "瑞" not in item["名字"]
+        print(f"{item['姓名']} - {item['评分']['总分']}分")
+    assert results
+
+    # 测试5：自定义字库
+    small = Lexicon({c: CHARACTERS[c] for c in ["李", "晨", "书"]})
+    assert [c for c, _ in small.select(stroke=CHARACTERS["晨"]["笔画"])] == ["晨"]
+
+    print("\n" + "=" * 60)
+    print("测试完成！")
+    print("=" * 60)
+
+
+def test_lexicon_build():
+    """测试字库增量构建"""
+    print("=" * 60)
+    print("字库增量构建测试")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = export_sources(os.path.join(tmp, "src"))
+        output = os.path.join(tmp, "build")
+
+        manifest1 = build_lexicon(sources, output)
+        assert manifest1["rebuilt"] == sources
+        assert manifest1["count"] == len(build_all_characters())
+        print(f"首次构建：版本 {manifest1['lexicon_version']}，{manifest1['count']} 字")
+
+        manifest2 = build_lexicon(sources, output)
+        assert manifest2["rebuilt"] == []
+        assert manifest2["lexicon_version"] == manifest1["lexicon_version"]
+
+        with open(sources[-1], "a", encoding="utf-8") as f:
+            f.write("昀,8,火,yun,男/女,日光,4\n")
+        manifest3 = build_lexicon(sources, output)
+        assert manifest3["rebuilt"] == [sources[-1]]
+        assert manifest3["lexicon_version"] != manifest1["lexicon_version"]
+        print(f"增量构建：仅重建 {manifest3['rebuilt']}")
+
+        # 校验：来源间冲突、缺失字段、非法性别
+        bad_source = os.path.join(tmp, "src", "bad.csv")
+        with open(bad_source, "w", encoding="utf-8") as f:
+            f.write("字,笔画,五行,拼音,性别,字义,常用度\n")
+            f.write("昀,9,火,yun,男/女,日光,4\n")       # 与前一来源笔画冲突
+            f.write("琛,12,金,chen,男/其他,珍宝,4\n")   # 非法性别标签
+            f.write("珂,9,金,ke,女,,4\n")               # 缺失字义
+        manifest4 = build_lexicon(sources + [bad_source], output)
+        assert manifest4["rebuilt"] == [bad_source]
+        assert not manifest4["validation"]["ok"]
+        with open(os.path.join(output, "validation_report.json"), encoding="utf-8") as f:
+            report = json.load(f)
+        conflicts = {c["字"]: c for c in report["conflicts"]}
+        assert conflicts["昀"]["fields"] == ["笔画"]
+        assert conflicts["昀"]["locations"][1] == {"source": bad_source, "line": 2}
+        assert {(e["字"], e["field"]) for e in report["errors"]} == {("琛", "性别"), ("珂", "字义")}
+        print(f"校验报告：错误 {report['error_count']}，冲突 {report['conflict_count']}")
+        build_lexicon(sources, output)
+
+        lexicon = Lexicon.load(output)
+        assert lexicon.version == manifest3["lexicon_version"]
+        assert lexicon.get("昀")["性别"] == ["男", "女"]
+        expected = [c for c, info in lexicon.characters.items()
+                    if "女" in info["性别"] and info["五行"] == "火" and info["常用度"] >= 3]
+        assert [c for c, _ in lexicon.select(gender="女", min_usage=3, wuxing="火")] == expected
+
+    # 内置字表合并时的冲突也能被检出
+    report = validate_records([
+        ("a", 1, "晨", {"笔画": 11, "五行": "金", "拼音": "chen", "性别": ["男", "女"], "字义": "早晨", "常用度": 5}),
+        ("b", 1, "晨", {"笔画": 11, "五行": "火", "拼音": "chen", "性别": ["男", "女"], "字义": "早晨", "常用度": 5}),
+    ])
+    assert report["conflict_count"] == 1 and report["conflicts"][0]["fields"] == ["五行"]
+
+    print("\n" + "=" * 60)
+    print("测试完成！")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_lexicon()
+    test_lexicon_build()
@@ -5,6 +5,7 @@
 
 from naming_generator import NamingGenerator
 import datetime
+import time
 
 def test_naming():
     """测试取名功能"""
@@ -78,5 +79,385 @@ def test_naming():
     print("测试完成！")
     print("=" * 60)
 
+def test_due_date_window():
+    """测试预产期窗口取名"""
+    from bazi_calculator import BaZiCalculator
+    from due_date_planner import group_window_by_xiyongshen, plan_due_date_window
+    print("=" * 60)
+    print("预产期窗口取名测试")
+    print("=" * 60)
+    
+    start, end = datetime.date(2024, 5, 1), datetime.date(2024, 5, 21)
+    groups = group_window_by_xiyongshen(start, end)
+    assert sum(len(slots) for slots in groups.values()) == 21 * 12
+    assert len(groups) < 21
+    
+    plan = plan_due_date_window("李", "男", start, end, count=2)
+    assert len(plan) == len(groups)
+    for group in plan:
+        print(f"喜用神 {group['喜用神']}：{len(group['日期'])} 天，{len(group['名字'])} 个名字")
+        for item in group["名字"]:
+            assert item["适用日期"] == [d.isoformat() for d in group["日期"]]
+    print(f"{(end - start).days + 1} 天窗口共 {len(plan)} 个喜用神分组")
+    
+    # 同一组喜用神不因先后顺序（金水 / 水金）分成两组、重复搜索
+    groups = group_window_by_xiyongshen(datetime.date(2024, 5, 1), datetime.date(2024, 5, 28))
+    assert ("金", "水") in groups and ("水", "金") not in groups
+    assert len({frozenset(key) for key in groups}) == len(groups) == 6
+    
+    # 分组按组内平均的五行需求评分：只含一个时辰的组与按该时刻直接取名的排序相同
+    day = datetime.date(2024, 5, 8)
+    plan = plan_due_date_window("李", "男", day, day, count=3, seed=7)
+    single = next(group for group in plan if len(group["时辰"]) == 1)
+    (_, shichen), = single["时辰"]
+    direct = NamingGenerator("李", "男", birthdate=datetime.datetime(2024, 5, 8, shichen * 2), seed=7)
+    assert single["五行需求"] == direct.need_vector
+    assert [item["姓名"] for item in single["名字"]] == [item["姓名"] for item in direct.generate_names(3)]
+    for group in plan:
+        needs = [BaZiCalculator.analyze_bazi(2024, 5, 8, s * 2)["五行需求"] for _, s in group["时辰"]]
+        assert group["五行需求"] == tuple(round(sum(c) / len(needs), 3) for c in zip(*needs))
+
+def test_bazi_affinity_score():
+    """测试按五行需求向量连续计分的八字得分"""
+    print("=" * 60)
+    print("八字亲和度评分测试")
+    print("=" * 60)
+    
+    # 手动指定的喜用神按所列五行均分
+    manual = NamingGenerator("张", "男", xiyongshen=["金", "水"])
+    assert manual.need_vector == (0.0, 0.0, 0.0, 0.5, 0.5)
+    assert manual._calculate_bazi_score("鑫") == 10
+    assert manual._calculate_bazi_score("鑫林") == 5
+    
+    # 八字推荐的喜用神使用其五行需求：更缺的五行得分更高
+    auto = NamingGenerator("王", "女", birthdate=datetime.date(2024, 1, 15))
+    assert auto.need_vector == auto.bazi_analysis["五行需求"]
+    scores = {wuxing: auto._char_affinity({"五行": wuxing}) for wuxing in "木火土金水"}
+    print(f"喜用神：{auto.xiyongshen}，单字亲和度：{scores}")
+    assert scores[auto.xiyongshen[0]] == 1.0
+    assert 0 < scores[auto.xiyongshen[1]] < 1
+    
+    # 批量搜索传入的预计算得分与单独评估一致
+    for item in auto.generate_names(5):
+        assert item["评分"] == auto.evaluate_name(item["姓名"])
+    
+    assert NamingGenerator("李", "男")._calculate_bazi_score("明") == 5
+
+def test_analyzer_fragment_cache():
+    """测试文化解析的单字片段按字、字义、五行缓存，覆盖层共用基础字库的片段"""
+    from ai_analyzer import AIAnalyzer, FRAGMENT_CACHE_SIZE, _build_fragment
+    from lexicon import LexiconOverlay, get_default_lexicon
+    print("=" * 60)
+    print("文化解析片段缓存测试")
+    print("=" * 60)
+    
+    base = get_default_lexicon()
+    analyzer = AIAnalyzer(base)
+    text = analyzer.analyze_name("李", "沐书", "男")
+    print(text)
+    assert "“沐”字寓意" in text
+    base_fragment = analyzer._fragment("沐")
+    
+    # 覆盖层改了字义，不会用到基础字库的片段
+    info = dict(base.get("沐"), 字义="测试字义")
+    overlay = LexiconOverlay(base, add={"沐": info})
+    fragment = AIAnalyzer(overlay)._fragment("沐")
+    assert fragment[0] == "“沐”字寓意测试字义"
+    assert base_fragment[0] != fragment[0]
+    
+    # 每个请求各自的覆盖层（版本各不相同）共用未改动字的片段，缓存条目有上限
+    size = _build_fragment.cache_info().currsize
+    for i in range(20):
+        AIAnalyzer(LexiconOverlay(base, banned={"书"}, add={"丨": dict(info, 字义=f"字义{i % 2}")})
+                   ).analyze_name("李", "沐书", "男")
+    assert AIAnalyzer(LexiconOverlay(base, banned={"书"}))._fragment("沐") is base_fragment
+    assert _build_fragment.cache_info().currsize <= size + 2
+    assert _build_fragment.cache_info().maxsize == FRAGMENT_CACHE_SIZE
+    
+    # 字库中没有的字
+    assert "丨" not in base
+    assert "“丨”字象征美好" in AIAnalyzer(base).analyze_name("李", "丨", "男")
+
+def test_analyzer_deterministic():
+    """测试文化解析可复现（按姓名、性别、字库版本、种子确定）"""
+    from ai_analyzer import AIAnalyzer, clear_fragment_cache, _cached_analysis
+    print("=" * 60)
+    print("文化解析可复现测试")
+    print("=" * 60)
+    
+    clear_fragment_cache()
+    first = AIAnalyzer().analyze_name("李", "沐书", "男")
+    assert AIAnalyzer().analyze_name("李", "沐书", "男") == first
+    assert _cached_analysis.cache_info().hits == 1
+    
+    # 换种子可能换措辞，但同一种子总是相同
+    texts = {AIAnalyzer(seed=seed).analyze_name("李", "沐书", "男") for seed in range(20)}
+    print(f"20 个种子得到 {len(texts)} 种措辞")
+    assert len(texts) > 1
+    assert AIAnalyzer().analyze_name("李", "沐书", "男", seed=3) == AIAnalyzer(seed=3).analyze_name("李", "沐书", "男")
+    
+    # 生成结果中的解析与单独解析一致
+    generator = NamingGenerator("张", "男", xiyongshen=["金", "水"])
+    for item in generator.generate_names(3):
+        assert item["文化解析"] == AIAnalyzer().analyze_name("张", item["名字"], "男")
+
+def test_async_analysis_backend():
+    """测试异步分批模型解析：批大小、并发限制、超时回退"""
+    from ai_backend import AsyncAnalyzer, HTTPBackend, StubModelServer
+    print("=" * 60)
+    print("模型解析后端测试")
+    print("=" * 60)
+    
+    items = [("李", name, "男") for name in ["沐书", "子涵", "浩然", "思远", "明轩", "嘉树", "一诺"]]
+    with StubModelServer(delay=0.05) as stub:
+        analyzer = AsyncAnalyzer(HTTPBackend(stub.url), batch_size=2, concurrency=2, timeout=2)
+        analyses = analyzer.analyze_many_sync(items)
+        assert len(analyses) == len(items)
+        assert all(text.startswith(StubModelServer.PREFIX) for text in analyses)
+        assert "李沐书" in analyses[0] and "李一诺" in analyses[-1]
+        print(f"批大小：{stub.batch_sizes}，最大并发：{stub.max_in_flight}")
+        assert sorted(stub.batch_sizes) == [1, 2, 2, 2]
+        assert stub.max_in_flight <= 2
+        
+        # 生成名字时并发解析
+        generator = NamingGenerator("张", "男", xiyongshen=["金", "水"], analysis_backend=HTTPBackend(stub.url))
+        results = generator.generate_names(3)
+        assert results and all(item["文化解析"].startswith(StubModelServer.PREFIX) for item in results)
+    
+    # 服务太慢：超时后回退到模板解析
+    with StubModelServer(delay=0.6) as stub:
+        slow = AsyncAnalyzer(HTTPBackend(stub.url), batch_size=4, timeout=0.2)
+        start = time.perf_counter()
+        analyses = slow.analyze_many_sync(items[:3])
+        elapsed = time.perf_counter() - start
+        # 超时即返回，不等待慢请求
+        assert elapsed < 0.2 + 0.15, f"超时回退耗时 {elapsed:.2f} 秒"
+        assert analyses == [slow.fallback.analyze_name(*item) for item in items[:3]]
+        assert slow.fallback_count == 3
+    
+    # 响应格式错误：同样回退到模板解析，不抛出异常
+    with StubModelServer() as stub:
+        analyzer = AsyncAnalyzer(HTTPBackend(stub.url), batch_size=4, timeout=2)
+        for body in (["文本"], "文本", {"analyses": [1, 2]}, {"analyses": "文本"}, {"result": []}):
+            stub.body = body
+            analyses = analyzer.analyze_many_sync(items[:2])
+            assert analyses == [analyzer.fallback.analyze_name(*item) for item in items[:2]], body
+        assert analyzer.fallback_count == 10
+
+def test_poem_corpus():
+    """测试诗词语料倒排索引检索及解析引文"""
+    from ai_analyzer import AIAnalyzer
+    from poem_corpus import PoemCorpus, get_default_corpus
+    import time
+    print("=" * 60)
+    print("诗词语料检索测试")
+    print("=" * 60)
+    
+    corpus = PoemCorpus([
+        ("甲", "一", "明月松间照，清泉石上流。"),
+        ("乙", "二", "床前明月光；疑是地上霜。"),
+        ("丙", "三", "海上生明月，天涯共此时。举头望明月。"),
+    ])
+    # 同时含两字的句子在前，同分短句在前
+    assert [corpus.lines[i] for i in corpus.search("明泉")] == [
+        "明月松间照，清泉石上流。", "床前明月光；", "举头望明月。", "海上生明月，天涯共此时。"]
+    assert corpus.quotes("明泉", best_only=True) == ["“明月松间照，清泉石上流。”——甲《一》"]
+    assert corpus.quotes("床") == ["“床前明月光。”——乙《二》"]
+    assert corpus.quotes("霜") == ["“疑是地上霜。”——乙《二》"]
+    assert corpus.search("鑫") == []
+    
+    corpus = get_default_corpus()
+    names = ["沐书", "浩然", "明月", "子涵", "思远", "雨桐"]
+    for name in names:
+        for line_id in corpus.search(name):
+            assert set(name) & set(corpus.lines[line_id])
+    assert "浩然" in corpus.lines[corpus.search("浩然", best_only=True)[0]]
+    start = time.perf_counter()
+    for _ in range(100):
+        for name in names:
+            corpus.quotes(name)
+    per_name = (time.perf_counter() - start) / (100 * len(names))
+    print(f"语料 {len(corpus)} 句，每个名字检索 {per_name * 1e6:.1f} 微秒")
+    assert per_name < 0.001
+    
+    # 解析引用含名中用字的诗句
+    analysis = AIAnalyzer().analyze_name("王", "浩然", "男")
+    print(analysis)
+    assert "“我善养吾浩然之气。”——孟子《孟子》" in analysis
+
+def test_report_writer():
+    """测试流式报告写入（逐条写入并刷新，与一次性格式化结果一致）"""
+    from report_writer import ReportWriter, report_header
+    import inspect
+    import os
+    import tempfile
+    print("=" * 60)
+    print("流式报告写入测试")
+    print("=" * 60)
+    
+    generator = NamingGenerator("周", "男", birthdate=datetime.date(2024, 3, 15))
+    names = generator.iter_names(4)
+    assert inspect.isgenerator(names)
+    
+    path = os.path.join(tempfile.mkdtemp(), "report.txt")
+    results = []
+    with ReportWriter(path) as report:
+        report.write_header(report_header(generator, "2024-03-15"))
+        with open(path, encoding="utf-8") as f:
+            assert f.read().startswith("三才五格智能取名系统 V3.2 八字增强版报告\n姓氏：周 性别：男\n出生日期：2024-03-15\n八字：")
+        for name_data in names:
+            report.write_result(generator, name_data)
+            results.append(name_data)
+            # 每条写完即已落盘
+            with open(path, encoding="utf-8") as f:
+                assert f.read().endswith(name_data["文化解析"] + "\n")
+    assert report.count == len(results) == 4
+    
+    with open(path, encoding="utf-8") as f:
+        body = f.read().split("\n\n", 1)[1]
+    assert body == "".join(generator.format_result(item, i) + "\n" for i, item in enumerate(results, 1))
+    print(f"已写入 {report.count} 条结果")
+
+def test_result_export():
+    """测试 JSONL / CSV 导出与读回"""
+    from result_export import open_exporter, load_results
+    import os
+    import tempfile
+    print("=" * 60)
+    print("结构化导出测试")
+    print("=" * 60)
+    
+    directory = tempfile.mkdtemp()
+    for generator in (NamingGenerator("周", "男", birthdate=datetime.date(2024, 3, 15)),
+                      NamingGenerator("李", "女", xiyongshen=["木"])):
+        results = generator.generate_names(3)
+        for ext in (".jsonl", ".csv"):
+            path = os.path.join(directory, generator.surname + ext)
+            with open_exporter(path) as exporter:
+                for name_data in results:
+                    exporter.write_result(generator, name_data)
+            loaded = list(load_results(path))
+            assert [record["排名"] for record in loaded] == [1, 2, 3]
+            for record, name_data in zip(loaded, results):
+                assert {key: record[key] for key in name_data} == name_data
+                assert record["姓"] == generator.surname and record["性别"] == generator.gender
+                if generator.bazi_analysis:
+                    assert record["八字"]["八字字符串"] == generator.bazi_analysis["八字字符串"]
+                    assert record["八字"]["喜用神"] == generator.xiyongshen
+                else:
+                    assert record["八字"] is None
+            # 读回的结果可直接格式化
+            assert generator.format_result(loaded[0], 1) == generator.format_result(results[0], 1)
+            print(f"{os.path.basename(path)}：{len(loaded)} 条结果读回一致")
+
+
+def test_benchmark():
+    """测试基准：字库子集、测量结果结构与回退比较"""
+    from benchmark import compare, result_key, run_benchmarks, sample_names, subset_lexicon
+    import copy
+    import json
+    print("=" * 60)
+    print("性能基准测试")
+    print("=" * 60)
+    
+    small = subset_lexicon(0.25, keep="李王张")
+    assert 0 < len(small) < 80 and "李" in small
+    assert len(sample_names(small)) == 50 and all(char in small for name in sample_names(small) for char in name)
+    
+    report = run_benchmarks(sizes=(0.25,), repeat=1, only="sancai")
+    report = json.loads(json.dumps(report, ensure_ascii=False))
+    assert report["meta"]["repeat"] == 1 and report["meta"]["lexicon_version"]
+    (result,) = report["results"]
+    assert result_key(result) == f"sancai.analyze_sancai[]@{len(small)}"
+    assert 0 < result["best_us"] <= result["median_us"] and result["ops"] >= 125
+    print(f"三才分析：{result['best_us']} 微秒/次")
+    
+    slower = copy.deepcopy(report)
+    slower["results"][0]["best_us"] *= 1.5
+    assert compare(report, slower)[0][-1] is True
+    assert compare(report, report)[0][-1] is False
+    assert compare(report, {"results": []}) == []
+
+
+
+def test_search_stats():
+    """测试搜索的分阶段统计与无结果时的原因推断"""
+    from lexicon import Lexicon, get_default_lexicon
+    from search_stats import SearchStats
+    import json
+    print("=" * 60)
+    print("搜索统计测试")
+    print("=" * 60)
+    
+    generator = NamingGenerator("张", "男", xiyongshen=["木"], seed=7)
+    results = generator.generate_names(5)
+    stats = results.stats
+    assert stats is generator.last_stats and len(results) == 5
+    assert stats.usage_pool <= stats.gender_pool and stats.second_pool == stats.usage_pool
+    assert stats.first_preferred + stats.first_other == stats.usage_pool
+    assert stats.considered == stats.skipped_same_char + stats.skipped_xiyongshen + stats.scored
+    assert len(results) <= stats.passed <= stats.scored
+    assert stats.best_score == results[0]["评分"]["总分"]
+    assert {"筛选", "优先搜索", "排序", "文化解析"} <= set(stats.timings)
+    for line in stats.lines():
+        print(line)
+    
+    # 可导出为 JSON 并还原
+    data = json.loads(json.dumps(stats.to_dict(), ensure_ascii=False))
+    restored = SearchStats.from_dict(data)
+    # 耗时行按毫秒四舍五入，还原后的微秒精度可能使末位不同，只比较其余各行
+    assert restored.to_dict() == data and list(restored.lines())[:-1] == list(stats.lines())[:-1]
+    
+    # 结束原因按阶段记录：优先搜索达到上限后其他搜索未执行，不报告为“搜完”
+    assert stats.phases == {"优先搜索": "search_limit", "其他搜索": "enough"}
+    assert stats.stopped_by == "search_preferred"
+    # 优先搜索搜完且候选已够：其他搜索未执行，结束原因不是“候选字已搜完”
+    generator = NamingGenerator("李", "男", xiyongshen=["金"], zibei="思", seed=7)
+    stats = generator.generate_names(5).stats
+    assert stats.phases == {"优先搜索": "exhausted", "其他搜索": "enough"} and stats.stopped_by == "enough"
+    assert not any("候选字已搜完" in line for line in stats.lines())
+    # 未指定喜用神：优先搜索没有首字，不计为搜完
+    stats = NamingGenerator("张", "男", seed=7).generate_names(5).stats
+    assert stats.phases == {"优先搜索": "no_first", "其他搜索": "search_limit"}
+    
+    # 无结果：字库中没有符合性别的字
+    base = get_default_lexicon()
+    girls_only = Lexicon({char: base.get(char) for char in base if base.get(char)["性别"] == ["女"]})
+    empty = NamingGenerator("李", "男", lexicon=girls_only).generate_names(3)
+    assert not empty and empty.stats.gender_pool == 0 and empty.stats.stopped_by == "no_chars"
+    assert "没有符合性别" in empty.stats.diagnose()[0]
+    
+    # 无结果：字辈不在字库中
+    empty = NamingGenerator("李", "男", zibei="龘").generate_names(3)
+    assert empty.stats.diagnose() == [SearchStats.STOP_REASONS["zibei_missing"]]
+    
+    # 无结果：评分均未达到阈值，且搜索次数达到上限
+    from naming_generator import Config
+    generator = NamingGenerator("李", "女", xiyongshen=["金"], seed=7)
+    generator.max_search_preferred = generator.max_search_other = 30
+    threshold = Config.SCORE_THRESHOLD_WITH_XIYONGSHEN
+    Config.SCORE_THRESHOLD_WITH_XIYONGSHEN = 1000
+    try:
+        empty = generator.generate_names(3)
+    finally:
+        Config.SCORE_THRESHOLD_WITH_XIYONGSHEN = threshold
+    stats = empty.stats
+    assert not empty and stats.scored == 30 and stats.passed == 0 and stats.stopped_by == "search_preferred"
+    assert stats.phases == {"优先搜索": "search_limit", "其他搜索": "no_budget"}
+    reasons = stats.diagnose()
+    assert "未达到阈值 1000 分" in reasons[0] and "次数上限" in reasons[1]
+    print("；".join(reasons))
+
+
 if __name__ == "__main__":
     test_naming()
+    test_due_date_window()
+    test_bazi_affinity_score()
+    test_analyzer_fragment_cache()
+    test_analyzer_deterministic()
+    test_async_analysis_backend()
+    test_poem_corpus()
+    test_report_writer()
+    test_result_export()
+    test_benchmark()
+    test_search_stats()
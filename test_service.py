@@ -0,0 +1,499 @@
+# -*- coding: utf-8 -*-
+"""
+取名服务测试
+"""
+
+import http.client
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from admission import AdmissionConfig, AdmissionController, Overloaded
+from lexicon import LexiconOverlay, get_default_lexicon
+from naming_daemon import DaemonClient, DaemonError, NamingDaemon, forward
+from naming_generator import NamingGenerator
+import naming_service
+from naming_service import NamingServer, NamingService, ServiceConfig, parse_birthdate
+from result_pager import ResultPager, decode_cursor, encode_cursor
+from single_flight import SingleFlight
+
+
+def _post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                                     headers={"Content-Type": "application/json; charset=utf-8"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read().decode("utf-8"))
+
+
+def test_naming_service():
+    """测试 HTTP 服务各接口"""
+    print("=" * 60)
+    print("取名服务测试")
+    print("=" * 60)
+    
+    assert parse_birthdate("2024-03-15").hour == 12
+    assert parse_birthdate("农历2023-闰02-15 08:30").isoformat() == "2023-04-05T08:30:00"
+    assert parse_birthdate("农历 2023-闰02-15 08:30").isoformat() == "2023-04-05T08:30:00"
+    
+    with NamingServer(NamingService(workers=2).warm(), port=0) as server:
+        with urllib.request.urlopen(server.url + "/health", timeout=5) as response:
+            health = json.loads(response.read().decode("utf-8"))
+        assert health["status"] == "ok" and health["workers"] == 2
+        
+        status, payload = _post(server.url + "/generate",
+                                {"surname": "李", "gender": "男", "birthdate": "2024-03-15 08:30", "count": 3})
+        assert status == 200
+        assert len(payload["results"]) == 3
+        assert payload["bazi"]["八字字符串"] and payload["xiyongshen"] == payload["bazi"]["推荐喜用神"]
+        print("生成：", [item["姓名"] for item in payload["results"]])
+        
+        # 预热后的请求不再付出冷启动代价
+        start = time.perf_counter()
+        status, payload = _post(server.url + "/evaluate",
+                                {"surname": "李", "gender": "男", "name": "沐书", "xiyongshen": ["木", "水"]})
+        elapsed = time.perf_counter() - start
+        assert status == 200 and payload["result"]["姓名"] == "李沐书"
+        assert payload["result"]["评分"]["总分"] > 0 and payload["bazi"] is None
+        print(f"评估：李沐书 {payload['result']['评分']['总分']} 分（{elapsed * 1000:.1f} 毫秒）")
+        
+        status, payload = _post(server.url + "/bazi", {"birthdate": "2024-03-15 08:30", "birthplace": "成都"})
+        assert status == 200 and len(payload["bazi"]["八字字符串"].split()) == 4
+        
+        # 参数错误
+        assert _post(server.url + "/generate", {"surname": "李", "gender": "中"})[0] == 400
+        assert _post(server.url + "/generate", {"surname": "李", "gender": "男", "count": 0})[0] == 400
+        assert _post(server.url + "/bazi", {"birthdate": "2024-02-30"})[0] == 400
+        assert _post(server.url + "/bazi", {"birthdate": "2024-03-15", "birthplace": "火星"})[0] == 400
+        assert _post(server.url + "/unknown", {})[0] == 404
+        
+        with urllib.request.urlopen(server.url + "/health", timeout=5) as response:
+            health = json.loads(response.read().decode("utf-8"))
+        assert health["requests"] == 7 and health["errors"] == 4
+        
+        # 类型、范围不合法的参数与请求头同样返回 400，而非 500
+        assert _post(server.url + "/generate", {"surname": "李", "gender": "男", "zibei": 5})[0] == 400
+        assert _post(server.url + "/generate", {"surname": "李", "gender": "男", "zibei": ["思"]})[0] == 400
+        assert _post(server.url + "/bazi", {"birthdate": "2024-03-15", "birthplace": 1e9})[0] == 400
+        assert _post(server.url + "/bazi", {"birthdate": "2024-03-15", "birthplace": "nan"})[0] == 400
+        # 空白的姓氏、名字，以及超长或字库中没有的名字
+        evaluate = {"surname": "李", "gender": "男", "name": "沐书"}
+        for override in ({"name": " "}, {"surname": "  "}, {"name": "沐书书"}, {"name": "A"},
+                         {"name": "沐\U00020000"}, {"name": 5}):
+            status, payload = _post(server.url + "/evaluate", dict(evaluate, **override))
+            assert status == 400, (override, payload)
+        assert _post(server.url + "/evaluate", dict(evaluate, name=" 沐 "))[1]["result"]["姓名"] == "李沐"
+        for length in (None, "abc", "-1"):
+            connection = http.client.HTTPConnection(*server.server.server_address[:2], timeout=5)
+            connection.putrequest("POST", "/bazi")
+            if length is not None:
+                connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == 400, length
+            assert "Content-Length" in json.loads(response.read().decode("utf-8"))["error"]
+            connection.close()
+
+
+def test_single_flight():
+    """测试相同并发请求合并为一次执行"""
+    print("=" * 60)
+    print("请求合并测试")
+    print("=" * 60)
+    
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+    
+    def slow(value):
+        calls.append(value)
+        release.wait(5)
+        if value == "bad":
+            raise ValueError(value)
+        return [value]
+    
+    results, errors = [], []
+    
+    def worker(value):
+        try:
+            results.append(flight.do(value, slow, value))
+        except ValueError as e:
+            errors.append(str(e))
+    
+    threads = [threading.Thread(target=worker, args=(value,)) for value in ["a"] * 5 + ["bad"] * 3]
+    for thread in threads:
+        thread.start()
+    while flight.followers < 6:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert sorted(calls) == ["a", "bad"]
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert errors == ["bad"] * 3
+    assert flight.leaders == 2 and flight.in_flight() == 0
+    # 完成后同一键重新执行
+    release.set()
+    flight.do("a", slow, "a")
+    assert calls.count("a") == 2
+    
+    # 服务：规范化后相同的并发请求（日期写法、参数顺序不同）只执行一次搜索
+    service = NamingService(workers=4).warm()
+    requests = [{"surname": "王", "gender": "女", "birthdate": "2024-03-15", "count": 5},
+                {"count": 5, "gender": "女", "surname": " 王", "birthdate": "2024-3-15 12:00"}] * 4
+    barrier = threading.Barrier(len(requests))
+    responses = []
+    
+    def client(params):
+        barrier.wait()
+        responses.append(service.call("generate", params))
+    
+    threads = [threading.Thread(target=client, args=(params,)) for params in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service.close()
+    print(f"{len(requests)} 个请求执行 {service.flight.leaders} 次，合并 {service.flight.followers} 次")
+    assert service.flight.followers > 0
+    assert service.flight.leaders + service.flight.followers == len(requests)
+    names = {tuple(item["姓名"] for item in response["results"]) for response in responses}
+    assert len(names) <= service.flight.leaders
+
+def test_prefork_service():
+    """测试预派生多进程服务与批处理（子进程共享父进程冻结的只读内存）"""
+    print("=" * 60)
+    print("预派生多进程测试")
+    print("=" * 60)
+    
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "naming_service.py")
+    process = subprocess.Popen([sys.executable, script, "--port", "0", "--processes", "2", "--workers", "2"],
+                               stdout=subprocess.PIPE, text=True, encoding="utf-8")
+    try:
+        url = None
+        while url is None:
+            line = process.stdout.readline()
+            assert line, "服务未能启动"
+            if "http://" in line:
+                url = "http://" + line.split("http://", 1)[1].split("（", 1)[0]
+        status, payload = _post(url + "/generate", {"surname": "李", "gender": "女", "count": 3})
+        assert status == 200 and len(payload["results"]) == 3
+        
+        pids = set()
+        for _ in range(20):
+            with urllib.request.urlopen(url + "/health", timeout=5) as response:
+                health = json.loads(response.read().decode("utf-8"))
+            pids.add(health["pid"])
+            memory = health["memory_kb"]
+            if memory:
+                print(f"工作进程 {health['pid']}：常驻 {memory['rss']} KB，私有 {memory['private']} KB")
+                assert memory["private"] < memory["rss"] / 2
+        assert process.pid not in pids and len(pids) <= 2
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(10) == 0
+    
+    requests = [{"endpoint": "bazi", "birthdate": "2024-03-15"},
+                {"endpoint": "evaluate", "surname": "李", "gender": "男", "name": "沐书"},
+                {"endpoint": "unknown"},
+                {"endpoint": "evaluate", "surname": "李", "gender": "男", "name": " "},
+                {"surname": "王", "gender": "女", "count": 2, "birthdate": "2024-03-15 08:30"}]
+    completed = subprocess.run([sys.executable, script, "--batch", "-", "--processes", "2"],
+                               input="\n".join(json.dumps(r, ensure_ascii=False) for r in requests) + "\n",
+                               capture_output=True, text=True, encoding="utf-8", timeout=60)
+    # 标准输出每行都是 JSON（取名过程的提示信息写到标准错误）；出错的行不中断其后各行
+    assert completed.returncode == 0
+    responses = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [r.get("endpoint") for r in responses] == ["bazi", "evaluate", None, None, "generate"]
+    assert responses[1]["response"]["result"]["姓名"] == "李沐书"
+    assert responses[2]["status"] == 400 and responses[3]["status"] == 400
+    assert len(responses[4]["response"]["results"]) == 2 and "喜用神" in completed.stderr
+    
+    # 请求执行中的意外异常按行返回 500
+    class Broken:
+        def call(self, endpoint, params):
+            raise IndexError("string index out of range")
+    
+    naming_service._BATCH_SERVICE = Broken()
+    try:
+        response = json.loads(naming_service._batch_call('{"endpoint": "evaluate"}'))
+    finally:
+        naming_service._BATCH_SERVICE = None
+    assert response == {"error": "IndexError: string index out of range", "status": 500}
+
+def test_admission_control():
+    """测试成本估算、分通道准入、降级与拒绝"""
+    print("=" * 60)
+    print("准入控制测试")
+    print("=" * 60)
+    
+    lexicon = get_default_lexicon()
+    overlay = LexiconOverlay(add={"鑫": {"笔画": 24, "五行": "金", "性别": ["男"], "字义": "财富兴盛", "常用度": 4}},
+                             banned=["思"])
+    for source in (lexicon, overlay):
+        for kwargs in ({}, {"gender": "男", "min_usage": 3}, {"wuxing": ["金", "水"]}):
+            assert source.count(**kwargs) == len(source.select(**kwargs))
+    
+    # 未指定喜用神、生成数量多的请求昂贵，指定喜用神或带字辈的请求廉价
+    expensive = NamingGenerator("李", "男").estimate_cost(50)
+    cheap = NamingGenerator("李", "男", xiyongshen=["木"]).estimate_cost(5)
+    zibei = NamingGenerator("李", "男", zibei="思").estimate_cost(5)
+    print(f"估算成本：无喜用神 {expensive}，有喜用神 {cheap}，带字辈 {zibei}")
+    assert expensive > AdmissionConfig.CHEAP_COST >= cheap > zibei
+    
+    controller = AdmissionController(1, 1, cheap_limit=2, expensive_limit=2, degrade_at=0.5)
+    lane1, degraded1 = controller.admit(expensive, degradable=True)
+    lane2, degraded2 = controller.admit(expensive, degradable=True)
+    assert lane1 is lane2 is controller.expensive and (degraded1, degraded2) == (False, True)
+    try:
+        controller.admit(expensive, degradable=True)
+        assert False, "昂贵通道已满时应拒绝"
+    except Overloaded as e:
+        assert e.lane == "expensive"
+    # 昂贵通道满载不影响廉价请求
+    assert controller.admit(cheap) == (controller.cheap, False)
+    for lane in (lane1, lane2, controller.cheap):
+        controller.release(lane)
+    assert controller.stats()["expensive"] == {"pending": 0, "limit": 2, "admitted": 2, "degraded": 1, "rejected": 1}
+    controller.shutdown()
+    
+    # 服务：昂贵通道被长任务占住时，廉价请求照常完成，昂贵请求先降级后拒绝
+    service = NamingService(workers=3, admission=AdmissionController(1, 2, expensive_limit=2)).warm()
+    release = threading.Event()
+    lane, _ = service.admission.admit(expensive)
+    blocker = threading.Thread(target=service.admission.run, args=(lane, release.wait, 10))
+    blocker.start()
+    try:
+        start = time.perf_counter()
+        response = service.call("generate", {"surname": "李", "gender": "男", "xiyongshen": ["木"], "count": 5})
+        elapsed = time.perf_counter() - start
+        assert response["admission"]["lane"] == "cheap" and not response["admission"]["degraded"]
+        print(f"昂贵通道占满时廉价请求耗时 {elapsed * 1000:.1f} 毫秒")
+        
+        degraded = {}
+        worker = threading.Thread(target=lambda: degraded.update(
+            service.call("generate", {"surname": "李", "gender": "男", "count": 20})))
+        worker.start()
+        worker.join()
+        assert degraded["admission"] == {"lane": "expensive", "cost": NamingGenerator("李", "男").estimate_cost(20),
+                                         "degraded": True}
+        assert 0 < len(degraded["results"]) <= ServiceConfig.DEGRADED_COUNT
+        
+        service.admission.admit(expensive)
+        with NamingServer(service, port=0) as server:
+            request = urllib.request.Request(server.url + "/generate", data=json.dumps(
+                {"surname": "李", "gender": "男", "count": 20}).encode("utf-8"))
+            try:
+                urllib.request.urlopen(request, timeout=10)
+                assert False, "昂贵通道已满时应返回 503"
+            except urllib.error.HTTPError as e:
+                assert e.code == 503 and e.headers["Retry-After"] == str(AdmissionConfig.RETRY_AFTER)
+            service.admission.release(service.admission.expensive)
+    finally:
+        release.set()
+        blocker.join()
+    service.close()
+    
+    # 通道只限制并发数：昂贵通道执行 CPU 密集的搜索时，同进程的廉价请求与之共用 GIL，延迟有所增加但有界
+    service = NamingService(workers=3, admission=AdmissionController(1, 2, expensive_limit=8)).warm()
+    
+    def cheap_latency(seed):
+        start = time.perf_counter()
+        response = service.call("generate", {"surname": "李", "gender": "男", "xiyongshen": ["木"],
+                                             "count": 5, "seed": seed})
+        assert response["admission"]["lane"] == "cheap"
+        return time.perf_counter() - start
+    
+    idle = statistics.median(cheap_latency(seed) for seed in range(1, 8))
+    stop = threading.Event()
+    searches = []
+    
+    def search():
+        while not stop.is_set():
+            response = service.call("generate", {"surname": "王", "gender": "女", "count": 30,
+                                                 "seed": len(searches) + 1})
+            searches.append(response["admission"]["lane"])
+    
+    workers = [threading.Thread(target=search) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    try:
+        while not searches:
+            time.sleep(0.01)
+        busy = statistics.median(cheap_latency(seed) for seed in range(100, 107))
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+    print(f"廉价请求中位耗时：空闲 {idle * 1000:.1f} 毫秒，昂贵通道执行中 {busy * 1000:.1f} 毫秒"
+          f"（期间完成 {len(searches)} 次昂贵搜索）")
+    assert set(searches) == {"expensive"}
+    # 两个昂贵线程与廉价线程轮流持有 GIL，廉价请求约慢到 3 倍；留出余量
+    assert busy < idle * 6 + 0.1
+    service.close()
+
+
+def test_daemon():
+    """测试本地守护进程（Unix 域套接字）与命令行转发"""
+    print("=" * 60)
+    print("取名守护进程测试")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "naming.sock")
+        assert forward("generate", {"surname": "李", "gender": "男"}, path) is None
+        
+        with NamingDaemon(NamingService(workers=2).warm(), path):
+            assert os.stat(path).st_mode & 0o777 == 0o600
+            with DaemonClient(path) as client:
+                assert client.call("health")["status"] == "ok"
+                payload = client.call("generate", {"surname": "周", "gender": "女", "count": 3,
+                                                   "birthdate": "2024-03-15 08:30"})
+                assert len(payload["results"]) == 3
+                bazi = payload["bazi"]
+                # 同一连接可继续发送请求；已算好的八字直接传入，不再重算
+                again = client.call("generate", {"surname": "周", "gender": "女", "count": 3,
+                                                 "bazi_analysis": bazi})
+                assert len(again["results"]) == 3 and again["bazi"] == bazi
+                assert again["xiyongshen"] == bazi["推荐喜用神"] == payload["xiyongshen"]
+                try:
+                    client.call("generate", {"surname": "周", "gender": "中"})
+                    assert False, "参数错误应抛出 DaemonError"
+                except DaemonError as e:
+                    assert e.status == 400
+                try:
+                    client.call("unknown")
+                    assert False, "未知接口应抛出 DaemonError"
+                except DaemonError as e:
+                    assert e.status == 400
+            
+            result = forward("evaluate", {"surname": "李", "gender": "男", "name": "沐书"}, path)
+            assert result["result"]["姓名"] == "李沐书"
+            print("守护进程生成：", [item["姓名"] for item in payload["results"]])
+            
+            # 命令行读完输入即转发：守护进程在时不导入取名流水线，结果与守护进程直接返回的相同
+            script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "naming_generator.py")
+            completed = subprocess.run([sys.executable, "-X", "importtime", script],
+                                       input="周\n女\n2024-03-15\n08:30\n\n\n3\nn\n",
+                                       capture_output=True, text=True, encoding="utf-8", timeout=60,
+                                       env=dict(os.environ, NAMING_DAEMON_SOCKET=path))
+            assert completed.returncode == 0, completed.stderr[-2000:]
+            imported = {line.split("|")[-1].strip() for line in completed.stderr.splitlines()
+                        if line.startswith("import time:")}
+            assert "naming_daemon" in imported and "naming_cli" in imported
+            assert not imported & {"naming_generator", "ai_backend", "ai_analyzer", "bazi_calculator"}, imported
+            assert "已由取名守护进程完成搜索" in completed.stdout
+            assert f"推荐名字 1：{payload['results'][0]['姓名']}" in completed.stdout
+            assert f"【八字信息】{bazi['八字字符串']}" in completed.stdout
+            
+            try:
+                NamingDaemon(NamingService(workers=1), path)
+                assert False, "同一路径上不应启动第二个守护进程"
+            except OSError:
+                pass
+        assert not os.path.exists(path)
+        
+        # 守护进程不在时命令行在本进程内计算，输出相同
+        local = subprocess.run([sys.executable, script], input="周\n女\n2024-03-15\n08:30\n\n\n3\nn\n",
+                               capture_output=True, text=True, encoding="utf-8", timeout=60,
+                               env=dict(os.environ, NAMING_DAEMON_SOCKET=path))
+        assert local.returncode == 0 and "已由取名守护进程完成搜索" not in local.stdout
+        assert "推荐名字 3：" in local.stdout and f"【八字信息】{bazi['八字字符串']}" in local.stdout
+        
+        # 异常退出遗留的套接字文件在下次启动时清理
+        stale = NamingDaemon(NamingService(workers=1), path)
+        stale.server.server_close()
+        assert os.path.exists(path)
+        with NamingDaemon(NamingService(workers=1), path):
+            assert forward("health", {}, path)["status"] == "ok"
+
+
+
+def test_pagination():
+    """测试游标分页：各页续取同一份排序结果，缓存未命中时按种子重算得到相同顺序"""
+    print("=" * 60)
+    print("游标分页测试")
+    print("=" * 60)
+    
+    service = NamingService(workers=2)
+    try:
+        params = {"surname": "李", "gender": "男", "xiyongshen": ["木", "水"], "count": 10}
+        first = service.call("generate", params)
+        assert len(first["results"]) == 10 and first["next_cursor"]
+        assert first["stats"]["passed"] >= 40 and first["stats"]["scored"] > 0
+        pages = [first]
+        while pages[-1]["next_cursor"] and len(pages) < 4:
+            pages.append(service.call("generate", dict(params, cursor=pages[-1]["next_cursor"])))
+        names = [item["姓名"] for page in pages for item in page["results"]]
+        assert len(names) == len(set(names)) == 40
+        # 续页命中缓存：只计解析成本，走廉价通道
+        assert pages[1]["admission"]["lane"] == "cheap" and service.pager.stats()["hits"] == 3
+        assert all("文化解析" in page["stats"]["timings_ms"] for page in pages)
+        # 首页与 generate_names(count) 的搜索量相同；相同的首页请求共用排序列表
+        generator = NamingGenerator("李", "男", xiyongshen=["木", "水"], seed=decode_cursor(first["next_cursor"])[1])
+        assert first["stats"]["scored"] == generator.generate_names(10).stats.scored
+        repeat = service.call("generate", params)
+        assert [item["姓名"] for item in repeat["results"]] == names[:10]
+        assert repeat["admission"]["lane"] == "cheap" and service.pager.stats()["misses"] == 1
+        seeded = service.call("generate", dict(params, seed=12345))
+        assert service.pager.stats()["misses"] == 2 and seeded["next_cursor"] != first["next_cursor"]
+        scores = [item["评分"]["总分"] for page in pages for item in page["results"]]
+        assert scores == sorted(scores, reverse=True)
+        assert all("文化解析" in item for item in pages[2]["results"])
+        print("前4页：", names[::10])
+        
+        # 另一个进程（缓存为空）收到同一游标，重算后得到同一页
+        other = NamingService(workers=1)
+        again = other.call("generate", dict(params, cursor=pages[1]["next_cursor"]))
+        assert [item["姓名"] for item in again["results"]] == names[20:30]
+        assert other.pager.stats()["misses"] == 1
+        other.close()
+        
+        # 游标与查询参数绑定
+        for bad in ("not-a-cursor", pages[1]["next_cursor"][:-4]):
+            try:
+                service.call("generate", dict(params, cursor=bad))
+                assert False, "无效游标应报错"
+            except ValueError:
+                pass
+        try:
+            service.call("generate", dict(params, surname="王", cursor=pages[1]["next_cursor"]))
+            assert False, "游标不能用于其他查询"
+        except ValueError as e:
+            assert "不符" in str(e)
+        
+        # 最后一页不再返回游标
+        digest, seed, limits, depth, offset = decode_cursor(first["next_cursor"])
+        assert offset == depth == 10
+        total = len(service.pager.ranked(service._generator(service.normalize("generate", params)),
+                                         digest, seed, limits, depth))
+        last = service.call("generate", dict(params, cursor=encode_cursor(digest, seed, limits, depth, total - 3)))
+        assert len(last["results"]) == 3 and last["next_cursor"] is None
+    finally:
+        service.close()
+    
+    pager = ResultPager(capacity=1)
+    generator = NamingGenerator("张", "女", xiyongshen=["金"])
+    _, cursor = pager.page(generator, 5)
+    assert pager.cached(generator, 5, cursor)
+    pager.page(NamingGenerator("王", "女"), 5)
+    assert pager.stats()["cached"] == 1 and not pager.cached(generator, 5, cursor)
+
+
+if __name__ == "__main__":
+    test_naming_service()
+    test_single_flight()
+    test_prefork_service()
+    test_admission_control()
+    test_daemon()
+    test_pagination()
@@ -10,14 +10,16 @@ from data_characters import get_character_info
 class WuGeCalculator:
     """五格计算器"""
     
-    def __init__(self, surname, name):
+    def __init__(self, surname, name, lexicon=None):
         """
         初始化
         :param surname: 姓氏（单姓或复姓）
         :param name: 名字（单名或双名）
+        :param lexicon: 字库（可选，需提供 get 方法，默认使用共享字库）
         """
         self.surname = surname
         self.name = name
+        self.lexicon = lexicon
         self.surname_strokes = self._get_strokes(surname)
         self.name_strokes = self._get_strokes(name)
         
@@ -28,8 +30,9 @@ class WuGeCalculator:
         :return: 笔画数列表
         """
         strokes = []
+        lookup = self.lexicon.get if self.lexicon is not None else get_character_info
         for char in text:
-            info = get_character_info(char)
+            info = lookup(char)
             if info:
                 strokes.append(info["笔画"])
             else: